@@ -0,0 +1,7 @@
+"""Offline benchmarks for politikontroller_py.
+
+`python -m benchmarks` runs the suite of hot path cases on synthetic payloads,
+including full client round trips against a local server, and writes the
+results as JSON. The `bench_*` scripts compare single code paths against the
+implementations they replaced.
+"""
@@ -0,0 +1,49 @@
+"""Run the benchmark suite and write the results as JSON.
+
+python -m benchmarks --size 1000 --output results.json
+python -m benchmarks --size 1000 --compare results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import sys
+
+from .suite import Result, compare, run
+
+
+def report(result: Result):
+    data = result.to_dict()
+    print(f"{data['name']:<44}{data['min'] * 1e3:>12.3f} ms{data['number']:>8}x", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000, help="rows per synthetic payload")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per case")
+    parser.add_argument("--min-time", type=float, default=0.1, help="minimum seconds per sample")
+    parser.add_argument("-k", "--filter", default="*", help="only run cases matching this glob")
+    parser.add_argument("-o", "--output", type=Path, help="write JSON here instead of stdout")
+    parser.add_argument("--compare", type=Path, help="print the change against an earlier JSON run")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.size, args.repeat, args.min_time, args.filter, report))
+    text = json.dumps(results, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        args.output.write_text(text + "\n", encoding="utf-8")
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        print(f"\n{'case':<44}{'before (ms)':>14}{'after (ms)':>14}{'change':>10}", file=sys.stderr)
+        for name, before, after in compare(baseline, results):
+            change = (after - before) / before * 100
+            print(f"{name:<44}{before * 1e3:>14.3f}{after * 1e3:>14.3f}{change:>+9.1f}%", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
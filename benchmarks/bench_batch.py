@@ -0,0 +1,40 @@
+"""Memory and build time of a `ControlBatch` against a list of models.
+
+python -m benchmarks.bench_batch
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+
+from politikontroller_py.models import ControlBatch
+from politikontroller_py.models.api import PoliceControlsResponse
+
+from .payloads import make_payload
+
+SIZE = 100_000
+
+
+def measure(func) -> tuple[float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return elapsed, size
+
+
+def main():
+    data = make_payload(PoliceControlsResponse, SIZE)
+    models_time, models_size = measure(lambda: PoliceControlsResponse.from_response_data(data, True))
+    batch_time, batch_size = measure(lambda: ControlBatch.from_response_data(PoliceControlsResponse, data))
+    print(f"{SIZE:,} controls{'time (s)':>14}{'memory (MB)':>14}")
+    print(f"{'models':<16}{models_time:>14.2f}{models_size / 1e6:>14.1f}")
+    print(f"{'batch':<16}{batch_time:>14.2f}{batch_size / 1e6:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
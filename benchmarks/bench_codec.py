@@ -0,0 +1,64 @@
+"""Per-call cost of the AES payload codec.
+
+Compares the original implementation, which decoded the keys and built a new
+cipher on every call, against `PayloadCodec`.
+
+    python -m benchmarks.bench_codec
+"""
+
+from __future__ import annotations
+
+import base64
+import timeit
+
+from Crypto.Cipher import AES
+from Crypto.Util.Padding import pad, unpad
+
+from politikontroller_py.constants import CRYPTO_K1, CRYPTO_K2
+from politikontroller_py.utils import JUNK_CHARS, PayloadCodec
+
+QUERY = "bac=ABCDEFGHIJ&z=1700000000&version=9.1.0&os=Android&p=hk&retning=47&telefon=47474747&passord=secret&lat=63.0&lon=11.0&tt=ABCDE"
+ROW = "59777|Møre og Romsdal|Kristiansund|Belte/mobil|05.12 - 10:41|Statens vegvesen Rensvik|63.1033706005419|7.82150858039696|0|0|kristiansund.png|more_og_romsdal.png|50|1|10:41|0|2|2"
+
+
+def legacy_encrypt(input_str: str):
+    key = base64.b64decode(CRYPTO_K2)
+    iv = base64.b64decode(CRYPTO_K1)
+    cipher = AES.new(key, AES.MODE_CBC, iv)
+    length = 16 - (len(input_str) % 16)
+    input_b = bytes(input_str, "utf-8") + bytes([length]) * length
+    input_padded = pad(input_b, AES.block_size)
+    return base64.b64encode(cipher.encrypt(input_padded)).decode()
+
+
+def legacy_decrypt(enc_base64: str):
+    enc_data = base64.b64decode(enc_base64)
+    key = base64.b64decode(CRYPTO_K2)
+    iv = base64.b64decode(CRYPTO_K1)
+    decipher = AES.new(key, AES.MODE_CBC, iv)
+    ciphertext_padded = decipher.decrypt(enc_data)
+    return unpad(ciphertext_padded, AES.block_size).decode().strip(JUNK_CHARS)
+
+
+def per_call_us(func, arg, number: int) -> float:
+    return timeit.timeit(lambda: func(arg), number=number) / number * 1e6
+
+
+def main():
+    codec = PayloadCodec()
+    cases = [
+        ("encrypt query", legacy_encrypt, codec.encrypt_query, QUERY),
+        ("decrypt 1 row", legacy_decrypt, codec.decrypt_payload, codec.encrypt_query(ROW)),
+        ("decrypt 50 rows", legacy_decrypt, codec.decrypt_payload, codec.encrypt_query("#".join([ROW] * 50))),
+    ]
+    print(f"{'case':<18}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}")
+    for name, before, after, arg in cases:
+        assert before(arg) == after(arg)
+        number = 20000 if len(arg) < 4096 else 2000
+        t_before = per_call_us(before, arg, number)
+        t_after = per_call_us(after, arg, number)
+        print(f"{name:<18}{t_before:>14.2f}{t_after:>14.2f}{t_before / t_after:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
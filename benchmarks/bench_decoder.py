@@ -0,0 +1,58 @@
+"""Row decoding throughput, in rows per second.
+
+Compares the previous path (`map_response_data` + `from_dict`) against the
+compiled row decoder and batch timestamp parser used by `from_response_data`.
+
+    python -m benchmarks.bench_decoder
+"""
+
+from __future__ import annotations
+
+import time
+
+from politikontroller_py.models.account import AuthenticationResponseOK
+from politikontroller_py.models.api import (
+    PoliceControlResponse,
+    PoliceControlsResponse,
+    PoliceGPSControlsResponse,
+    UserMap,
+)
+from politikontroller_py.utils import TimestampParser, map_response_data
+
+ROWS = 20_000
+SAMPLES = {
+    PoliceControlResponse: "59777|Møre og Romsdal|Kristiansund|Belte/mobil|05.12 - 10:41|Statens vegvesen Rensvik|63.1033706005419|7.82150858039696|||kristiansund.png|more_og_romsdal.png|50|1|10:41|0|2|2",
+    PoliceControlsResponse: "59846|Trøndelag|Verdal|Toll/grense|13:34|Toll kontroll Ådalsvolln|63.6649849166551|12.0574659782783|NOT_IN_USE|verdal.png|YES|verdal.png|1733488469|0|13:59|1733489964",
+    PoliceGPSControlsResponse: "59777|Kristiansund|Kristiansund|Belte/mobil|10:41|Statens vegvesen Rensvik|63.1033706005419|7.82150858039696|||Møre og Romsdal/Kristiansund - 10:41|2",
+    UserMap: "1|x|Min kart|no",
+    AuthenticationResponseOK: "LOGIN_OK|NO|0|47|SKIP_AUTHENTICATION|1000|||NO_SAPHE|NO_REGNR|29|NO|NO||30|true|false|62|false",
+}
+
+
+def from_dict_path(cls, data: str):
+    return [cls.from_dict(d) for d in map_response_data(data, cls.attr_map, multiple=True)]
+
+
+def decoder_path(cls, data: str):
+    with TimestampParser().activate():
+        return [cls.from_response_row(row) for row in data.split("#")]
+
+
+def rows_per_sec(func, cls, data: str) -> float:
+    start = time.perf_counter()
+    func(cls, data)
+    return ROWS / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'model':<28}{'from_dict (rows/s)':>20}{'decoder (rows/s)':>20}{'speedup':>10}")
+    for cls, row in SAMPLES.items():
+        data = "#".join([row] * ROWS)
+        assert from_dict_path(cls, row) == decoder_path(cls, row)
+        before = rows_per_sec(from_dict_path, cls, data)
+        after = rows_per_sec(decoder_path, cls, data)
+        print(f"{cls.__name__:<28}{before:>20,.0f}{after:>20,.0f}{after / before:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
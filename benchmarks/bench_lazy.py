@@ -0,0 +1,38 @@
+"""Reading ids and coordinates from a `LazyControls` against building every model.
+
+python -m benchmarks.bench_lazy
+"""
+
+from __future__ import annotations
+
+import time
+
+from politikontroller_py.models import LazyControls
+from politikontroller_py.models.api import PoliceControlsResponse
+
+from .payloads import make_payload
+
+SIZE = 100_000
+
+
+def eager(data: str):
+    controls = PoliceControlsResponse.from_response_data(data, True)
+    return [c.id for c in controls], [(c.lat, c.lng) for c in controls]
+
+
+def lazy(data: str):
+    controls = LazyControls(PoliceControlsResponse, data)
+    return controls.ids, list(zip(controls.lats, controls.lngs))
+
+
+def main():
+    data = make_payload(PoliceControlsResponse, SIZE)
+    print(f"{SIZE:,} controls, ids and coordinates")
+    for name, func in (("models", eager), ("lazy", lazy)):
+        start = time.perf_counter()
+        func(data)
+        print(f"{name:<16}{time.perf_counter() - start:>8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Cost of `merge_duplicate_controls` for growing result sets.
+
+Compares the union-find clustering with the original greedy, nested-loop merge
+that rebuilt a control for every merged pair. The nested merge is quadratic, it
+is only timed for the smaller sizes. Both group duplicates by type and distance,
+but the greedy merge can split a chain of duplicates that clustering joins.
+
+    python -m benchmarks.bench_merge
+"""
+
+from __future__ import annotations
+
+import time
+
+from politikontroller_py.constants import DEFAULT_MAX_DISTANCE
+from politikontroller_py.utils import calculate_distance, merge_duplicate_controls
+
+from .payloads import make_controls
+
+SIZES = [100, 1_000, 10_000, 50_000]
+NESTED_MAX_SIZE = 1_000
+
+
+def merge_nested(controls, max_distance=DEFAULT_MAX_DISTANCE):
+    merged_controls = []
+    skip_indices = set()
+    for i, control1 in enumerate(controls):
+        if i in skip_indices:
+            continue
+        for j, control2 in enumerate(controls):
+            if i == j or j in skip_indices:
+                continue
+            distance = calculate_distance(control1.point, control2.point)
+            if distance <= max_distance and control1.type == control2.type:
+                control1 = control1.merge_with(control2)  # noqa: PLW2901
+                skip_indices.add(j)
+        merged_controls.append(control1)
+    return merged_controls
+
+
+def timed(func, controls) -> tuple[float, int]:
+    start = time.perf_counter()
+    result = func(controls)
+    return time.perf_counter() - start, len(result)
+
+
+def main():
+    print(f"{'controls':>10}{'merged':>10}{'nested (s)':>14}{'clusters (s)':>14}")
+    for size in SIZES:
+        controls = make_controls(size)
+        grid_time, merged = timed(merge_duplicate_controls, controls)
+        nested = "-"
+        if size <= NESTED_MAX_SIZE:
+            nested_time, _ = timed(merge_nested, controls)
+            nested = f"{nested_time:.3f}"
+        print(f"{size:>10}{merged:>10}{nested:>14}{grid_time:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Control store write and query times.
+
+python -m benchmarks.bench_store
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import tempfile
+import time
+
+from politikontroller_py.store import ControlStore
+
+from .payloads import make_controls
+
+SIZE = 10_000
+QUERIES = 100
+
+
+def main():
+    controls = make_controls(SIZE)
+    with tempfile.TemporaryDirectory() as tmp, ControlStore(f"{tmp}/controls.db") as store:
+        start = time.perf_counter()
+        store.upsert_many(controls)
+        insert = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store.upsert_many(controls)
+        update = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(QUERIES):
+            store.in_bbox(60.0 + i * 0.05, 10.0, 60.5 + i * 0.05, 11.0)
+        bbox = (time.perf_counter() - start) / QUERIES
+
+        start = time.perf_counter()
+        for i in range(QUERIES):
+            store.in_radius(60.0 + i * 0.05, 10.0, 25)
+        radius = (time.perf_counter() - start) / QUERIES
+
+        start = time.perf_counter()
+        store.in_time_window(since=datetime.now() - timedelta(hours=1))  # noqa: DTZ005
+        window = time.perf_counter() - start
+
+    print(f"rtree: {store.has_rtree}")
+    print(f"insert {SIZE:,} controls (one transaction): {insert * 1000:8.1f} ms")
+    print(f"update {SIZE:,} controls (one transaction): {update * 1000:8.1f} ms")
+    print(f"bbox query:                              {bbox * 1000:8.2f} ms")
+    print(f"radius query (25 km):                    {radius * 1000:8.2f} ms")
+    print(f"time window query ({SIZE:,} rows):        {window * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
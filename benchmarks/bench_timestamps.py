@@ -0,0 +1,54 @@
+"""Timestamp parsing throughput, in values per second.
+
+Compares parsing every value on its own (`parse_time_format` outside a batch)
+against one `TimestampParser` shared by a whole column, the way
+`from_response_data` parses control rows.
+
+    python -m benchmarks.bench_timestamps
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from politikontroller_py.utils import TimestampParser, parse_time_format
+
+VALUES = 50_000
+
+
+def make_column(size: int, seed: int = 1) -> list[str]:
+    """Build a column of timestamps like the ones found in a control listing."""
+    rng = random.Random(seed)
+    column = []
+    for _ in range(size):
+        hour, minute = rng.randrange(24), rng.randrange(60)
+        column.append(
+            rng.choice(
+                [
+                    f"{hour:02d}:{minute:02d}",
+                    f"{rng.randrange(1, 29):02d}.12 - {hour:02d}:{minute:02d}",
+                    f"2024-12-06T{hour:02d}:{minute:02d}:00",
+                ]
+            )
+        )
+    return column
+
+
+def values_per_sec(func, column: list[str]) -> float:
+    start = time.perf_counter()
+    func(column)
+    return len(column) / (time.perf_counter() - start)
+
+
+def main():
+    column = make_column(VALUES)
+    assert [parse_time_format(v) for v in column[:100]] == TimestampParser().parse_many(column[:100])
+    single = values_per_sec(lambda c: [parse_time_format(v) for v in c], column)
+    batch = values_per_sec(lambda c: TimestampParser().parse_many(c), column)
+    print(f"{'single (values/s)':>20}{'batch (values/s)':>20}{'speedup':>10}")
+    print(f"{single:>20,.0f}{batch:>20,.0f}{batch / single:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Synthetic response payloads of configurable size.
+
+Every generator is seeded, so the same size always gives the same payload.
+Controls are spread over Norway, and a share of them get a duplicate of the
+same type nearby, like clustered reports from the app.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from politikontroller_py.models.account import AuthenticationResponseOK
+from politikontroller_py.models.api import (
+    APIEndpoint,
+    PoliceControlResponse,
+    PoliceControlsResponse,
+    PoliceControlTypeEnum,
+    PoliceGPSControlsResponse,
+    UserMap,
+)
+
+TYPES = list(PoliceControlTypeEnum)
+PLACES = [(f"County {i}", f"Municipality {i}") for i in range(50)]
+DUPLICATE_SHARE = 0.2
+
+
+def _controls(count: int, seed: int, duplicates: float):
+    """Yield (id, county, municipality, type, lat, lng, rng) for `count` controls."""
+    rng = random.Random(seed)
+    index = 0
+    while index < count:
+        lat, lng = rng.uniform(58.0, 71.0), rng.uniform(5.0, 31.0)
+        county, municipality = rng.choice(PLACES)
+        control_type = rng.choice(TYPES)
+        for _ in range(2 if rng.random() < duplicates else 1):
+            if index == count:
+                return
+            lat_d, lng_d = rng.uniform(-0.005, 0.005), rng.uniform(-0.01, 0.01)
+            yield index, county, municipality, control_type, lat + lat_d, lng + lng_d, rng
+            index += 1
+
+
+def _clock(rng: random.Random) -> str:
+    return f"{rng.randrange(24):02d}:{rng.randrange(60):02d}"
+
+
+def speed_control_rows(count: int, seed: int = 0, duplicates: float = DUPLICATE_SHARE) -> list[str]:
+    """Rows of `hki` (control details)."""
+    return [
+        f"{i}|{county}|{municipality}|{control_type}|{rng.randrange(1, 29):02d}.12 - {_clock(rng)}|"
+        f"Control {i}|{lat}|{lng}|||place.png|county.png|{rng.choice([0, 50, 80])}|1|{_clock(rng)}|0|2|"
+        f"{rng.randrange(10)}"
+        for i, county, municipality, control_type, lat, lng, rng in _controls(count, seed, duplicates)
+    ]
+
+
+def speed_controls_rows(count: int, seed: int = 0, duplicates: float = DUPLICATE_SHARE) -> list[str]:
+    """Rows of `hk` (all active controls)."""
+    now = int(time.time())
+    return [
+        f"{i}|{county}|{municipality}|{control_type}|{_clock(rng)}|Control {i}|{lat}|{lng}|"
+        f"NOT_IN_USE|place.png|YES|place.png|{now - rng.randrange(7200)}|0|{_clock(rng)}|{now}"
+        for i, county, municipality, control_type, lat, lng, rng in _controls(count, seed, duplicates)
+    ]
+
+
+def gps_controls_rows(count: int, seed: int = 0, duplicates: float = DUPLICATE_SHARE) -> list[str]:
+    """Rows of `gps_kontroller` (controls within a radius)."""
+    return [
+        f"{i}|{county}|{municipality}|{control_type}|{_clock(rng)}|Control {i}|{lat}|{lng}|||"
+        f"{county}/{municipality} - {_clock(rng)}|{rng.randrange(10)}"
+        for i, county, municipality, control_type, lat, lng, rng in _controls(count, seed, duplicates)
+    ]
+
+
+def user_map_rows(count: int, seed: int = 0) -> list[str]:
+    """Rows of `hent_mine_kart` (own maps)."""
+    rng = random.Random(seed)
+    return [f"{i}|x|Map {i}|{rng.choice(['no', 'se'])}" for i in range(count)]
+
+
+def login_rows(count: int = 1, seed: int = 0) -> list[str]:
+    """Rows of `l` (login), which only ever has one."""
+    return ["LOGIN_OK|NO|0|47|SKIP_AUTHENTICATION|1000|||NO_SAPHE|NO_REGNR|29|NO|NO||30|true|false|62|false"]
+
+
+ROWS = {
+    PoliceControlResponse: speed_control_rows,
+    PoliceControlsResponse: speed_controls_rows,
+    PoliceGPSControlsResponse: gps_controls_rows,
+    UserMap: user_map_rows,
+    AuthenticationResponseOK: login_rows,
+}
+
+ENDPOINTS = {
+    APIEndpoint.SPEED_CONTROL: PoliceControlResponse,
+    APIEndpoint.SPEED_CONTROLS: PoliceControlsResponse,
+    APIEndpoint.GPS_CONTROLS: PoliceGPSControlsResponse,
+    APIEndpoint.GET_MY_MAPS: UserMap,
+    APIEndpoint.LOGIN: AuthenticationResponseOK,
+}
+
+
+def make_payload(cls: type, count: int, seed: int = 0) -> str:
+    """Build a decrypted response of `count` rows of `cls`."""
+    return "#".join(ROWS[cls](count, seed))
+
+
+def make_controls(count: int, seed: int = 0) -> list[PoliceGPSControlsResponse]:
+    """Build `count` deserialized controls, roughly one in five with a duplicate nearby."""
+    return PoliceGPSControlsResponse.from_response_data(
+        make_payload(PoliceGPSControlsResponse, count, seed), True
+    )
@@ -0,0 +1,67 @@
+"""Local stand-in for the `app.php` API.
+
+Decrypts the query like the real service, and answers with an encrypted
+synthetic payload for the requested endpoint. Control details are answered
+for the requested `kontroll_id`.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs
+
+from aiohttp import web
+
+from politikontroller_py.models.api import APIEndpoint
+from politikontroller_py.utils import aes_decrypt, aes_encrypt
+
+from .payloads import ENDPOINTS, make_payload, speed_control_rows
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+
+class BenchmarkServer:
+    """Serve `size` rows for list endpoints on a random local port."""
+
+    def __init__(self, size: int, seed: int = 0):
+        self.size = size
+        self.requests = 0
+        self._responses = {
+            endpoint: aes_encrypt(make_payload(cls, size, seed))
+            for endpoint, cls in ENDPOINTS.items()
+            if endpoint != APIEndpoint.SPEED_CONTROL
+        }
+        self._responses[APIEndpoint.CHECK] = aes_encrypt("YES")
+        self._detail = speed_control_rows(1, seed)[0].split("|", 1)[1]
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        query = parse_qs(aes_decrypt(request.rel_url.raw_query_string))
+        endpoint = APIEndpoint(query["p"][0])
+        if endpoint == APIEndpoint.SPEED_CONTROL:
+            text = aes_encrypt(f"{query['kontroll_id'][0]}|{self._detail}")
+        else:
+            text = self._responses.get(endpoint, aes_encrypt("ERR"))
+        return web.Response(text=text)
+
+    async def __aenter__(self) -> BenchmarkServer:  # noqa: PYI034
+        app = web.Application()
+        app.router.add_get("/app.php", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        await self._runner.cleanup()
@@ -0,0 +1,236 @@
+"""Benchmark cases for the client hot paths, and the runner that times them.
+
+Each case is timed with a number of calls chosen so one sample takes at least
+`min_time`, and `repeat` samples are kept. Client cases run against a local
+`BenchmarkServer`, so the whole suite runs offline.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from fnmatch import fnmatch
+import io
+import platform
+import statistics
+import time
+from typing import TYPE_CHECKING, Any, Callable
+from urllib.parse import urlencode
+
+from politikontroller_py import Client, __version__
+from politikontroller_py.models import ControlBatch, LazyControls
+from politikontroller_py.models.api import (
+    PoliceControlResponse,
+    PoliceControlsResponse,
+    PoliceGPSControlsResponse,
+    UserMap,
+)
+from politikontroller_py.output import dump_geo_json
+from politikontroller_py.store import ControlStore
+from politikontroller_py.utils import (
+    aes_decrypt,
+    aes_encrypt,
+    map_response_data,
+    merge_duplicate_controls,
+    parse_time_format,
+    to_geo_json,
+)
+
+from .bench_timestamps import make_column
+from .payloads import make_controls, make_payload
+from .server import BenchmarkServer
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+
+QUERY = {
+    "bac": "ABCDEFGHIJ",
+    "z": 1700000000,
+    "version": "9.1.0",
+    "os": "Android",
+    "p": "hk",
+    "retning": 47,
+    "telefon": 47474747,
+    "passord": "secret",
+    "lat": 63.0,
+    "lon": 11.0,
+    "tt": "ABCDE",
+}
+DETAILS_MAX = 100
+
+
+@dataclass
+class Case:
+    """A function to time, and how many items (rows, values) one call handles."""
+
+    name: str
+    group: str
+    func: Callable[[], Any] | Callable[[], Awaitable[Any]]
+    items: int = 1
+    is_async: bool = False
+
+
+@dataclass
+class Result:
+    name: str
+    group: str
+    size: int
+    items: int
+    number: int
+    samples: list[float] = field(repr=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        best = min(self.samples)
+        return {
+            "name": self.name,
+            "group": self.group,
+            "size": self.size,
+            "items": self.items,
+            "number": self.number,
+            "repeat": len(self.samples),
+            "min": best,
+            "median": statistics.median(self.samples),
+            "mean": statistics.fmean(self.samples),
+            "stdev": statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0,
+            "items_per_sec": self.items / best if best > 0 else None,
+        }
+
+
+def sync_cases(size: int) -> list[Case]:
+    """Cases for everything that does not need a server."""
+    query = urlencode(QUERY)
+    gps = make_payload(PoliceGPSControlsResponse, size)
+    hk = make_payload(PoliceControlsResponse, size)
+    encrypted = aes_encrypt(gps)
+    column = make_column(size)
+    controls = make_controls(size)
+    merged = merge_duplicate_controls(controls)
+
+    def store_upsert():
+        with ControlStore() as store:
+            store.upsert_many(controls)
+
+    cases = [
+        Case("aes_encrypt[query]", "codec", lambda: aes_encrypt(query)),
+        Case("aes_decrypt[payload]", "codec", lambda: aes_decrypt(encrypted), size),
+        Case(
+            "map_response_data",
+            "parse",
+            lambda: map_response_data(gps, PoliceGPSControlsResponse.attr_map, multiple=True),
+            size,
+        ),
+        Case("parse_time_format", "parse", lambda: [parse_time_format(v) for v in column], size),
+        Case("merge_duplicate_controls", "controls", lambda: merge_duplicate_controls(controls), size),
+        Case("to_geo_json", "controls", lambda: to_geo_json(merged), len(merged)),
+        Case("dump_geo_json", "controls", lambda: dump_geo_json(merged, io.BytesIO()), len(merged)),
+        Case(
+            "ControlBatch.from_response_data",
+            "controls",
+            lambda: ControlBatch.from_response_data(PoliceControlsResponse, hk),
+            size,
+        ),
+        Case("LazyControls.ids", "controls", lambda: LazyControls(PoliceControlsResponse, hk).ids, size),
+        Case("ControlStore.upsert_many", "store", store_upsert, size),
+    ]
+    for cls in (PoliceControlResponse, PoliceControlsResponse, PoliceGPSControlsResponse, UserMap):
+        data = make_payload(cls, size)
+        cases.append(
+            Case(
+                f"from_response_data[{cls.__name__}]",
+                "parse",
+                lambda cls=cls, data=data: cls.from_response_data(data, multiple=True),
+                size,
+            )
+        )
+    return cases
+
+
+def client_cases(client: Client, size: int) -> list[Case]:
+    """Full round trips through `client`: encrypt, request, decrypt and deserialize."""
+    listed = make_controls(min(size, DETAILS_MAX))
+    return [
+        Case("Client.check", "client", client.check, is_async=True),
+        Case("Client.get_controls", "client", lambda: client.get_controls(63, 11), size, True),
+        Case(
+            "Client.get_controls_in_radius",
+            "client",
+            lambda: client.get_controls_in_radius(63, 11, radius=50),
+            size,
+            True,
+        ),
+        Case("Client.get_control", "client", lambda: client.get_control(1), is_async=True),
+        Case(
+            "Client.get_controls_from_lists",
+            "client",
+            lambda: client.get_controls_from_lists(listed),
+            len(listed),
+            True,
+        ),
+        Case("Client.get_maps", "client", client.get_maps, size, True),
+    ]
+
+
+async def _time(case: Case, number: int) -> float:
+    start = time.perf_counter()
+    if case.is_async:
+        for _ in range(number):
+            await case.func()
+    else:
+        for _ in range(number):
+            case.func()
+    return time.perf_counter() - start
+
+
+async def measure(case: Case, size: int, repeat: int, min_time: float) -> Result:
+    """Time `case`, doubling the number of calls until one sample takes `min_time`."""
+    number = 1
+    while (elapsed := await _time(case, number)) < min_time:
+        number *= 2
+    samples = [elapsed / number]
+    samples.extend([await _time(case, number) / number for _ in range(repeat - 1)])
+    return Result(case.name, case.group, size, case.items, number, samples)
+
+
+def metadata(size: int, repeat: int) -> dict[str, Any]:
+    return {
+        "started_at": datetime.now(tz=timezone.utc).isoformat(),
+        "version": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "size": size,
+        "repeat": repeat,
+    }
+
+
+async def run(
+    size: int,
+    repeat: int = 5,
+    min_time: float = 0.1,
+    pattern: str = "*",
+    report: Callable[[Result], None] | None = None,
+) -> dict[str, Any]:
+    """Run every case whose name matches `pattern`, and return the results as a dict."""
+    results = []
+
+    async def _run(cases: list[Case]):
+        for case in cases:
+            if fnmatch(case.name, pattern):
+                result = await measure(case, size, repeat, min_time)
+                results.append(result)
+                if report is not None:
+                    report(result)
+
+    meta = metadata(size, repeat)
+    await _run(sync_cases(size))
+    async with BenchmarkServer(size) as server, Client.initialize("4790112233", "secret") as client:
+        client.api_url = server.url
+        await _run(client_cases(client, size))
+    return {"meta": meta, "results": [r.to_dict() for r in results]}
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> list[tuple[str, float, float]]:
+    """Pair the best times of the cases found in both runs, as (name, baseline, current)."""
+    before = {r["name"]: r["min"] for r in baseline["results"]}
+    return [(r["name"], before[r["name"]], r["min"]) for r in current["results"] if r["name"] in before]
@@ -1,11 +1,31 @@
 """politikontroller_py."""
 
-from .client import Client
-from .models.account import Account
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
 from .version import __version__
 
+if TYPE_CHECKING:
+    from .client import Client  # noqa: TCH004
+    from .models.account import Account  # noqa: TCH004
+
 __all__ = [
     "__version__",
     "Account",
     "Client",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # Importing the client pulls in aiohttp and builds the model decoders, so it is
+    # left until first used. Submodules such as `exceptions` stay cheap to import.
+    if name == "Client":
+        from .client import Client
+
+        return Client
+    if name == "Account":
+        from .models.account import Account
+
+        return Account
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,159 @@
+"""On-disk cache of logged in accounts, so repeated CLI runs can skip the login.
+
+Accounts are stored without their password, in a file only the owner can read
+and write. Each entry keeps a salted scrypt hash of the password it was logged
+in with, and is only used for that password. Entries expire after `ttl` seconds. A file that others can read is
+ignored, and rewritten with the right permissions on the next save.
+
+Updates take an exclusive lock on a file next to the cache (on POSIX), so runs
+that save at the same time keep each other's entries. The cache is only an
+optimisation: failing to save it is logged and otherwise ignored.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager, suppress
+import hashlib
+import hmac
+import json
+import logging
+import os
+from pathlib import Path
+import stat
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from .constants import AUTH_CACHE_FILE, AUTH_CACHE_TTL
+from .models.account import Account
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from os import PathLike
+
+_LOGGER = logging.getLogger(__name__)
+
+_SCRYPT_PARAMS = {"n": 2**14, "r": 8, "p": 1}
+_SALT_SIZE = 16
+
+
+def _hash_password(password: str, salt: bytes) -> bytes:
+    return hashlib.scrypt(password.encode(), salt=salt, **_SCRYPT_PARAMS)
+
+
+def default_cache_path() -> Path:
+    """Get the cache file under `$XDG_CACHE_HOME`, or `~/.cache` when it is not set."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / AUTH_CACHE_FILE
+
+
+class AuthCache:
+    """Logged in accounts by username, with an expiry."""
+
+    def __init__(
+        self,
+        path: str | PathLike | None = None,
+        ttl: float = AUTH_CACHE_TTL,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(path) if path is not None else default_cache_path()
+        self.ttl = ttl
+        self._clock = clock
+
+    def load(self, username: str, password: str) -> Account | None:
+        """Get the cached account of `username`, without password.
+
+        Nothing is returned when the entry expired, or was saved for another password.
+        """
+        entry = self._read().get(username.replace(" ", ""))
+        if entry is None:
+            return None
+        try:
+            salt = bytes.fromhex(entry["salt"])
+            password_hash = bytes.fromhex(entry["password_hash"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if not hmac.compare_digest(_hash_password(password, salt), password_hash):
+            _LOGGER.debug("Ignoring cached login of %s, the password differs", username)
+            return None
+        return Account.from_dict(entry["account"])
+
+    def save(self, account: Account):
+        """Cache `account`, with a hash of its password instead of the password."""
+        if account.password is None:
+            return
+        data = account.to_dict()
+        data.pop("password", None)
+        salt = os.urandom(_SALT_SIZE)
+        entry = {
+            "account": data,
+            "salt": salt.hex(),
+            "password_hash": _hash_password(account.password, salt).hex(),
+        }
+        try:
+            with self._locked():
+                entries = self._read()
+                entries[account.username] = {**entry, "expires_at": self._clock() + self.ttl}
+                self._write(entries)
+        except OSError as err:
+            _LOGGER.warning("Could not save the login to %s: %s", self.path, err)
+
+    def invalidate(self, username: str):
+        try:
+            with self._locked():
+                entries = self._read()
+                if entries.pop(username, None) is not None:
+                    self._write(entries)
+        except OSError as err:
+            _LOGGER.warning("Could not update %s: %s", self.path, err)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold an exclusive lock for a read-modify-write of the cache file."""
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if fcntl is None:  # pragma: no cover
+            yield
+            return
+        fd = os.open(self.path.with_name(f".{self.path.name}.lock"), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _read(self) -> dict[str, Any]:
+        try:
+            mode = self.path.stat().st_mode
+            if os.name == "posix" and mode & (stat.S_IRWXG | stat.S_IRWXO):
+                _LOGGER.warning("Ignoring %s, it is accessible by other users", self.path)
+                return {}
+            entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Ignoring unreadable %s: %s", self.path, err)
+            return {}
+        now = self._clock()
+        return {
+            username: entry
+            for username, entry in entries.items()
+            if isinstance(entry, dict) and entry.get("expires_at", 0) > now
+        }
+
+    def _write(self, entries: dict[str, Any]):
+        # Write a new file that only the owner can access, then move it in place
+        fd, name = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        tmp = Path(name)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            tmp.replace(self.path)
+        except BaseException:
+            with suppress(OSError):
+                tmp.unlink()
+            raise
@@ -0,0 +1,104 @@
+"""In-memory cache for control details."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import time
+from typing import TYPE_CHECKING, Callable
+
+from .constants import CONTROL_CACHE_MAX_ENTRIES, CONTROL_CACHE_TTL
+from .utils import last_activity
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .models.api import PoliceControl, PoliceControlResponse
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ControlCache:
+    """TTL + LRU cache of control details, keyed by `kontroll_id`."""
+
+    def __init__(
+        self,
+        max_entries: int = CONTROL_CACHE_MAX_ENTRIES,
+        ttl: float = CONTROL_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: OrderedDict[int, tuple[float, PoliceControlResponse]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, cid: int) -> bool:
+        entry = self._entries.get(cid)
+        return entry is not None and entry[0] > self._clock()
+
+    def get(self, cid: int) -> PoliceControlResponse | None:
+        """Get a cached control, or None if missing or expired."""
+        entry = self._entries.get(cid)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        expires_at, control = entry
+        if expires_at <= self._clock():
+            del self._entries[cid]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(cid)
+        self.stats.hits += 1
+        return control
+
+    def set(self, control: PoliceControlResponse):
+        """Add or replace a control, evicting the least recently used if full."""
+        self._entries[control.id] = (self._clock() + self.ttl, control)
+        self._entries.move_to_end(control.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, cid: int) -> bool:
+        """Drop a control from the cache."""
+        if self._entries.pop(cid, None) is None:
+            return False
+        self.stats.invalidations += 1
+        return True
+
+    def invalidate_outdated(self, controls: Iterable[PoliceControl]) -> int:
+        """Drop cached details that are older than the given list results.
+
+        A control is refreshed early when its `timestamp`/`last_seen` in a list
+        response is newer than in the cached details.
+        """
+        count = 0
+        for control in controls:
+            entry = self._entries.get(control.id)
+            if entry is None:
+                continue
+            listed = last_activity(control)
+            cached = last_activity(entry[1])
+            if listed is not None and (cached is None or listed > cached):
+                count += self.invalidate(control.id)
+        return count
+
+    def clear(self):
+        self._entries.clear()
@@ -2,22 +2,42 @@
 
 from __future__ import annotations
 
+import asyncio
+from contextlib import suppress
 import logging
-from typing import TYPE_CHECKING
+import queue
+import threading
+from typing import TYPE_CHECKING, Any
 
 import anyio
 import asyncclick as click
-from tabulate import tabulate
 
-from politikontroller_py import Client
-from politikontroller_py.exceptions import AuthenticationError
+from politikontroller_py.constants import CLIENT_MAX_CONCURRENCY
+from politikontroller_py.exceptions import AuthenticationError, PolitikontrollerError
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Iterable
+    from typing import TextIO
+
     from asyncclick.core import Context
 
+    from politikontroller_py import Client
+    from politikontroller_py.output import RowWriter
+
+# The client, its models and tabulate are imported by the commands that use them,
+# which keeps `politikontroller --help` from loading aiohttp and building the
+# model decoders.
+
 TABULATE_DEFAULTS = {
     "tablefmt": "rounded_grid",
 }
+OUTPUT_FORMATS = ("table", "json", "ndjson", "csv", "geojson")
+
+
+def tabulate(*args: Any, **kwargs: Any) -> str:
+    from tabulate import tabulate
+
+    return tabulate(*args, **kwargs)
 
 
 def tabulate_model(data: list[dict], keys: list[str]) -> list[list[str]]:
@@ -28,6 +48,54 @@ def tabulate_model(data: list[dict], keys: list[str]) -> list[list[str]]:
     return result
 
 
+def output_option(default: str | None = "table", geo: bool = True) -> Callable:
+    """Add `--format`. GeoJSON is only offered when the rows are controls."""
+    return click.option(
+        "--format",
+        "-f",
+        "output_format",
+        type=click.Choice([f for f in OUTPUT_FORMATS if geo or f != "geojson"]),
+        default=default,
+        show_default=default is not None,
+        help="Output format. Rows are streamed as they arrive, except for table",
+    )
+
+
+def open_writer(output_format: str, flush: bool = False) -> RowWriter:
+    """Get a writer of `output_format` rows to stdout."""
+    from politikontroller_py.output import get_writer
+
+    return get_writer(output_format, click.get_binary_stream("stdout"), flush)
+
+
+def echo_rows(rows: Iterable[Any], output_format: str):
+    """Write `rows` to stdout in a machine-readable `output_format`."""
+    with open_writer(output_format) as writer:
+        writer.write_many(rows)
+
+
+async def echo_controls_as_completed(
+    client: Client,
+    ids: Iterable[int] | AsyncIterator[int],
+    output_format: str,
+    max_concurrency: int | None = None,
+):
+    """Write controls to stdout as their details arrive.
+
+    Failed ids are reported on stderr, and make the command exit with status 1.
+    """
+    failed = 0
+    with open_writer(output_format, flush=True) as writer:
+        async for control_id, result in client.get_controls_as_completed(ids, max_concurrency):
+            if isinstance(result, PolitikontrollerError):
+                failed += 1
+                click.echo(f"{control_id}: {result!r}", err=True)
+            else:
+                writer.write(result)
+    if failed:
+        raise click.exceptions.Exit(1)
+
+
 @click.group()
 @click.option(
     "--username",
@@ -46,9 +114,15 @@ def tabulate_model(data: list[dict], keys: list[str]) -> list[list[str]]:
     confirmation_prompt=False,
     help="Password",
 )
+@click.option(
+    "--cache-login",
+    envvar="POLITIKONTROLLER_CACHE_LOGIN",
+    is_flag=True,
+    help="Reuse the login of earlier runs (kept in the user cache directory)",
+)
 @click.option("--debug", is_flag=True, help="Set logging level to DEBUG")
 @click.pass_context
-async def cli(ctx: Context, username: str, password: str, debug: bool):
+async def cli(ctx: Context, username: str, password: str, cache_login: bool, debug: bool):
     """Connect to politikontroller.no and fetch data in a simple way.
 
     Username and password can be defined using env vars.
@@ -56,15 +130,18 @@ async def cli(ctx: Context, username: str, password: str, debug: bool):
     POLITIKONTROLLER_USERNAME
     POLITIKONTROLLER_PASSWORD
     """
+    from politikontroller_py.auth_cache import AuthCache
+    from politikontroller_py.client import Client
+
     configure_logging(debug)
 
-    ctx.obj = client = Client()
+    ctx.obj = client = Client(auth_cache=AuthCache() if cache_login else None)
 
     try:
         user = await client.authenticate_user(username, password)
     except AuthenticationError as err:
         raise click.BadParameter(str(err), param_hint="--username, --password") from err
-    click.echo(user)
+    click.echo(user, err=True)
 
 
 @cli.command("check", short_help="server health check.")
@@ -75,19 +152,27 @@ async def check(obj: Client):
 
 
 @cli.command("get-control-types", short_help="get a list of control types.")
+@output_option(geo=False)
 @click.pass_obj
-async def get_control_types(obj):
-    types = await obj.get_control_types()
-    click.echo(tabulate([t.to_dict() for t in types], **TABULATE_DEFAULTS))
+async def get_control_types(obj: Client, output_format: str):
+    types = [{"type": t.name, "name": t.value} for t in obj.get_control_types()]
+    if output_format == "table":
+        click.echo(tabulate(types, headers="keys", **TABULATE_DEFAULTS))
+    else:
+        echo_rows(types, output_format)
 
 
 @cli.command("get-controls", short_help="get a list of all active controls.")
 @click.option("--lat", required=True, help="Your position (latitude)")
 @click.option("--lng", required=True, help="Your position (longitude)")
+@output_option()
 @click.pass_obj
-async def get_controls(obj, lat: float, lng: float):
-    controls = await obj.get_controls(lat, lng)
-    click.echo(tabulate([d.to_dict() for d in controls], **TABULATE_DEFAULTS))
+async def get_controls(obj, lat: float, lng: float, output_format: str):
+    controls = await obj.get_controls(lat, lng, lazy=output_format != "table")
+    if output_format == "table":
+        click.echo(tabulate([d.to_dict() for d in controls], **TABULATE_DEFAULTS))
+    else:
+        echo_rows(controls, output_format)
 
 
 @cli.command("get-controls-radius", short_help="get all active controls inside a radius.")
@@ -95,9 +180,22 @@ async def get_controls(obj, lat: float, lng: float):
 @click.option("--lng", type=float, required=True, help="Radius center (longitude)")
 @click.option("--radius", type=int, required=True, metavar="km", help="Radius size in kilometers")
 @click.option("--speed", type=int, required=False, metavar="km/h", help="Speed, unknown what this does")
+@output_option()
 @click.pass_obj
-async def get_controls_in_radius(obj: Client, lat: float, lng: float, radius: int, speed: int):
+async def get_controls_in_radius(
+    obj: Client,
+    lat: float,
+    lng: float,
+    radius: int,
+    speed: int,
+    output_format: str,
+):
     _controls = await obj.get_controls_in_radius(lat, lng, radius, speed)
+    if output_format != "table":
+        # Print each control as soon as its details arrive
+        await echo_controls_as_completed(obj, (c.id for c in _controls), output_format)
+        return
+
     controls = await obj.get_controls_from_lists(_controls)
 
     lists = tabulate_model(
@@ -115,36 +213,72 @@ async def get_controls_in_radius(obj: Client, lat: float, lng: float, radius: in
 
 
 @cli.command("get-control", short_help="get details on a control.")
-@click.argument("control_id", type=int, required=True)
+@click.argument("control_ids", metavar="[CONTROL_ID]...", type=int, nargs=-1)
+@click.option(
+    "--max-concurrency",
+    type=click.IntRange(min=1),
+    default=CLIENT_MAX_CONCURRENCY,
+    show_default=True,
+    help="Requests in flight at once",
+)
+@output_option(default=None)
 @click.pass_obj
-async def get_control(obj: Client, control_id: int):
-    control = await obj.get_control(control_id)
-    click.echo(
-        tabulate(
-            tabulate_model(
-                [control.to_dict()],
-                [
-                    "id",
-                    "county",
-                    "municipality",
-                    "description",
-                    "type",
-                    "lat",
-                    "lng",
-                    "timestamp",
-                ],
-            ),
-            headers="firstrow",
-            **TABULATE_DEFAULTS,
+async def get_control(
+    obj: Client,
+    control_ids: tuple[int, ...],
+    max_concurrency: int,
+    output_format: str | None,
+):
+    """Get details on one control, shown as a table.
+
+    With several ids, or with the ids read line by line from stdin when none are
+    given, the controls are fetched concurrently and printed as each one arrives,
+    as one JSON object per line unless another format is given. Failed ids are
+    reported on stderr.
+    """
+    if output_format is None:
+        output_format = "table" if len(control_ids) == 1 else "ndjson"
+    if output_format == "table":
+        if len(control_ids) != 1:
+            raise click.UsageError("Table output needs exactly one control id.")
+        control = await obj.get_control(control_ids[0])
+        click.echo(
+            tabulate(
+                tabulate_model(
+                    [control.to_dict()],
+                    [
+                        "id",
+                        "county",
+                        "municipality",
+                        "description",
+                        "type",
+                        "lat",
+                        "lng",
+                        "timestamp",
+                    ],
+                ),
+                headers="firstrow",
+                **TABULATE_DEFAULTS,
+            )
         )
-    )
+        return
+
+    stdin = click.get_text_stream("stdin")
+    if not control_ids and stdin.isatty():
+        raise click.UsageError("Give one or more control ids, or pipe them in on stdin.")
+    ids = control_ids or read_control_ids(stdin)
+    await echo_controls_as_completed(obj, ids, output_format, max_concurrency)
 
 
 @cli.command("get-maps", short_help="get own maps.")
+@output_option(geo=False)
 @click.pass_obj
-async def get_maps(obj: Client):
+async def get_maps(obj: Client, output_format: str):
     maps = await obj.get_maps()
-    click.echo(tabulate([m.to_dict() for m in maps], **TABULATE_DEFAULTS))
+    if output_format == "table":
+        click.echo(tabulate([m.to_dict() for m in maps], **TABULATE_DEFAULTS))
+    else:
+        echo_rows(maps, output_format)
 
 
 @cli.command("get-settings", short_help="get own settings.")
@@ -206,6 +340,58 @@ async def account_register(
     click.echo(res)
 
 
+async def read_control_ids(stream: TextIO) -> AsyncIterator[int]:
+    """Read one control id per line from `stream`, without blocking the event loop.
+
+    Lines are read one at a time, as they are wanted, by a daemon thread. Stopping
+    early leaves it waiting on the stream, so neither the reader nor the process
+    waits for more input.
+    """
+    loop = asyncio.get_running_loop()
+    wanted: queue.SimpleQueue[asyncio.Future[str]] = queue.SimpleQueue()
+    threading.Thread(
+        target=_read_lines, args=(stream, wanted, loop), name="control-id-reader", daemon=True
+    ).start()
+    while True:
+        future = loop.create_future()
+        wanted.put(future)
+        if not (line := await future):
+            return
+        if line := line.strip():
+            try:
+                yield int(line)
+            except ValueError as err:
+                raise click.BadParameter(f"{line!r} is not a control id", param_hint="stdin") from err
+
+
+def _read_lines(
+    stream: TextIO,
+    wanted: queue.SimpleQueue[asyncio.Future[str]],
+    loop: asyncio.AbstractEventLoop,
+):
+    """Read a line of `stream` for each future in `wanted`, until the end of the stream."""
+
+    def resolve(future: asyncio.Future[str], line: str, error: Exception | None):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(line)
+
+    line = None
+    while line != "":
+        future = wanted.get()
+        line, error = "", None
+        try:
+            line = stream.readline()
+        except Exception as err:  # noqa: BLE001
+            error = err
+        # The loop is closed when the reader stopped early
+        with suppress(RuntimeError):
+            loop.call_soon_threadsafe(resolve, future, line, error)
+
+
 def configure_logging(debug: bool = False):
     level = logging.DEBUG if debug else logging.INFO
     logging.basicConfig(level=level)
@@ -4,28 +4,47 @@ from __future__ import annotations
 
 import asyncio
 import binascii
-from dataclasses import dataclass
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from http import HTTPStatus
 import logging
-from typing import TypeVar
+import time
+from typing import TYPE_CHECKING, TypeVar
 from urllib.parse import urlencode
 
-from aiohttp import ClientError, ClientResponse, ClientResponseError, ClientSession
+from aiohttp import (
+    ClientError,
+    ClientResponse,
+    ClientResponseError,
+    ClientSession,
+    TCPConnector,
+    TraceConfig,
+)
 import async_timeout
 
 from .constants import (
     API_URL,
+    CLIENT_CONNECTION_LIMIT,
+    CLIENT_CONNECTION_LIMIT_PER_HOST,
+    CLIENT_DNS_CACHE_TTL,
+    CLIENT_KEEPALIVE_TIMEOUT,
+    CLIENT_MAX_CONCURRENCY,
     CLIENT_TIMEOUT,
     CLIENT_VERSION_NUMBER,
+    CONTROL_STORE_CHUNK_SIZE,
     DEFAULT_COUNTRY,
     ERROR_RESPONSES,
+    INVALID_AUTH,
     NO_ACCESS_RESPONSES,
     NO_CONTENT_RESPONSES,
     PHONE_PREFIXES,
+    WATCH_INTERVAL,
 )
 from .exceptions import (
     AuthenticationBlockedError,
     AuthenticationError,
+    CircuitOpenError,
+    InvalidAuthError,
     NoAccessError,
     NoContentError,
     NotActivatedError,
@@ -34,10 +53,12 @@ from .exceptions import (
     PolitikontrollerError,
     PolitikontrollerTimeoutError,
 )
+from .instrumentation import RequestEvent, RequestOutcome, current_event, record, timed
 from .models import (
     Account,
     AuthenticationResponse,
     AuthStatus,
+    PoliceControl,
     PoliceControlResponse,
     PoliceControlsResponse,
     PoliceGPSControlsResponse,
@@ -50,12 +71,30 @@ from .models.api import (
     PoliceControlTypeEnum,
     PolitiKontrollerRequest,
 )
+from .models.batch import ControlBatch
+from .models.lazy import LazyControls
+from .retry import RetryStats
+from .sweep import sweep
 from .utils import (
     aes_decrypt,
     aes_encrypt,
     map_response_data,
     merge_duplicate_controls,
 )
+from .watch import ChangeType, ControlWatcher
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterable, AsyncIterator, Iterable
+    from types import SimpleNamespace, TracebackType
+
+    from .auth_cache import AuthCache
+    from .cache import ControlCache
+    from .instrumentation import Instrumentation
+    from .retry import CircuitBreaker, RetryPolicy
+    from .store import ControlStore
+    from .sweep import Area, SweepReport
+    from .throttle import AdaptiveConcurrencyLimiter, RateLimiter
+    from .watch import ControlChange
 
 ResponseT = TypeVar(
     "ResponseT",
@@ -65,13 +104,52 @@ ResponseT = TypeVar(
 _LOGGER = logging.getLogger(__name__)
 
 
+async def _aiter_sync(items: Iterable[int]) -> AsyncIterator[int]:
+    for item in items:
+        yield item
+
+
+def _control_result(cid: int, task: asyncio.Future) -> PoliceControlResponse | PolitikontrollerError:
+    """Get the control a finished `get_control` task loaded, or the API error it raised."""
+    error = task.exception()
+    if error is None:
+        return task.result()
+    if not isinstance(error, PolitikontrollerError):
+        raise error
+    _LOGGER.warning("Failed to get details for control %s: %s", cid, error)
+    return error
+
+
+@dataclass
+class ConnectionStats:
+    """Connection counters for sessions created by the client."""
+
+    created: int = 0
+    reused: int = 0
+
+
 @dataclass
 class Client:
     user: Account | None = None
     session: ClientSession | None = None
     request_timeout: int = CLIENT_TIMEOUT
+    control_cache: ControlCache | None = None
+    control_store: ControlStore | None = None
+    coalesce_requests: bool = True
+    rate_limiter: RateLimiter | None = None
+    concurrency_limiter: AdaptiveConcurrencyLimiter | None = None
+    retry_policy: RetryPolicy | None = None
+    circuit_breaker: CircuitBreaker | None = None
+    api_url: str = API_URL
+    instrumentation: Instrumentation | None = None
+    auth_cache: AuthCache | None = None
+    connection_stats: ConnectionStats = field(init=False, default_factory=ConnectionStats)
+    retry_stats: RetryStats = field(init=False, default_factory=RetryStats)
 
     _close_session: bool = False
+    _session_users: int = field(init=False, default=0, repr=False)
+    _in_flight: dict[tuple, asyncio.Future] = field(init=False, default_factory=dict, repr=False)
+    _login_lock: asyncio.Lock = field(init=False, default_factory=asyncio.Lock, repr=False)
 
     @classmethod
     def initialize(cls, username: str, password: str, session: ClientSession | None = None) -> Client:
@@ -83,6 +161,43 @@ class Client:
         await c.authenticate_user(username, password)
         return c
 
+    async def __aenter__(self) -> Client:  # noqa: PYI034
+        """Keep one pooled session open until the context exits."""
+        self._session_users += 1
+        self._ensure_session()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        await self._release_session()
+
+    async def aclose(self):
+        """Close the session, if it was created by the client.
+
+        Raises `RuntimeError` while a request, a batch or an `async with` block is
+        using it.
+        """
+        if self._session_users:
+            raise RuntimeError("The session is still in use")
+        await self._close_own_session()
+
+    async def _release_session(self):
+        self._session_users -= 1
+        if self._session_users == 0:
+            await self._close_own_session()
+
+    async def _close_own_session(self):
+        session = self.session
+        close = self._close_session and session is not None and not session.closed
+        self._close_session = False
+        if close:
+            await session.close()
+            _LOGGER.debug("Session closed.")
+
     @property
     def request_header(self) -> dict[str, str]:
         """Generate a header for HTTP requests to the server."""
@@ -97,10 +212,33 @@ class Client:
         cast_to: type[ResponseT] | None = None,
         is_list=False,
     ) -> ResponseT | list[ResponseT] | str:
-        if params is None:
-            params = {}
         if isinstance(endpoint, str):
             endpoint = APIEndpoint.from_str(endpoint)
+        if self.auth_cache is None or not endpoint.requires_auth():
+            return await self._build_api_request(endpoint, params, cast_to, is_list)
+
+        user = self.user
+        try:
+            return await self._build_api_request(endpoint, dict(params or {}), cast_to, is_list)
+        except InvalidAuthError:
+            # The cached login is no longer accepted, log in again and retry once.
+            # Requests that failed with the same login wait for a single new one.
+            async with self._login_lock:
+                if self.user is user:
+                    _LOGGER.debug("Login of %s is no longer valid, logging in again", user.username)
+                    self.auth_cache.invalidate(user.username)
+                    await self.authenticate_user(user.username, user.password, use_cache=False)
+            return await self._build_api_request(endpoint, params, cast_to, is_list)
+
+    async def _build_api_request(
+        self,
+        endpoint: APIEndpoint,
+        params: dict | None,
+        cast_to: type[ResponseT] | None,
+        is_list: bool,
+    ) -> ResponseT | list[ResponseT] | str:
+        if params is None:
+            params = {}
 
         # Build request
         request_cls = EndpointRegistry.get_request_class(endpoint)
@@ -111,13 +249,98 @@ class Client:
         params["p"] = endpoint
         request = request_cls.from_dict(params)
 
-        data = await self.do_external_api_request(request)
+        async with self._request_event(endpoint) as event:
+            if not self.coalesce_requests or not endpoint.is_idempotent():
+                return await self._api_request(request, cast_to, is_list)
+
+            # Identical requests already in flight share the same upstream call
+            key = self._request_key(request, cast_to, is_list)
+            task = self._in_flight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._api_request(request, cast_to, is_list))
+                self._in_flight[key] = task
+                task.add_done_callback(lambda t: self._request_done(key, t))
+            else:
+                _LOGGER.debug("Joining in-flight request: %s", key)
+                if event is not None:
+                    event.coalesced = True
+            return await asyncio.shield(task)
+
+    @asynccontextmanager
+    async def _request_event(self, endpoint: APIEndpoint) -> AsyncIterator[RequestEvent | None]:
+        """Time the request inside the block, and pass its event to the instrumentation.
+
+        Nested blocks (a list call wrapping `api_request`) share the outer event.
+        """
+        event = current_event()
+        if self.instrumentation is None or event is not None:
+            try:
+                yield event
+            except NoContentError:
+                if event is not None:
+                    event.outcome = RequestOutcome.NO_CONTENT
+                raise
+            return
+
+        event = RequestEvent(endpoint)
+        started = time.perf_counter()
+        try:
+            with event.activate():
+                yield event
+        except NoContentError:
+            event.outcome = RequestOutcome.NO_CONTENT
+            raise
+        except asyncio.CancelledError:
+            event.outcome = RequestOutcome.CANCELLED
+            raise
+        except Exception as exception:
+            event.outcome = RequestOutcome.ERROR
+            event.error = type(exception).__name__
+            raise
+        else:
+            if event.outcome is None:
+                event.outcome = RequestOutcome.OK
+        finally:
+            event.total = time.perf_counter() - started
+            try:
+                self.instrumentation.on_request(event)
+            except Exception:
+                _LOGGER.exception("Instrumentation failed to handle %s", event)
+
+    @staticmethod
+    def _request_key(
+        request: PolitiKontrollerRequest,
+        cast_to: type[ResponseT] | None,
+        is_list: bool,
+    ) -> tuple:
+        """Identify a request by its business params, ignoring the random base fields."""
+        params = tuple(
+            sorted((k, str(v)) for k, v in request.to_dict().items() if k not in request.BASE_FIELDS)
+        )
+        return cast_to, is_list, params
+
+    def _request_done(self, key: tuple, task: asyncio.Future):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved, in case every caller was cancelled
+            task.exception()
+
+    async def _api_request(
+        self,
+        request: PolitiKontrollerRequest,
+        cast_to: type[ResponseT] | None = None,
+        is_list=False,
+    ) -> ResponseT | list[ResponseT] | str:
+        data = await self._request_with_retry(request)
         data_parts = data.split("|")
         _LOGGER.debug("Got response: %s", data)
 
         if data in ERROR_RESPONSES:
             msg = "Unknown error received from Politikontroller.no"
             raise PolitikontrollerError(msg)
+        if data == INVALID_AUTH:
+            raise InvalidAuthError
         if data in NO_ACCESS_RESPONSES:
             raise NoAccessError
         if data in NO_CONTENT_RESPONSES or len(data) == 0:
@@ -127,17 +350,134 @@ class Client:
 
         # Attempt to cast the response data to desired model
         if cast_to is not None:
-            return cast_to.from_response_data(data, multiple=is_list)
+            with timed("parse"):
+                result = cast_to.from_response_data(data, multiple=is_list)
+            record("rows", len(result) if is_list else 1)
+            return result
 
         # Return the raw response (str)
         return data
 
+    async def _request_with_retry(self, request: PolitiKontrollerRequest) -> str:
+        """Do the request, retrying failed requests to idempotent endpoints."""
+        breaker = self.circuit_breaker
+        policy = self.retry_policy if request.p.is_idempotent() else None
+        attempt = 0
+        while True:
+            attempt += 1
+            if breaker is not None:
+                try:
+                    breaker.before_request()
+                except CircuitOpenError:
+                    self.retry_stats.rejected += 1
+                    raise
+
+            self.retry_stats.attempts += 1
+            try:
+                data = await self._throttled_request(request)
+            except asyncio.CancelledError:
+                if breaker is not None:
+                    breaker.on_cancel()
+                raise
+            except Exception as exception:
+                if breaker is not None:
+                    if isinstance(exception, PolitikontrollerConnectionError):
+                        breaker.on_failure()
+                    else:
+                        breaker.on_success()
+                if policy is None or not policy.should_retry(exception, attempt):
+                    self.retry_stats.failures += 1
+                    raise
+                delay = policy.delay(attempt)
+                self.retry_stats.retries += 1
+                record("retries", 1)
+                _LOGGER.debug("Retrying %s in %.3fs after: %s", request.p, delay, exception)
+                await asyncio.sleep(delay)
+                continue
+
+            if breaker is not None:
+                breaker.on_success()
+            return data
+
+    async def _throttled_request(self, request: PolitiKontrollerRequest) -> str:
+        """Do the request once the rate and concurrency limiters allow it."""
+        queued = time.perf_counter()
+        if self.rate_limiter is not None:
+            account = self.user.username if self.user is not None else None
+            waited = await self.rate_limiter.acquire(request.p, account)
+            if waited > 0:
+                _LOGGER.debug("Rate limited %s for %.3fs", request.p, waited)
+
+        limiter = self.concurrency_limiter
+        if limiter is None:
+            record("queue_wait", time.perf_counter() - queued)
+            return await self.do_external_api_request(request)
+
+        async with limiter.slot():
+            record("queue_wait", time.perf_counter() - queued)
+            started = time.monotonic()
+            try:
+                data = await self.do_external_api_request(request)
+            except PolitikontrollerConnectionError:
+                limiter.on_overload()
+                raise
+            if data in NO_ACCESS_RESPONSES:
+                limiter.on_overload()
+            else:
+                limiter.on_success(time.monotonic() - started)
+            return data
+
     def _ensure_session(self):
         if self.session is None or self.session.closed:
-            self.session = ClientSession()
+            self.session = self._create_session()
             _LOGGER.debug("New session created.")
             self._close_session = True
 
+    def _create_session(self) -> ClientSession:
+        connector = TCPConnector(
+            limit=CLIENT_CONNECTION_LIMIT,
+            limit_per_host=CLIENT_CONNECTION_LIMIT_PER_HOST,
+            ttl_dns_cache=CLIENT_DNS_CACHE_TTL,
+            keepalive_timeout=CLIENT_KEEPALIVE_TIMEOUT,
+        )
+        trace_config = TraceConfig()
+        trace_config.on_connection_queued_start.append(self._on_connection_start)
+        trace_config.on_connection_queued_end.append(self._on_connection_queued_end)
+        trace_config.on_connection_create_start.append(self._on_connection_start)
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        return ClientSession(connector=connector, trace_configs=[trace_config])
+
+    @staticmethod
+    async def _on_connection_start(_session: ClientSession, ctx: SimpleNamespace, _params):
+        ctx.started = time.perf_counter()
+
+    @staticmethod
+    async def _on_connection_queued_end(_session: ClientSession, ctx: SimpleNamespace, _params):
+        record("queue_wait", time.perf_counter() - ctx.started)
+
+    async def _on_connection_create_end(self, _session: ClientSession, ctx: SimpleNamespace, _params):
+        self.connection_stats.created += 1
+        record("connect", time.perf_counter() - ctx.started)
+
+    async def _on_connection_reuseconn(self, _session: ClientSession, _ctx: SimpleNamespace, _params):
+        self.connection_stats.reused += 1
+
+    @asynccontextmanager
+    async def _shared_session(self) -> AsyncIterator[ClientSession]:
+        """Keep one session open for a batch of concurrent requests.
+
+        Batches and single requests each hold the session while they run, and so
+        does `async with client`. A session created by the client is closed once
+        the last of them is done, instead of after the first request.
+        """
+        self._session_users += 1
+        try:
+            self._ensure_session()
+            yield self.session
+        finally:
+            await self._release_session()
+
     @staticmethod
     async def _request_check_status(response: ClientResponse):
         if response.status == HTTPStatus.NOT_FOUND:
@@ -159,51 +499,65 @@ class Client:
 
         payload = request.get_query_params()
         _LOGGER.debug("Doing API request with params: %s", payload)
-        url = f"{API_URL}/app.php?{aes_encrypt(urlencode(payload))}"
+        url = f"{self.api_url}/app.php?{aes_encrypt(urlencode(payload))}"
         headers = {
             "user-agent": f"PK_{CLIENT_VERSION_NUMBER}",
             **headers,
         }
 
-        self._ensure_session()
+        async with self._shared_session() as session:
+            try:
+                async with async_timeout.timeout(self.request_timeout):
+                    started = time.perf_counter()
+                    response = await session.get(
+                        url,
+                        **kwargs,
+                        headers=headers,
+                        raise_for_status=self._request_check_status,
+                    )
+                    headers_at = time.perf_counter()
+                    record("ttfb", headers_at - started)
+                    enc_data = await response.text("utf-8")
+                    body_at = time.perf_counter()
+                    record("body", body_at - headers_at)
+                    record("response_bytes", len(enc_data))
+                    _LOGGER.debug("Response: %s", enc_data)
+                    try:
+                        data = aes_decrypt(enc_data)
+                    except (binascii.Error, ValueError):
+                        data = enc_data.strip()
+                    record("decrypt", time.perf_counter() - body_at)
 
-        try:
-            async with async_timeout.timeout(self.request_timeout):
-                response = await self.session.get(
-                    url,
-                    **kwargs,
-                    headers=headers,
-                    raise_for_status=self._request_check_status,
-                )
-                enc_data = await response.text("utf-8")
-                _LOGGER.debug("Response: %s", enc_data)
-                try:
-                    data = aes_decrypt(enc_data)
-                except (binascii.Error, ValueError):
-                    data = enc_data.strip()
-
-                return data
-
-        except asyncio.TimeoutError as exception:
-            msg = "Timeout occurred while connecting to Politikontroller.no"
-            raise PolitikontrollerTimeoutError(msg) from exception
-        except (
-            ClientError,
-            ClientResponseError,
-        ) as exception:
-            raise PolitikontrollerConnectionError(
-                f"Error occurred while communicating with Politikontroller.no: {exception}",
-            ) from exception
-        finally:
-            if self._close_session:
-                await self.session.close()
-                self._close_session = False
+                    return data
+
+            except asyncio.TimeoutError as exception:
+                msg = "Timeout occurred while connecting to Politikontroller.no"
+                raise PolitikontrollerTimeoutError(msg) from exception
+            except (
+                ClientError,
+                ClientResponseError,
+            ) as exception:
+                raise PolitikontrollerConnectionError(
+                    f"Error occurred while communicating with Politikontroller.no: {exception}",
+                ) from exception
 
     def set_user(self, user: Account):
         self.user = user
 
-    async def authenticate_user(self, username: str, password: str) -> Account:
-        """Authenticate user."""
+    async def authenticate_user(self, username: str, password: str, use_cache: bool = True) -> Account:
+        """Authenticate user.
+
+        With an `auth_cache`, a cached login of `username` with the same `password`
+        is used instead of logging in, unless `use_cache` is off. Successful logins are cached.
+        """
+        if use_cache and self.auth_cache is not None:
+            account = self.auth_cache.load(username, password)
+            if account is not None:
+                _LOGGER.debug("Using cached login of %s", username)
+                account.password = password
+                self.set_user(account)
+                return account
+
         auth_user = Account(username=username, password=password)
         params = {
             "lang": auth_user.country.lower(),
@@ -227,6 +581,8 @@ class Client:
 
         account = Account.from_dict({str(k): str(v) for k, v in account_dict.items()})
         self.set_user(account)
+        if self.auth_cache is not None:
+            self.auth_cache.save(account)
         return account
 
     async def check(self):
@@ -242,37 +598,60 @@ class Client:
 
     async def get_control(self, cid: int) -> PoliceControlResponse:
         """Get details for a single control."""
-        return await self.api_request(
+        if self.control_cache is not None and (control := self.control_cache.get(cid)) is not None:
+            return control
+
+        control = await self.api_request(
             APIEndpoint.SPEED_CONTROL,
             {
                 "kontroll_id": cid,
             },
             cast_to=PoliceControlResponse,
         )
+        if self.control_cache is not None:
+            self.control_cache.set(control)
+        if self.control_store is not None:
+            self.control_store.upsert(control)
+        return control
 
     async def get_controls(
         self,
         lat: float,
         lng: float,
         merge_duplicates: bool = True,
-    ) -> list[PoliceControlsResponse]:
-        """Get all active controls."""
-        try:
-            controls = await self.api_request(
-                APIEndpoint.SPEED_CONTROLS,
-                {
-                    "lat": lat,
-                    "lon": lng,
-                },
-                cast_to=PoliceControlsResponse,
-                is_list=True,
-            )
-        except NoContentError:
-            return []
+        as_batch: bool = False,
+        lazy: bool = False,
+    ) -> (
+        list[PoliceControlsResponse]
+        | ControlBatch[PoliceControlsResponse]
+        | LazyControls[PoliceControlsResponse]
+    ):
+        """Get all active controls.
+
+        With `as_batch`, the controls are returned as a columnar `ControlBatch`.
+        With `lazy`, they are returned as a `LazyControls`, which only deserializes
+        the controls that are accessed.
+        """
+        return await self._list_controls(
+            APIEndpoint.SPEED_CONTROLS,
+            self._controls_params(lat, lng),
+            PoliceControlsResponse,
+            merge_duplicates,
+            as_batch,
+            lazy,
+        )
+
+    async def iter_controls(self, lat: float, lng: float) -> AsyncIterator[PoliceControlsResponse]:
+        """Stream all active controls, one at a time.
 
-        if merge_duplicates:
-            return merge_duplicate_controls(controls)
-        return controls
+        Rows are deserialized lazily as the iterator advances. Duplicates are not merged.
+        """
+        async for control in self._iter_controls(
+            APIEndpoint.SPEED_CONTROLS,
+            self._controls_params(lat, lng),
+            PoliceControlsResponse,
+        ):
+            yield control
 
     async def get_controls_in_radius(
         self,
@@ -281,36 +660,300 @@ class Client:
         radius: int,
         speed: int = 100,
         merge_duplicates: bool = True,
+        as_batch: bool = False,
+        lazy: bool = False,
         **kwargs,
-    ) -> list[PoliceGPSControlsResponse]:
-        """Get all active controls within a radius."""
-        params = {
+    ) -> (
+        list[PoliceGPSControlsResponse]
+        | ControlBatch[PoliceGPSControlsResponse]
+        | LazyControls[PoliceGPSControlsResponse]
+    ):
+        """Get all active controls within a radius.
+
+        With `as_batch`, the controls are returned as a columnar `ControlBatch`.
+        With `lazy`, they are returned as a `LazyControls`, which only deserializes
+        the controls that are accessed.
+        """
+        return await self._list_controls(
+            APIEndpoint.GPS_CONTROLS,
+            self._controls_in_radius_params(lat, lng, radius, speed, **kwargs),
+            PoliceGPSControlsResponse,
+            merge_duplicates,
+            as_batch,
+            lazy,
+        )
+
+    async def iter_controls_in_radius(
+        self,
+        lat: float,
+        lng: float,
+        radius: int,
+        speed: int = 100,
+        **kwargs,
+    ) -> AsyncIterator[PoliceGPSControlsResponse]:
+        """Stream all active controls within a radius, one at a time.
+
+        Rows are deserialized lazily as the iterator advances. Duplicates are not merged.
+        """
+        async for control in self._iter_controls(
+            APIEndpoint.GPS_CONTROLS,
+            self._controls_in_radius_params(lat, lng, radius, speed, **kwargs),
+            PoliceGPSControlsResponse,
+        ):
+            yield control
+
+    @staticmethod
+    def _controls_params(lat: float, lng: float) -> dict[str, float]:
+        return {
+            "lat": lat,
+            "lon": lng,
+        }
+
+    @staticmethod
+    def _controls_in_radius_params(lat: float, lng: float, radius: int, speed: int, **kwargs) -> dict:
+        return {
             "vr": radius,
             "speed": speed,
             "lat": lat,
             "lon": lng,
             **kwargs,
         }
+
+    async def _list_controls(
+        self,
+        endpoint: APIEndpoint,
+        params: dict,
+        cast_to: type[PoliceControl],
+        merge_duplicates: bool,
+        as_batch: bool,
+        lazy: bool,
+    ) -> list[PoliceControl] | ControlBatch[PoliceControl] | LazyControls[PoliceControl]:
+        if as_batch and lazy:
+            raise ValueError("as_batch and lazy cannot be combined")
+        async with self._request_event(endpoint):
+            if lazy:
+                try:
+                    data = await self.api_request(endpoint, params)
+                except NoContentError:
+                    data = ""
+                with timed("parse"):
+                    controls = LazyControls(cast_to, data)
+                record("rows", len(controls))
+                # Keep the result lazy: rows are stored as they are built, and only
+                # the rows of cached controls are built to refresh the cache.
+                if self.control_store is not None:
+                    controls.on_build = self.control_store.upsert_many
+                if self.control_cache is not None:
+                    cached = [i for i, cid in enumerate(controls.ids) if cid in self.control_cache]
+                    self.control_cache.invalidate_outdated(controls.take(cached))
+                if merge_duplicates:
+                    with timed("merge"):
+                        controls = controls.merge_duplicates()
+                return controls
+
+            if (
+                as_batch
+                and not merge_duplicates
+                and self.control_cache is None
+                and self.control_store is None
+            ):
+                # Nothing needs the models, fill the columns straight from the response
+                try:
+                    data = await self.api_request(endpoint, params)
+                except NoContentError:
+                    return ControlBatch(cast_to)
+                with timed("parse"):
+                    batch = ControlBatch.from_response_data(cast_to, data)
+                record("rows", len(batch))
+                return batch
+
+            try:
+                controls = await self.api_request(endpoint, params, cast_to=cast_to, is_list=True)
+            except NoContentError:
+                controls = []
+
+            self._observe_controls(controls)
+            if merge_duplicates:
+                with timed("merge"):
+                    controls = merge_duplicate_controls(controls)
+            if as_batch:
+                return ControlBatch.from_controls(controls, cast_to)
+            return controls
+
+    async def _iter_controls(
+        self,
+        endpoint: APIEndpoint,
+        params: dict,
+        cast_to: type[PoliceControl],
+    ) -> AsyncIterator[PoliceControl]:
+        try:
+            data = await self.api_request(endpoint, params)
+        except NoContentError:
+            return
+
+        # Yielded controls are observed in chunks, so a store commits once per chunk
+        observed: list[PoliceControl] = []
         try:
-            controls = await self.api_request(
+            for control in cast_to.iter_from_response_data(data):
+                observed.append(control)
+                if len(observed) >= CONTROL_STORE_CHUNK_SIZE:
+                    self._observe_controls(observed)
+                    observed = []
+                yield control
+        finally:
+            if observed:
+                self._observe_controls(observed)
+
+    def _observe_controls(self, controls: list[PoliceControl]):
+        """Refresh outdated cached details, and store the listed controls."""
+        if self.control_cache is not None:
+            self.control_cache.invalidate_outdated(controls)
+        if self.control_store is not None:
+            self.control_store.upsert_many(controls)
+
+    async def watch(
+        self,
+        lat: float,
+        lng: float,
+        radius: int | None = None,
+        speed: int = 100,
+        interval: float = WATCH_INTERVAL,
+        **kwargs,
+    ) -> AsyncIterator[ControlChange[PoliceControl]]:
+        """Poll active controls every `interval` seconds, and stream what changed.
+
+        Polls `get_controls`, or `get_controls_in_radius` if `radius` is given. The
+        first poll reports every control as added. Duplicates are not merged.
+        Wrap the iterator in `contextlib.aclosing` to release the session as soon
+        as you stop iterating.
+        """
+        if radius is None:
+            endpoint, params, cast_to = (
+                APIEndpoint.SPEED_CONTROLS,
+                self._controls_params(lat, lng),
+                PoliceControlsResponse,
+            )
+        else:
+            endpoint, params, cast_to = (
                 APIEndpoint.GPS_CONTROLS,
-                params,
-                cast_to=PoliceGPSControlsResponse,
-                is_list=True,
+                self._controls_in_radius_params(lat, lng, radius, speed, **kwargs),
+                PoliceGPSControlsResponse,
             )
-        except NoContentError:
-            return []
 
-        if merge_duplicates:
-            return merge_duplicate_controls(controls)
-        return controls
+        watcher = ControlWatcher(cast_to)
+        async with self._shared_session():
+            while True:
+                try:
+                    data = await self.api_request(endpoint, dict(params))
+                except NoContentError:
+                    data = ""
+                changes = watcher.update(data)
+                self._observe_controls([c.control for c in changes if c.type != ChangeType.REMOVED])
+                for change in changes:
+                    yield change
+                await asyncio.sleep(interval)
+
+    async def sweep(
+        self,
+        area: Area,
+        radius: int,
+        speed: int = 100,
+        max_concurrency: int | None = None,
+        **kwargs,
+    ) -> SweepReport:
+        """Get all active controls in a bounding box or polygon.
+
+        See `politikontroller_py.sweep.sweep` for the options.
+        """
+        async with self._shared_session():
+            return await sweep(self, area, radius, speed, max_concurrency, **kwargs)
 
     async def get_controls_from_lists(
         self,
         controls: list[PoliceGPSControlsResponse | PoliceControlsResponse],
-    ) -> list[PoliceControlResponse]:
-        """Get details for a list of controls."""
-        return [await self.get_control(i.id) for i in controls]
+        max_concurrency: int | None = None,
+        return_exceptions: bool = False,
+    ) -> list[PoliceControlResponse | PolitikontrollerError]:
+        """Get details for a list of controls.
+
+        Up to `max_concurrency` requests are in flight at once, all sharing the same
+        session. Results keep the order of `controls`. Controls that fail to load are
+        left out, or returned as the raised error in their place if
+        `return_exceptions` is set.
+        """
+        if max_concurrency is None:
+            max_concurrency = CLIENT_MAX_CONCURRENCY
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _get_control(cid: int) -> PoliceControlResponse:
+            async with semaphore:
+                return await self.get_control(cid)
+
+        async with self._shared_session():
+            results = await asyncio.gather(
+                *[_get_control(c.id) for c in controls],
+                return_exceptions=True,
+            )
+
+        for control, result in zip(controls, results):
+            if isinstance(result, BaseException) and not isinstance(result, PolitikontrollerError):
+                raise result
+            if isinstance(result, PolitikontrollerError):
+                _LOGGER.warning("Failed to get details for control %s: %s", control.id, result)
+
+        if return_exceptions:
+            return results
+        return [r for r in results if not isinstance(r, PolitikontrollerError)]
+
+    async def get_controls_as_completed(
+        self,
+        ids: Iterable[int] | AsyncIterable[int],
+        max_concurrency: int | None = None,
+    ) -> AsyncIterator[tuple[int, PoliceControlResponse | PolitikontrollerError]]:
+        """Get details for many control ids, yielding `(id, result)` as each request finishes.
+
+        `ids` is read as requests complete, so it can be a long or slow stream: at most
+        `max_concurrency` requests are in flight, and results are yielded while the
+        next ids are still on their way. A control that fails to load is yielded with
+        the raised error as its result.
+        """
+        if max_concurrency is None:
+            max_concurrency = CLIENT_MAX_CONCURRENCY
+        ids = ids.__aiter__() if hasattr(ids, "__aiter__") else _aiter_sync(ids)
+
+        async def _next_id() -> int | None:
+            try:
+                return await ids.__anext__()
+            except StopAsyncIteration:
+                return None
+
+        pending: dict[asyncio.Future, int] = {}
+        next_id: asyncio.Future | None = None
+        exhausted = False
+        async with self._shared_session():
+            try:
+                while True:
+                    if next_id is None and not exhausted and len(pending) < max_concurrency:
+                        next_id = asyncio.ensure_future(_next_id())
+                    waiting = {*pending, next_id} if next_id is not None else set(pending)
+                    if not waiting:
+                        return
+                    done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                    if next_id in done:
+                        cid = next_id.result()
+                        next_id = None
+                        if cid is None:
+                            exhausted = True
+                        else:
+                            pending[asyncio.ensure_future(self.get_control(cid))] = cid
+                    for task in done & pending.keys():
+                        cid = pending.pop(task)
+                        yield cid, _control_result(cid, task)
+            finally:
+                leftover = [*pending, next_id] if next_id is not None else list(pending)
+                for task in leftover:
+                    task.cancel()
+                await asyncio.gather(*leftover, return_exceptions=True)
 
     @staticmethod
     def get_control_types() -> list[PoliceControlTypeEnum]:
@@ -4,6 +4,11 @@ CRYPTO_K2 = "ZGlsZG9zZXJ2aWNlX3N1eA=="  # "dildoservice_sux"
 CLIENT_VERSION_NUMBER = "9.1.0"
 CLIENT_OS = "Android"
 CLIENT_TIMEOUT = 30
+CLIENT_MAX_CONCURRENCY = 10
+CLIENT_CONNECTION_LIMIT = 100
+CLIENT_CONNECTION_LIMIT_PER_HOST = 10
+CLIENT_KEEPALIVE_TIMEOUT = 30
+CLIENT_DNS_CACHE_TTL = 300
 API_URL = "http://app.politikontroller.no"
 
 NO_CONTROLS = "INGEN_KONTROLLER"
@@ -36,6 +41,33 @@ PHONE_PREFIXES = {
 PHONE_NUMBER_LENGTH = 8
 DEFAULT_COUNTRY = "no"
 DEFAULT_MAX_DISTANCE = 1.5
+EARTH_RADIUS = 6373.0  # Approximate radius of earth in km
 
 DESCRIPTION_TRUNCATE_LENGTH = 27
 DESCRIPTION_TRUNCATE_SUFFIX = ".."
+
+CONTROL_CACHE_MAX_ENTRIES = 1024
+CONTROL_CACHE_TTL = 60
+CONTROL_STORE_CHUNK_SIZE = 10_000  # Streamed controls stored per transaction
+
+CLIENT_RATE_LIMIT = 5.0  # Requests per second
+CLIENT_RATE_BURST = 10
+CLIENT_MIN_CONCURRENCY = 1
+CLIENT_LATENCY_TOLERANCE = 2.0
+
+CLIENT_RETRY_ATTEMPTS = 3
+CLIENT_RETRY_BACKOFF = 0.5  # Seconds before the first retry, doubled for each retry
+CLIENT_RETRY_MAX_BACKOFF = 10.0
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 30.0
+
+WATCH_INTERVAL = 30  # Seconds between polls
+
+SWEEP_BAND_ROWS = 6  # Rows of circles sharing one longitude spacing
+SWEEP_TRUNCATION_LIMIT = 100  # Results from one call that suggest the server cut the list short
+SWEEP_COVERAGE_SAMPLES = 32  # Sample points per side when estimating coverage
+
+AUTH_CACHE_TTL = 12 * 60 * 60  # Seconds a cached login is trusted
+AUTH_CACHE_FILE = "politikontroller/session.json"  # Relative to the user cache directory
+
+GEOJSON_CHUNK_SIZE = 64 * 1024  # Bytes of encoded features per write
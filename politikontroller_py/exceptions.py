@@ -32,3 +32,11 @@ class AuthenticationBlockedError(AuthenticationError):
 
 class NotActivatedError(AuthenticationError):
     pass
+
+
+class CircuitOpenError(PolitikontrollerConnectionError):
+    pass
+
+
+class InvalidAuthError(NoAccessError):
+    pass
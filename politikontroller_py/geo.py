@@ -0,0 +1,115 @@
+"""Batch distance calculations over many controls.
+
+Uses NumPy when it is installed, and falls back to plain Python otherwise. NumPy
+is only imported once a calculation needs it. All distances are great-circle
+distances in km, using the same formula as `utils.calculate_distance`.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from importlib.util import find_spec
+from math import atan2, cos, radians, sin, sqrt
+from typing import TYPE_CHECKING, TypeVar
+
+from .constants import EARTH_RADIUS
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from types import ModuleType
+
+    from .models.api import PoliceControl
+
+    PC = TypeVar("PC", bound=PoliceControl)
+
+HAS_NUMPY = find_spec("numpy") is not None
+
+
+def _numpy() -> ModuleType:
+    return import_module("numpy")
+
+
+def coordinate_arrays(controls: Sequence[PoliceControl]) -> tuple[Sequence[float], Sequence[float]]:
+    """Get latitudes and longitudes of `controls` as two arrays."""
+    lats = [c.point.lat for c in controls]
+    lngs = [c.point.lng for c in controls]
+    if HAS_NUMPY:
+        np = _numpy()
+        return np.asarray(lats, dtype=float), np.asarray(lngs, dtype=float)
+    return lats, lngs
+
+
+def _distances_py(lat: float, lng: float, lats: Sequence[float], lngs: Sequence[float]) -> list[float]:
+    lat1, lon1 = radians(lat), radians(lng)
+    cos_lat1 = cos(lat1)
+    result = []
+    for lat2, lon2 in zip(lats, lngs):
+        lat2, lon2 = radians(lat2), radians(lon2)  # noqa: PLW2901
+        a = sin((lat2 - lat1) / 2) ** 2 + cos_lat1 * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+        result.append(EARTH_RADIUS * 2 * atan2(sqrt(a), sqrt(1 - a)))
+    return result
+
+
+def distances_from(
+    lat: float,
+    lng: float,
+    lats: Sequence[float],
+    lngs: Sequence[float],
+    use_numpy: bool | None = None,
+) -> Sequence[float]:
+    """Get the distance from one point to each of the points in `lats`/`lngs`."""
+    if use_numpy is None:
+        use_numpy = HAS_NUMPY
+    if not use_numpy:
+        return _distances_py(lat, lng, lats, lngs)
+
+    np = _numpy()
+    lat1, lon1 = np.radians(lat), np.radians(lng)
+    lat2, lon2 = np.radians(np.asarray(lats, dtype=float)), np.radians(np.asarray(lngs, dtype=float))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return EARTH_RADIUS * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def distance_matrix(
+    lats: Sequence[float],
+    lngs: Sequence[float],
+    other_lats: Sequence[float] | None = None,
+    other_lngs: Sequence[float] | None = None,
+    use_numpy: bool | None = None,
+) -> Sequence[Sequence[float]]:
+    """Get the distance between every pair of points.
+
+    Row `i`, column `j` holds the distance from point `i` to point `j` of the other
+    set, or of the same set if no other set is given.
+    """
+    if use_numpy is None:
+        use_numpy = HAS_NUMPY
+    if other_lats is None or other_lngs is None:
+        other_lats, other_lngs = lats, lngs
+    if not use_numpy:
+        return [_distances_py(lat, lng, other_lats, other_lngs) for lat, lng in zip(lats, lngs)]
+
+    np = _numpy()
+    lat1 = np.radians(np.asarray(lats, dtype=float))[:, np.newaxis]
+    lon1 = np.radians(np.asarray(lngs, dtype=float))[:, np.newaxis]
+    lat2 = np.radians(np.asarray(other_lats, dtype=float))[np.newaxis, :]
+    lon2 = np.radians(np.asarray(other_lngs, dtype=float))[np.newaxis, :]
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return EARTH_RADIUS * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def controls_in_radius(controls: Sequence[PC], lat: float, lng: float, radius: float) -> list[PC]:
+    """Get the controls within `radius` km of a point, in their original order."""
+    distances = distances_from(lat, lng, *coordinate_arrays(controls))
+    return [c for c, d in zip(controls, distances) if d <= radius]
+
+
+def nearest_control(controls: Sequence[PC], lat: float, lng: float) -> tuple[PC, float] | None:
+    """Get the control nearest to a point, and its distance in km."""
+    if len(controls) == 0:
+        return None
+    distances = distances_from(lat, lng, *coordinate_arrays(controls))
+    index = (
+        int(_numpy().argmin(distances)) if HAS_NUMPY else min(range(len(controls)), key=distances.__getitem__)
+    )
+    return controls[index], float(distances[index])
@@ -0,0 +1,200 @@
+"""Per-request timing events, and an in-memory aggregator for them.
+
+While a request is running its `RequestEvent` is the current one, and each
+layer of the client adds what it measured with `record`: the limiters add the
+queue wait, the session adds connect, first byte and body times, the codec adds
+the decrypt time and the models the parse time. Once the request is done, the
+event is passed to the `on_request` method of the client's instrumentation.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import Enum
+from math import ceil, log
+import time
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from .models.api import APIEndpoint
+
+PHASES = ("total", "queue_wait", "connect", "ttfb", "body", "decrypt", "parse", "merge")
+
+
+class RequestOutcome(str, Enum):
+    OK = "ok"
+    NO_CONTENT = "no_content"
+    ERROR = "error"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class RequestEvent:
+    """What one request to the API spent its time on, in seconds.
+
+    `ttfb` runs from sending the request to receiving the response headers, and
+    includes `connect` when a new connection was opened. Times of all attempts
+    are added up. `coalesced` is set when the request joined an identical one
+    already in flight, whose event carries the network times.
+    """
+
+    endpoint: APIEndpoint
+    started_at: float = field(default_factory=time.time)
+    total: float = 0.0
+    queue_wait: float = 0.0
+    connect: float = 0.0
+    ttfb: float = 0.0
+    body: float = 0.0
+    response_bytes: int = 0
+    decrypt: float = 0.0
+    parse: float = 0.0
+    rows: int = 0
+    merge: float = 0.0
+    retries: int = 0
+    coalesced: bool = False
+    outcome: RequestOutcome | None = None
+    error: str | None = None
+
+    @contextmanager
+    def activate(self) -> Iterator[RequestEvent]:
+        """Make this the event `record` adds to inside the block."""
+        token = _current_event.set(self)
+        try:
+            yield self
+        finally:
+            _current_event.reset(token)
+
+
+_current_event: ContextVar[RequestEvent | None] = ContextVar("current_request_event", default=None)
+
+
+def current_event() -> RequestEvent | None:
+    """Get the event of the request running in this context, if it is instrumented."""
+    return _current_event.get()
+
+
+def record(name: str, value: float):
+    """Add `value` to field `name` of the current event, if any."""
+    event = _current_event.get()
+    if event is not None:
+        setattr(event, name, getattr(event, name) + value)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Add the time spent inside the block to field `name` of the current event, if any."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+class Instrumentation(Protocol):
+    def on_request(self, event: RequestEvent) -> None: ...
+
+
+class Histogram:
+    """Log-bucketed histogram of durations.
+
+    Bucket bounds grow by `precision` (5% by default), so percentiles are within
+    that of the true value, whatever the number of samples.
+    """
+
+    def __init__(self, precision: float = 0.05, min_value: float = 1e-6):
+        self.min_value = min_value
+        self._growth = 1 + precision
+        self._log_growth = log(self._growth)
+        self.buckets: Counter[int] = Counter()
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def add(self, value: float):
+        index = ceil(log(value / self.min_value) / self._log_growth) if value > self.min_value else 0
+        self.buckets[index] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Get the value `q` percent of the samples are at or below."""
+        if self.count == 0:
+            return 0.0
+        if q <= 0:
+            return self.min
+        rank = q / 100 * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                upper = self.min_value * self._growth**index
+                return min(max(upper, self.min), self.max)
+        return self.max  # pragma: no cover
+
+
+class RequestMetrics:
+    """Aggregate request events per endpoint, with a histogram per phase."""
+
+    def __init__(self, precision: float = 0.05):
+        self.precision = precision
+        self.histograms: dict[tuple[str | None, str], Histogram] = {}
+        self.counts: Counter[str | None] = Counter()
+        self.outcomes: Counter[tuple[str | None, str]] = Counter()
+        self.retries: Counter[str | None] = Counter()
+        self.response_bytes: Counter[str | None] = Counter()
+        self.rows: Counter[str | None] = Counter()
+
+    def on_request(self, event: RequestEvent):
+        for endpoint in (str(event.endpoint), None):
+            self.counts[endpoint] += 1
+            self.outcomes[endpoint, event.outcome.value] += 1
+            self.retries[endpoint] += event.retries
+            self.response_bytes[endpoint] += event.response_bytes
+            self.rows[endpoint] += event.rows
+            for phase in PHASES:
+                self.histogram(phase, endpoint).add(getattr(event, phase))
+
+    def histogram(self, phase: str, endpoint: str | None = None) -> Histogram:
+        """Get the histogram of `phase`, for one endpoint or for all of them."""
+        key = (endpoint, phase)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(self.precision)
+        return histogram
+
+    def percentile(self, q: float, phase: str = "total", endpoint: str | None = None) -> float:
+        return self.histogram(phase, endpoint).percentile(q)
+
+    def summary(self, percentiles: tuple[float, ...] = (50, 90, 99)) -> dict[str, dict[str, Any]]:
+        """Summarize every endpoint, and all of them under "all"."""
+        summary = {}
+        for endpoint, count in self.counts.items():
+            phases = {}
+            for phase in PHASES:
+                histogram = self.histogram(phase, endpoint)
+                phases[phase] = {
+                    **{f"p{q:g}": histogram.percentile(q) for q in percentiles},
+                    "mean": histogram.mean,
+                    "max": histogram.max,
+                }
+            summary["all" if endpoint is None else endpoint] = {
+                "count": count,
+                "outcomes": {o: n for (e, o), n in self.outcomes.items() if e == endpoint},
+                "retries": self.retries[endpoint],
+                "response_bytes": self.response_bytes[endpoint],
+                "rows": self.rows[endpoint],
+                "phases": phases,
+            }
+        return summary
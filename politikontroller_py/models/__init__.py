@@ -7,12 +7,16 @@ from .api import (
     PoliceGPSControlsResponse,
     UserMap,
 )
+from .batch import ControlBatch
 from .common import PolitiKontrollerResponse
+from .lazy import LazyControls
 
 __all__ = [
     "Account",
     "AuthenticationResponse",
     "AuthStatus",
+    "ControlBatch",
+    "LazyControls",
     "PoliceControl",
     "PoliceControlResponse",
     "PoliceControlsResponse",
@@ -75,8 +75,7 @@ class AuthenticationResponse(PolitiKontrollerResponse):
             AuthStatus.NOT_ACTIVATED: AuthenticationResponseNotActivated,
         }
         sub_class = subtypes.get(auth_status, cls)
-        data = map_response_data(cvs, sub_class.attr_map, multiple)
-        return sub_class.from_dict(data)
+        return sub_class.from_response_row(cvs)
 
 
 @dataclass
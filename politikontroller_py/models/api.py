@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 from collections import OrderedDict
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from math import radians
 import re
-from typing import TYPE_CHECKING, ClassVar, Literal, TypeVar
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Literal, TypeVar
 
 from mashumaro import field_options
 from mashumaro.config import BaseConfig
@@ -23,13 +23,15 @@ from politikontroller_py.models.common import (
     StrEnum,
 )
 from politikontroller_py.utils import (
-    average_points,
+    centroid,
     get_random_string,
     get_unix_timestamp,
     parse_datetime_like,
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from politikontroller_py.models.common import T
 
 PC = TypeVar("PC", bound="PoliceControl")
@@ -110,11 +112,20 @@ class PoliceControl(PolitiKontrollerResponse):
     )
     _merged_with: list[PoliceControl] = field(init=False, default_factory=list)
 
+    # Describe __pre_deserialize__ for the compiled row decoder
+    row_preprocessors: ClassVar[dict[str, Callable[[str], int | None]]] = {
+        "timestamp": parse_datetime_like,
+        "last_seen": parse_datetime_like,
+    }
+    row_derived_fields: ClassVar[dict[str, tuple[str, ...]]] = {
+        "point": ("lat", "lng"),
+    }
+
     @classmethod
     def __pre_deserialize__(cls: type[T], d: T) -> T:
-        for k in ["timestamp", "last_seen"]:
+        for k, parse in cls.row_preprocessors.items():
             if k in d:
-                d[k] = parse_datetime_like(d.get(k, ""))
+                d[k] = parse(d.get(k, ""))
         d["point"] = {"lat": d["lat"], "lng": d["lng"]}
         return d
 
@@ -162,20 +173,41 @@ class PoliceControl(PolitiKontrollerResponse):
         if hasattr(self, "speed_limit"):  # pragma: no cover
             self.speed_limit = min(other.speed_limit, self.speed_limit)
 
-    def merge_with(self: PC, other: PC) -> PC:
-        lat, lng = average_points(self.point, other.point)
-        data = self.to_dict()
-        data.update(
-            {
-                "lat": lat,
-                "lng": lng,
-            }
-        )
-        control = type(self).from_dict(data)
-        control.add_merged(other)
-        control.add_merged(self)
+    def merge_all(self: PC, others: Sequence[PC]) -> PC:
+        """Merge `others` into a copy of `self`, placed at the centroid of them all.
+
+        The copy gets the latest `timestamp`/`last_seen`, the highest `confirmed`
+        and the lowest `speed_limit`, and is built once, whatever the number of
+        controls merged. Its `duplicates` are all the merged controls, like with
+        `merge_with`: `others` (each followed by its own duplicates), then `self`
+        and its duplicates.
+        """
+        members = [self, *others]
+        lat, lng = centroid([c.lat for c in members], [c.lng for c in members])
+        changes = {
+            "lat": lat,
+            "lng": lng,
+            "point": PoliceControlPoint(lat, lng),
+            "timestamp": _aggregate(members, "timestamp", max),
+        }
+        for name, pick in (("last_seen", max), ("confirmed", max), ("speed_limit", min)):
+            if hasattr(self, name):
+                changes[name] = _aggregate(members, name, pick)
+        control = replace(self, **changes)
+        for member in [*others, self]:
+            control.duplicates.append(member)
+            control.duplicates.extend(member.duplicates)
         return control
 
+    def merge_with(self: PC, other: PC) -> PC:
+        return self.merge_all([other])
+
+
+def _aggregate(controls: Sequence[PoliceControl], name: str, pick: Callable) -> Any:
+    """Pick from the values of attribute `name` that are set."""
+    values = [v for c in controls if (v := getattr(c, name)) is not None]
+    return pick(values) if values else None
+
 
 # noinspection SpellCheckingInspection
 @dataclass(kw_only=True)
@@ -327,6 +359,19 @@ class APIEndpoint(StrEnum):
         ]
         return self not in no_auth_methods
 
+    def is_idempotent(self) -> bool:
+        """Whether repeating a request has no side effects upstream."""
+        read_methods = [
+            APIEndpoint.CHECK,
+            APIEndpoint.CONTROL_TYPES,
+            APIEndpoint.GET_MY_MAPS,
+            APIEndpoint.GPS_CONTROLS,
+            APIEndpoint.SETTINGS,
+            APIEndpoint.SPEED_CONTROL,
+            APIEndpoint.SPEED_CONTROLS,
+        ]
+        return self in read_methods
+
 
 API_ENDPOINTS = Literal[
     APIEndpoint.AUTH_APP,
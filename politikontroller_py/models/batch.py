@@ -0,0 +1,282 @@
+"""Columnar storage for large numbers of controls.
+
+A `ControlBatch` keeps one array per field instead of one dataclass per control:
+ids, numbers and timestamps in `array` columns, repeated strings (county,
+municipality, type) as codes into a shared table, and descriptions in a list.
+Timestamps are stored as unix time and restored as naive local datetimes, like
+the ones the API models are deserialized to.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+from dataclasses import MISSING, fields
+from datetime import datetime
+from math import isnan, nan
+import sys
+from typing import TYPE_CHECKING, Any, Generic, TypeVar, overload
+
+from politikontroller_py.models.api import PoliceControl, PoliceControlPoint, PoliceControlTypeEnum
+from politikontroller_py.utils import TimestampParser, iter_response_rows
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+PC = TypeVar("PC", bound=PoliceControl)
+
+# Stands in for None in integer columns
+MISSING_INT = -(2**63)
+
+INT_FIELDS = ("id", "speed_limit", "confirmed")
+FLOAT_FIELDS = ("lat", "lng")
+TIME_FIELDS = ("timestamp", "last_seen")
+INTERNED_FIELDS = ("county", "municipality", "type")
+TEXT_FIELDS = ("description",)
+
+
+class ControlRow(Generic[PC]):
+    """A view of one control in a batch, reading fields from the columns.
+
+    Properties of the model, like `title` and `__geo_interface__`, are computed
+    from the columns, so rows can be used where models are expected.
+    """
+
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch: ControlBatch[PC], index: int):
+        self._batch = batch
+        self._index = index
+
+    def __getattr__(self, name: str) -> Any:
+        # Never look up the slots, or dunders, through the batch: they may not be set
+        # yet, like while the row is copied.
+        if name.startswith("__") or name in ControlRow.__slots__:
+            raise AttributeError(name)
+        batch = self._batch
+        if name in batch.columns:
+            return batch.value(name, self._index)
+        prop = getattr(batch.model, name, None)
+        if isinstance(prop, property):
+            return prop.fget(self)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    @property
+    def point(self) -> PoliceControlPoint:
+        return PoliceControlPoint(self.lat, self.lng)
+
+    @property
+    def duplicates(self) -> list[PC]:
+        return self._batch.duplicates.get(self._index, [])
+
+    @property
+    def __geo_interface__(self) -> dict[str, Any]:
+        return self._batch.model.__geo_interface__.fget(self)
+
+    def __repr__(self) -> str:
+        return f"ControlRow({self._batch.model.__name__}, id={self.id})"
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ControlRow):
+            return self.to_model() == other.to_model()
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self._batch.model, self.id))
+
+    def to_model(self) -> PC:
+        return self._batch.control(self._index)
+
+    def to_dict(self) -> dict[str, Any]:
+        return self.to_model().to_dict()
+
+    def to_jsonb(self) -> bytes:
+        return self.to_model().to_jsonb()
+
+
+class ControlBatch(Sequence[ControlRow[PC]]):
+    """Struct-of-arrays collection of controls of one model class."""
+
+    def __init__(self, model: type[PC]):
+        self.model = model
+        self.field_names = tuple(f.name for f in fields(model) if f.init and f.name != "point")
+        self.columns: dict[str, array | list] = {}
+        for name in self.field_names:
+            if name in INT_FIELDS:
+                self.columns[name] = array("q")
+            elif name in INTERNED_FIELDS:
+                self.columns[name] = array("I")
+            elif name in FLOAT_FIELDS or name in TIME_FIELDS:
+                self.columns[name] = array("d")
+            elif name in TEXT_FIELDS:
+                self.columns[name] = []
+            else:  # pragma: no cover
+                raise TypeError(f"No column type for {model.__name__}.{name}")
+        self.strings: list[str] = []
+        self._codes: dict[str, int] = {}
+        self.duplicates: dict[int, list[PC]] = {}
+        self._defaults = {
+            f.name: f.default for f in fields(model) if f.name in self.columns and f.default is not MISSING
+        }
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    @overload
+    def __getitem__(self, index: int) -> ControlRow[PC]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[ControlRow[PC]]: ...
+
+    def __getitem__(self, index: int | slice) -> ControlRow[PC] | list[ControlRow[PC]]:
+        if isinstance(index, slice):
+            return [ControlRow(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ControlBatch index out of range")
+        return ControlRow(self, index)
+
+    def __iter__(self) -> Iterator[ControlRow[PC]]:
+        return (ControlRow(self, i) for i in range(len(self)))
+
+    @property
+    def ids(self) -> array:
+        return self.columns["id"]
+
+    @property
+    def lats(self) -> array:
+        return self.columns["lat"]
+
+    @property
+    def lngs(self) -> array:
+        return self.columns["lng"]
+
+    @classmethod
+    def from_controls(cls, controls: Iterable[PC], model: type[PC] | None = None) -> ControlBatch[PC]:
+        """Build a batch from models, by default of the class of the first one."""
+        controls = list(controls)
+        if model is None:
+            if len(controls) == 0:
+                raise ValueError("Cannot tell the model of an empty list of controls")
+            model = type(controls[0])
+        batch = cls(model)
+        batch.extend(controls)
+        return batch
+
+    @classmethod
+    def from_response_data(cls, model: type[PC], cvs: str) -> ControlBatch[PC]:
+        """Build a batch straight from a cvs-like response, without building models."""
+        batch = cls(model)
+        batch.extend_from_response_data(cvs)
+        return batch
+
+    def extend_from_response_data(self, cvs: str):
+        """Add the rows of a cvs-like response, without building models."""
+        positions = {key: index for index, key in enumerate(self.model.attr_map) if key in self.columns}
+        required = self.columns.keys() - self._defaults.keys()
+        parser = TimestampParser()
+        for row in iter_response_rows(cvs):
+            values = row.split("|")
+            raw = {key: values[index] for key, index in positions.items() if index < len(values)}
+            if not required <= raw.keys() or not self._append_raw(raw, parser):
+                # Rows the columns cannot take as is go through the model
+                with parser.activate():
+                    self.append(self.model.from_response_row(row))
+
+    def _append_raw(self, raw: dict[str, str], parser: TimestampParser) -> bool:
+        try:
+            converted = {}
+            for name, value in raw.items():
+                if name in INT_FIELDS:
+                    converted[name] = int(value)
+                elif name in FLOAT_FIELDS:
+                    converted[name] = float(value)
+                elif name in TIME_FIELDS:
+                    timestamp = parser.parse_datetime_like(value)
+                    converted[name] = nan if timestamp is None else float(timestamp)
+                elif name == "type":
+                    converted[name] = PoliceControlTypeEnum(value).value
+                else:
+                    converted[name] = value
+        except ValueError:
+            return False
+        for name in self.field_names:
+            self._push(name, converted[name] if name in converted else self._default(name))
+        return True
+
+    def _default(self, name: str) -> Any:
+        default = self._defaults[name]
+        if name in TIME_FIELDS:
+            return nan if default is None else default.timestamp()
+        if name in INT_FIELDS:
+            return MISSING_INT if default is None else default
+        return default
+
+    def _push(self, name: str, value: Any):
+        if name in INTERNED_FIELDS:
+            value = self._code(str(value))
+        self.columns[name].append(value)
+
+    def _code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.strings)
+            self.strings.append(sys.intern(value))
+        return code
+
+    def append(self, control: PC):
+        """Add a model to the batch."""
+        for name in self.field_names:
+            value = getattr(control, name)
+            if name in TIME_FIELDS:
+                value = nan if value is None else value.timestamp()
+            elif name in INT_FIELDS and value is None:
+                value = MISSING_INT
+            self._push(name, value)
+        if control.duplicates:
+            self.duplicates[len(self) - 1] = list(control.duplicates)
+
+    def extend(self, controls: Iterable[PC]):
+        for control in controls:
+            self.append(control)
+
+    def value(self, name: str, index: int) -> Any:
+        """Get the value of field `name` of the control at `index`, as on the model."""
+        value = self.columns[name][index]
+        if name in TIME_FIELDS:
+            return None if isnan(value) else datetime.fromtimestamp(value)  # noqa: DTZ006
+        if name in INT_FIELDS:
+            return None if value == MISSING_INT else value
+        if name == "type":
+            return PoliceControlTypeEnum(self.strings[value])
+        if name in INTERNED_FIELDS:
+            return self.strings[value]
+        return value
+
+    def column(self, name: str) -> Sequence:
+        """Get all values of field `name`, as on the models."""
+        if name in FLOAT_FIELDS or name == "id":
+            return self.columns[name]
+        return [self.value(name, i) for i in range(len(self))]
+
+    def control(self, index: int) -> PC:
+        """Build the model of the control at `index`."""
+        values = {name: self.value(name, index) for name in self.field_names}
+        control = self.model(point=PoliceControlPoint(values["lat"], values["lng"]), **values)
+        control.duplicates.extend(self.duplicates.get(index, []))
+        return control
+
+    def to_controls(self) -> list[PC]:
+        return [self.control(i) for i in range(len(self))]
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the columns, not counting shared strings."""
+        size = 0
+        for column in self.columns.values():
+            if isinstance(column, array):
+                size += column.itemsize * len(column)
+            else:
+                size += sys.getsizeof(column) + sum(sys.getsizeof(v) for v in column)
+        return size
@@ -2,15 +2,27 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import ClassVar, TypeVar
+import logging
+from typing import TYPE_CHECKING, ClassVar, TypeVar
 
 from mashumaro.config import BaseConfig
 from mashumaro.mixins.orjson import DataClassORJSONMixin
 
-from politikontroller_py.utils import map_response_data, unmap_response_data
+from politikontroller_py.models.decoder import get_row_decoder
+from politikontroller_py.utils import (
+    TimestampParser,
+    iter_response_rows,
+    map_response_data,
+    unmap_response_data,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
 
 T = TypeVar("T", bound="DataClassORJSONMixin")
 
+_LOGGER = logging.getLogger(__name__)
+
 
 class StrEnum(str, Enum):
     def __str__(self) -> str:
@@ -33,6 +45,8 @@ class BaseModel(DataClassORJSONMixin):
         omit_none = True
         allow_deserialization_not_by_alias = True
         serialize_by_alias = True
+        # Build the (de)serializers on first use instead of at import time
+        lazy_compilation = True
 
 
 @dataclass
@@ -42,10 +56,35 @@ class PolitiKontrollerResponse(BaseModel):
     @classmethod
     def from_response_data(cls: T, cvs: str, multiple=False) -> T | list[T]:
         """Convert a cvs-like string into instance(s) of `cls`."""
-        data = map_response_data(cvs, cls.attr_map, multiple)
         if multiple:
-            return [cls.from_dict(d) for d in data]
-        return cls.from_dict(data)
+            with TimestampParser().activate():
+                return [cls.from_response_row(row) for row in iter_response_rows(cvs)]
+        return cls.from_response_row(cvs)
+
+    @classmethod
+    def iter_from_response_data(cls: type[T], cvs: str) -> Iterator[T]:
+        """Convert a cvs-like string into instances of `cls`, one row at a time."""
+        parser = TimestampParser()
+        for row in iter_response_rows(cvs):
+            # The parser is only active while a row is decoded, never across a yield.
+            with parser.activate():
+                item = cls.from_response_row(row)
+            yield item
+
+    @classmethod
+    def from_response_row(cls: type[T], row: str) -> T:
+        """Convert a single cvs-like row into an instance of `cls`.
+
+        Uses the compiled row decoder of `cls` when possible. Rows it cannot decode
+        go through `from_dict`, which raises the usual mashumaro errors.
+        """
+        decoder = get_row_decoder(cls)
+        if decoder is not None:
+            try:
+                return decoder(row.split("|"))
+            except Exception:  # noqa: BLE001
+                _LOGGER.debug("Row decoder failed for %s, falling back to from_dict", cls.__name__)
+        return cls.from_dict(map_response_data(row, cls.attr_map))
 
     def to_response_data(self) -> str:  # pragma: no cover
         """Convert a serialized version of `self` into a cvs-like string."""
@@ -0,0 +1,151 @@
+"""Compiled row decoders for response models.
+
+A decoder is generated once per class from its `attr_map` and dataclass fields.
+It indexes straight into a split row by position and converts each value with
+the same rules as the mashumaro `from_dict` of the class, without building the
+intermediate `zip`, filtered and `__pre_deserialize__` dicts.
+
+Classes with a `__pre_deserialize__` hook can describe it for the decoder with
+two class attributes, declared on the same class as the hook:
+
+- `row_preprocessors`: raw values passed through a function before conversion.
+- `row_derived_fields`: fields built from other, already converted, fields.
+
+Classes with a hook that is not described this way, and classes with a nested
+dataclass that is not a derived field, have no decoder and go through `from_dict`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import fields
+from enum import Enum
+from types import NoneType, UnionType
+import typing
+from typing import Any, Callable, TypeVar, Union
+
+from mashumaro import DataClassDictMixin
+
+T = TypeVar("T")
+
+_PRIMITIVES = (int, float, str)
+
+_decoders: dict[type, Callable[[list[str]], Any] | None] = {}
+
+
+class UnsupportedTypeError(TypeError):
+    pass
+
+
+class FieldSpec(typing.NamedTuple):
+    name: str
+    type: Any
+    convert: Callable[[Any], Any]
+    optional: bool
+
+
+def _unwrap_optional(tp: Any) -> tuple[Any, bool]:
+    if typing.get_origin(tp) in (Union, UnionType):
+        args = typing.get_args(tp)
+        if len(args) == 2 and NoneType in args:  # noqa: PLR2004
+            return next(a for a in args if a is not NoneType), True
+        raise UnsupportedTypeError(tp)
+    return tp, False
+
+
+def _pre_deserialize_owner(cls: type) -> type | None:
+    """Get the class defining the `__pre_deserialize__` hook of `cls`, if any."""
+    for klass in cls.__mro__:
+        if klass is DataClassDictMixin:
+            return None
+        if "__pre_deserialize__" in klass.__dict__:
+            return klass
+    return None
+
+
+def _converter(tp: Any, metadata: typing.Mapping) -> Callable[[Any], Any]:
+    if (deserialize := metadata.get("deserialize")) is not None:
+        if not callable(deserialize):
+            raise UnsupportedTypeError(tp)
+        return deserialize
+    if tp in _PRIMITIVES or (isinstance(tp, type) and issubclass(tp, Enum)):
+        return tp
+    raise UnsupportedTypeError(tp)
+
+
+def _field_specs(cls: type, derived: typing.Container[str]) -> dict[str, FieldSpec]:
+    hints = typing.get_type_hints(cls)
+    specs = {}
+    for f in fields(cls):
+        if not f.init:
+            continue
+        tp, optional = _unwrap_optional(hints[f.name])
+        # Derived fields are built by calling their type
+        convert = tp if f.name in derived else _converter(tp, f.metadata)
+        specs[f.name] = FieldSpec(f.name, tp, convert, optional)
+    return specs
+
+
+def compile_row_decoder(cls: type[T]) -> Callable[[list[str]], T]:
+    """Generate a function converting a split row into an instance of `cls`.
+
+    Raises `UnsupportedTypeError` when `cls` has to go through `from_dict`.
+    """
+    owner = _pre_deserialize_owner(cls)
+    if owner is not None and "row_preprocessors" not in owner.__dict__:
+        raise UnsupportedTypeError(cls)
+    preprocessors = getattr(cls, "row_preprocessors", {})
+    derived = getattr(cls, "row_derived_fields", {})
+    positions = [(key, index) for index, key in enumerate(cls.attr_map) if isinstance(key, str)]
+    specs = _field_specs(cls, derived)
+
+    namespace: dict[str, Any] = {"cls": cls}
+    lines = [
+        "def decode(row):",
+        "    size = len(row)",
+        "    kwargs = {}",
+    ]
+    for key, index in positions:
+        if key not in specs:
+            continue
+        spec = specs[key]
+        namespace[f"convert_{key}"] = spec.convert
+        value = f"row[{index}]"
+        if key in preprocessors:
+            namespace[f"pre_{key}"] = preprocessors[key]
+            value = f"pre_{key}({value})"
+        lines += [
+            f"    if size > {index}:",
+            f"        value = {value}",
+        ]
+        if spec.optional:
+            lines.append("        if value is not None:")
+            lines.append(f"            kwargs[{key!r}] = convert_{key}(value)")
+        else:
+            lines.append(f"        kwargs[{key!r}] = convert_{key}(value)")
+    for key, sources in derived.items():
+        namespace[f"derive_{key}"] = specs[key].convert
+        args = ", ".join(f"{s}=kwargs[{s!r}]" for s in sources)
+        lines.append(f"    kwargs[{key!r}] = derive_{key}({args})")
+    lines.append("    return cls(**kwargs)")
+
+    exec("\n".join(lines), namespace)  # noqa: S102
+    return namespace["decode"]
+
+
+def _dispatches_to_subtypes(cls: type) -> bool:
+    config = getattr(cls, "Config", None)
+    return getattr(config, "discriminator", None) is not None and bool(cls.__subclasses__())
+
+
+def get_row_decoder(cls: type[T]) -> Callable[[list[str]], T] | None:
+    """Get the row decoder of `cls`, or None if it has to go through `from_dict`."""
+    if cls in _decoders:
+        return _decoders[cls]
+    decoder = None
+    if not _dispatches_to_subtypes(cls):
+        try:
+            decoder = compile_row_decoder(cls)
+        except (UnsupportedTypeError, NameError):
+            decoder = None
+    _decoders[cls] = decoder
+    return decoder
@@ -0,0 +1,212 @@
+"""Lazily deserialized list results.
+
+A `LazyControls` keeps the decrypted response and the offsets of its rows, and
+only builds a model when an element is indexed or iterated. Reading the ids,
+coordinates or types of all controls only looks at those fields of each row.
+
+Models can be passed on as they are built with `on_build`, which gets them in
+lists: one per access, or chunks of `CONTROL_STORE_CHUNK_SIZE` while iterating.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, Callable, Generic, NamedTuple, TypeVar, overload
+
+from politikontroller_py.constants import CONTROL_STORE_CHUNK_SIZE
+from politikontroller_py.models.api import PoliceControl, PoliceControlPoint, PoliceControlTypeEnum
+from politikontroller_py.utils import TimestampParser, cluster_controls
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+PC = TypeVar("PC", bound=PoliceControl)
+
+
+class _RowKey(NamedTuple):
+    """What duplicate detection needs to know about a row."""
+
+    point: PoliceControlPoint
+    type: PoliceControlTypeEnum
+
+
+class LazyControls(Sequence[PC], Generic[PC]):
+    """List of controls of one model class, deserialized on access."""
+
+    def __init__(
+        self,
+        model: type[PC],
+        data: str = "",
+        rows: Iterable[tuple[int, int, PC | None]] | None = None,
+        on_build: Callable[[list[PC]], Any] | None = None,
+    ):
+        """Index the rows of `data`, or take `rows` as (start, end, model) of each row."""
+        self.model = model
+        self.data = data
+        self.on_build = on_build
+        self._built: list[PC] = []
+        self._starts = array("q")
+        self._ends = array("q")
+        self._models: list[PC | None] = []
+        self._columns: dict[str, list] = {}
+        if rows is not None:
+            for start, end, control in rows:
+                self._add_row(start, end, control)
+        elif data:
+            start = 0
+            while (end := data.find("#", start)) != -1:
+                self._add_row(start, end)
+                start = end + 1
+            self._add_row(start, len(data))
+
+    def _add_row(self, start: int, end: int, control: PC | None = None):
+        self._starts.append(start)
+        self._ends.append(end)
+        self._models.append(control)
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    @overload
+    def __getitem__(self, index: int) -> PC: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[PC]: ...
+
+    def __getitem__(self, index: int | slice) -> PC | list[PC]:
+        if isinstance(index, slice):
+            controls = [self._model(i) for i in range(*index.indices(len(self)))]
+            self._flush_built()
+            return controls
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("LazyControls index out of range")
+        control = self._model(index)
+        self._flush_built()
+        return control
+
+    def take(self, indices: Iterable[int]) -> list[PC]:
+        """Get the controls at `indices`."""
+        controls = [self._model(i) for i in indices]
+        self._flush_built()
+        return controls
+
+    def __iter__(self) -> Iterator[PC]:
+        parser = TimestampParser()
+        try:
+            for i in range(len(self)):
+                if self._models[i] is None:
+                    with parser.activate():
+                        self._model(i)
+                    if len(self._built) >= CONTROL_STORE_CHUNK_SIZE:
+                        self._flush_built()
+                yield self._models[i]
+        finally:
+            self._flush_built()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, LazyControls)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"LazyControls({self.model.__name__}, {len(self)} controls)"
+
+    @property
+    def materialized(self) -> int:
+        """Number of controls built so far."""
+        return sum(model is not None for model in self._models)
+
+    def _model(self, index: int) -> PC:
+        model = self._models[index]
+        if model is None:
+            model = self._models[index] = self.model.from_response_row(self.row(index))
+            if self.on_build is not None:
+                self._built.append(model)
+        return model
+
+    def _flush_built(self):
+        """Pass the models built since the last call to `on_build`."""
+        if self._built:
+            built, self._built = self._built, []
+            self.on_build(built)
+
+    def row(self, index: int) -> str:
+        """Get the raw row of the control at `index`."""
+        return self.data[self._starts[index] : self._ends[index]]
+
+    def raw_column(self, name: str) -> list[str | None]:
+        """Get the raw text of field `name` of every row, None where a row is too short."""
+        position = self.model.attr_map.index(name)
+        values: list[str | None] = []
+        for i in range(len(self)):
+            fields = self.row(i).split("|", position + 1)
+            values.append(fields[position] if position < len(fields) else None)
+        return values
+
+    def column(self, name: str) -> list:
+        """Get field `name` of every control, building only the models of rows it cannot parse."""
+        column = self._columns.get(name)
+        if column is None:
+            convert = {
+                "id": int,
+                "lat": float,
+                "lng": float,
+                "type": PoliceControlTypeEnum,
+            }[name]
+            column = []
+            for i, raw in enumerate(self.raw_column(name)):
+                model = self._models[i]
+                if model is None and raw is not None:
+                    try:
+                        column.append(convert(raw))
+                        continue
+                    except ValueError:
+                        pass
+                column.append(getattr(self._model(i), name))
+            self._flush_built()
+            self._columns[name] = column
+        return column
+
+    @property
+    def ids(self) -> list[int]:
+        return self.column("id")
+
+    @property
+    def lats(self) -> list[float]:
+        return self.column("lat")
+
+    @property
+    def lngs(self) -> list[float]:
+        return self.column("lng")
+
+    @property
+    def types(self) -> list[PoliceControlTypeEnum]:
+        return self.column("type")
+
+    def to_list(self) -> list[PC]:
+        return list(self)
+
+    def merge_duplicates(self, max_distance: float | None = None) -> LazyControls[PC]:
+        """Merge duplicate controls, like `merge_duplicate_controls`.
+
+        Duplicates are found from the coordinates and types alone, only the
+        controls that are merged are built.
+        """
+        keys = [
+            _RowKey(PoliceControlPoint(lat, lng), control_type)
+            for lat, lng, control_type in zip(self.lats, self.lngs, self.types)
+        ]
+        rows = []
+        for cluster in cluster_controls(keys, max_distance):
+            first = cluster[0]
+            control = self._models[first]
+            if len(cluster) > 1:
+                control = self._model(first).merge_all([self._model(j) for j in cluster[1:]])
+            rows.append((self._starts[first], self._ends[first], control))
+        self._flush_built()
+        return type(self)(self.model, self.data, rows, self.on_build)
@@ -0,0 +1,317 @@
+"""Streaming writers for machine-readable output.
+
+Rows are written one at a time to a binary stream, so output starts with the
+first row and memory use does not grow with the number of rows. Models are
+serialized with orjson through their own `to_jsonb`, other rows with
+`orjson.dumps`.
+
+Controls can also be written as GeoJSON straight to a file or an async stream
+with `dump_geo_json` and `adump_geo_json`, without building the collection.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import csv
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from functools import cache
+import inspect
+import io
+from typing import TYPE_CHECKING, Any, BinaryIO, TextIO
+
+import orjson
+
+from .constants import GEOJSON_CHUNK_SIZE
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator
+    from types import TracebackType
+
+    from .models.api import PoliceControl
+
+
+class OutputFormat(str, Enum):
+    JSON = "json"
+    NDJSON = "ndjson"
+    CSV = "csv"
+    GEOJSON = "geojson"
+
+
+def to_jsonb(row: Any) -> bytes:
+    """Serialize a model, or anything orjson can handle."""
+    if hasattr(row, "to_jsonb"):
+        return row.to_jsonb()
+    return orjson.dumps(row)
+
+
+class RowWriter(ABC):
+    """Write rows to a binary stream as they come.
+
+    With `flush`, the stream is flushed after every row, for output that is read
+    while it is being written. When the `with` block fails, the output is left
+    unterminated, so a cut short document does not parse as a complete one.
+    """
+
+    def __init__(self, stream: BinaryIO, flush: bool = False):
+        self.stream = stream
+        self.flush = flush
+        self.rows = 0
+        self._started = False
+
+    def write(self, row: Any):
+        if not self._started:
+            self._started = True
+            self._write_header(row)
+        self._write_row(row)
+        self.rows += 1
+        if self.flush:
+            self.stream.flush()
+
+    def write_many(self, rows: Iterable[Any]):
+        for row in rows:
+            self.write(row)
+
+    def close(self):
+        """Write whatever ends the output, and flush the stream."""
+        self._write_footer()
+        self.stream.flush()
+
+    def __enter__(self) -> RowWriter:  # noqa: PYI034
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.stream.flush()
+
+    def _write_header(self, row: Any):  # noqa: B027
+        pass
+
+    @abstractmethod
+    def _write_row(self, row: Any):
+        pass
+
+    def _write_footer(self):  # noqa: B027
+        pass
+
+
+class NDJSONWriter(RowWriter):
+    """One JSON document per line."""
+
+    def _write_row(self, row: Any):
+        self.stream.write(to_jsonb(row) + b"\n")
+
+
+class JSONWriter(RowWriter):
+    """A JSON array, one row per line."""
+
+    def _write_row(self, row: Any):
+        self.stream.write((b",\n" if self.rows else b"[\n") + to_jsonb(row))
+
+    def _write_footer(self):
+        self.stream.write(b"\n]\n" if self.rows else b"[]\n")
+
+
+class CSVWriter(RowWriter):
+    """CSV with a header row.
+
+    The columns are the fields of the first row (or of its model, for the rows of
+    a batch), or its keys when it is not a dataclass. Nested values are written as JSON.
+    """
+
+    def __init__(self, stream: BinaryIO, flush: bool = False):
+        super().__init__(stream, flush)
+        self._csv: csv.DictWriter | None = None
+
+    def _write_header(self, row: Any):
+        # Rows of a batch have the columns of their model
+        model = row.to_model() if hasattr(row, "to_model") else row
+        columns = [f.name for f in fields(model)] if is_dataclass(model) else list(row)
+        self._csv = csv.DictWriter(_BinaryTextSink(self.stream), columns, restval="", extrasaction="ignore")
+        self._csv.writeheader()
+
+    def _write_row(self, row: Any):
+        data = row.to_dict() if hasattr(row, "to_dict") else row
+        self._csv.writerow(
+            {
+                k: orjson.dumps(v).decode() if isinstance(v, (dict, list, tuple)) else v
+                for k, v in data.items()
+            }
+        )
+
+
+GEOJSON_HEADER = b'{"type":"FeatureCollection","features":[\n'
+GEOJSON_FOOTER = b"\n]}\n"
+GEOJSON_EMPTY = b'{"type":"FeatureCollection","features":[]}\n'
+_FEATURE = (
+    b'{"type":"Feature","geometry":{"type":"Point","coordinates":%b},'
+    b'"properties":{"title":%b,"description":%b,"type":%b}}'
+)
+
+
+def _encode_control(control: PoliceControl) -> bytes:
+    dumps = orjson.dumps
+    return _FEATURE % (
+        dumps((control.lat, control.lng)),
+        dumps(control.title),
+        dumps(control.description),
+        dumps(control.type),
+    )
+
+
+def _encode_mapping(row: Any) -> bytes:
+    from geojson.mapping import to_mapping
+
+    return orjson.dumps(to_mapping(row))
+
+
+@cache
+def _feature_encoder(cls: type) -> Callable[[Any], bytes]:
+    from .models.api import PoliceControl
+
+    geo_interface = getattr(cls, "__geo_interface__", None)
+    if geo_interface is None:
+        raise TypeError(f"{cls.__name__} cannot be written as GeoJSON")
+    # Controls that keep the default feature are encoded field by field
+    return _encode_control if geo_interface is PoliceControl.__geo_interface__ else _encode_mapping
+
+
+def encode_feature(row: Any) -> bytes:
+    """Encode a control as the GeoJSON Feature of its `__geo_interface__`.
+
+    Controls are encoded field by field, without building the mapping and its
+    point. Anything else with a `__geo_interface__` goes through the mapping.
+    """
+    return _feature_encoder(type(row))(row)
+
+
+class GeoJSONWriter(RowWriter):
+    """A GeoJSON FeatureCollection with one Feature per control, like `utils.to_geo_json`."""
+
+    def _write_row(self, row: Any):
+        self.stream.write((b",\n" if self.rows else GEOJSON_HEADER) + encode_feature(row))
+
+    def _write_footer(self):
+        self.stream.write(GEOJSON_FOOTER if self.rows else GEOJSON_EMPTY)
+
+
+class _GeoJSONChunks:
+    """Collect encoded features into chunks of about `chunk_size` bytes."""
+
+    def __init__(self, chunk_size: int):
+        self.chunk_size = chunk_size
+        self.features = 0
+        self._parts: list[bytes] = []
+        self._size = 0
+
+    def add(self, control: PoliceControl) -> bytes | None:
+        """Add a feature, and get a chunk when one is full."""
+        feature = _feature_encoder(type(control))(control)
+        self._parts.append(feature)
+        self._size += len(feature)
+        if self._size < self.chunk_size:
+            return None
+        return self._take()
+
+    def end(self) -> bytes:
+        """Get the last chunk, which closes the collection."""
+        if not self.features and not self._parts:
+            return GEOJSON_EMPTY
+        return self._take() + GEOJSON_FOOTER
+
+    def _take(self) -> bytes:
+        if not self._parts:
+            return b""
+        chunk = (b",\n" if self.features else GEOJSON_HEADER) + b",\n".join(self._parts)
+        self.features += len(self._parts)
+        self._parts.clear()
+        self._size = 0
+        return chunk
+
+
+def iter_geo_json(controls: Iterable[PoliceControl], chunk_size: int = GEOJSON_CHUNK_SIZE) -> Iterator[bytes]:
+    """Encode `controls` as a GeoJSON FeatureCollection, in chunks of about `chunk_size` bytes."""
+    chunks = _GeoJSONChunks(chunk_size)
+    for control in controls:
+        if (chunk := chunks.add(control)) is not None:
+            yield chunk
+    yield chunks.end()
+
+
+async def aiter_geo_json(
+    controls: Iterable[PoliceControl] | AsyncIterable[PoliceControl],
+    chunk_size: int = GEOJSON_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """Like `iter_geo_json`, for controls that may come from an async iterable."""
+    if not hasattr(controls, "__aiter__"):
+        for chunk in iter_geo_json(controls, chunk_size):
+            yield chunk
+        return
+    chunks = _GeoJSONChunks(chunk_size)
+    async for control in controls:
+        if (chunk := chunks.add(control)) is not None:
+            yield chunk
+    yield chunks.end()
+
+
+def dump_geo_json(
+    controls: Iterable[PoliceControl],
+    fp: BinaryIO | TextIO,
+    chunk_size: int = GEOJSON_CHUNK_SIZE,
+):
+    """Write `controls` to a binary or text file as a GeoJSON FeatureCollection.
+
+    The output is the same collection as `utils.to_geo_json`, encoded as JSON.
+    """
+    text = isinstance(fp, io.TextIOBase)
+    for chunk in iter_geo_json(controls, chunk_size):
+        fp.write(chunk.decode() if text else chunk)
+
+
+async def adump_geo_json(
+    controls: Iterable[PoliceControl] | AsyncIterable[PoliceControl],
+    stream: Any,
+    chunk_size: int = GEOJSON_CHUNK_SIZE,
+):
+    """Write `controls` to an async stream as a GeoJSON FeatureCollection.
+
+    `stream.write` may be a coroutine (like aiofiles), or a plain method with a
+    `drain` coroutine to wait on (like `asyncio.StreamWriter`).
+    """
+    drain = getattr(stream, "drain", None)
+    async for chunk in aiter_geo_json(controls, chunk_size):
+        result = stream.write(chunk)
+        if inspect.isawaitable(result):
+            await result
+        if drain is not None:
+            await drain()
+
+
+class _BinaryTextSink:
+    """Let `csv` write text to a binary stream."""
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+
+    def write(self, text: str) -> int:
+        return self.stream.write(text.encode())
+
+
+WRITERS: dict[OutputFormat, type[RowWriter]] = {
+    OutputFormat.JSON: JSONWriter,
+    OutputFormat.NDJSON: NDJSONWriter,
+    OutputFormat.CSV: CSVWriter,
+    OutputFormat.GEOJSON: GeoJSONWriter,
+}
+
+
+def get_writer(output_format: OutputFormat | str, stream: BinaryIO, flush: bool = False) -> RowWriter:
+    """Get a writer of `output_format` rows to `stream`."""
+    return WRITERS[OutputFormat(output_format)](stream, flush)
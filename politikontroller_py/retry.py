@@ -0,0 +1,127 @@
+"""Retries with backoff, and a circuit breaker for when the upstream is down."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+import random
+import time
+from typing import Callable
+
+from .constants import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    CLIENT_RETRY_ATTEMPTS,
+    CLIENT_RETRY_BACKOFF,
+    CLIENT_RETRY_MAX_BACKOFF,
+)
+from .exceptions import CircuitOpenError, PolitikontrollerConnectionError
+
+
+@dataclass
+class RetryPolicy:
+    """When and how long to wait before retrying a failed request.
+
+    Only requests to idempotent endpoints are retried. The wait before retry `n`
+    is `backoff * 2 ** (n - 1)`, capped at `max_backoff`, of which the `jitter`
+    fraction is random.
+    """
+
+    max_attempts: int = CLIENT_RETRY_ATTEMPTS
+    backoff: float = CLIENT_RETRY_BACKOFF
+    max_backoff: float = CLIENT_RETRY_MAX_BACKOFF
+    jitter: float = 1.0
+    retry_on: tuple[type[BaseException], ...] = (PolitikontrollerConnectionError,)
+
+    def should_retry(self, exception: BaseException, attempt: int) -> bool:
+        """Check if a request that failed on `attempt` (counting from 1) should be retried."""
+        return (
+            attempt < self.max_attempts
+            and isinstance(exception, self.retry_on)
+            and not isinstance(exception, CircuitOpenError)
+        )
+
+    def delay(self, attempt: int) -> float:
+        """Get the number of seconds to wait after a failed `attempt` (counting from 1)."""
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return delay * (1 - self.jitter) + delay * self.jitter * random.random()
+
+
+@dataclass
+class RetryStats:
+    """Retry counters for requests made by the client."""
+
+    attempts: int = 0
+    retries: int = 0
+    failures: int = 0
+    rejected: int = 0
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+
+class CircuitBreaker:
+    """Fail fast while the upstream keeps failing.
+
+    After `failure_threshold` failures in a row the circuit opens, and requests
+    raise `CircuitOpenError` without being sent. After `reset_timeout` seconds a
+    single request is let through; the circuit closes again if it succeeds, and
+    reopens if it fails.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.times_opened = 0
+        self._clock = clock
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> CircuitState:
+        if self._opened_at is None:
+            return CircuitState.CLOSED
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return CircuitState.HALF_OPEN
+        return CircuitState.OPEN
+
+    def before_request(self):
+        """Raise `CircuitOpenError` if a request may not be sent right now."""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return
+        if state == CircuitState.HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        raise CircuitOpenError("Politikontroller.no is unavailable, not sending request")
+
+    def on_success(self):
+        """Record a request that got a response."""
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def on_cancel(self):
+        """Record a request that was cancelled before it got a response."""
+        self._probing = False
+
+    def on_failure(self):
+        """Record a request that failed to get a response."""
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            if self._opened_at is None or self._probing:
+                self.times_opened += 1
+            self._opened_at = self._clock()
+        self._probing = False
@@ -0,0 +1,238 @@
+"""Persistent SQLite store of controls, with spatial and time indexes.
+
+Controls are upserted by id. The store keeps when each control was first and
+last stored, and how many times. Positions are indexed with an R*Tree when
+SQLite has the extension, and with a plain (lat, lng) index otherwise.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from math import cos, pi, radians
+import sqlite3
+import time
+from typing import TYPE_CHECKING, Callable
+
+from .constants import EARTH_RADIUS
+from .geo import distances_from
+from .models.api import PoliceControlResponse, PoliceControlsResponse, PoliceGPSControlsResponse
+from .utils import last_activity
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from os import PathLike
+    from types import TracebackType
+
+    from .models.api import PoliceControl
+
+MODELS: dict[str, type[PoliceControl]] = {
+    cls.__name__: cls for cls in (PoliceControlResponse, PoliceControlsResponse, PoliceGPSControlsResponse)
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS controls (
+    id INTEGER PRIMARY KEY,
+    model TEXT NOT NULL,
+    lat REAL NOT NULL,
+    lng REAL NOT NULL,
+    active_at REAL,
+    first_seen_at REAL NOT NULL,
+    last_seen_at REAL NOT NULL,
+    times_seen INTEGER NOT NULL DEFAULT 1,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS controls_active_at ON controls (active_at);
+CREATE INDEX IF NOT EXISTS controls_last_seen_at ON controls (last_seen_at);
+"""
+RTREE_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS controls_rtree USING rtree (id, min_lat, max_lat, min_lng, max_lng);
+"""
+POSITION_INDEX_SCHEMA = """
+CREATE INDEX IF NOT EXISTS controls_position ON controls (lat, lng);
+"""
+
+UPSERT = """
+INSERT INTO controls (id, model, lat, lng, active_at, first_seen_at, last_seen_at, data)
+VALUES (:id, :model, :lat, :lng, :active_at, :seen_at, :seen_at, :data)
+ON CONFLICT (id) DO UPDATE SET
+    model = CASE WHEN {keep_details} THEN model ELSE excluded.model END,
+    lat = CASE WHEN {keep_details} THEN lat ELSE excluded.lat END,
+    lng = CASE WHEN {keep_details} THEN lng ELSE excluded.lng END,
+    active_at = max(coalesce(active_at, excluded.active_at), coalesce(excluded.active_at, active_at)),
+    last_seen_at = excluded.last_seen_at,
+    times_seen = times_seen + 1,
+    data = CASE WHEN {keep_details} THEN data ELSE excluded.data END
+""".format(
+    # Keep stored control details over a list result that is not newer
+    keep_details=(
+        f"model = '{PoliceControlResponse.__name__}' AND excluded.model != model "
+        "AND coalesce(excluded.active_at <= active_at, 1)"
+    )
+)
+UPSERT_RTREE = """
+INSERT OR REPLACE INTO controls_rtree (id, min_lat, max_lat, min_lng, max_lng)
+SELECT id, lat, lat, lng, lng FROM controls WHERE id = :id
+"""
+COLUMNS = "c.model, c.data, c.first_seen_at, c.last_seen_at, c.times_seen"
+
+
+@dataclass
+class StoredControl:
+    control: PoliceControl
+    first_seen_at: datetime
+    """When the control was first stored."""
+    last_seen_at: datetime
+    """When the control was last stored."""
+    times_seen: int
+
+
+class ControlStore:
+    """SQLite store of controls.
+
+    All writes of one `upsert_many` call are done in a single transaction.
+    """
+
+    def __init__(
+        self,
+        path: str | PathLike = ":memory:",
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self._clock = clock
+        self._db = sqlite3.connect(path)
+        self._db.executescript(SCHEMA)
+        try:
+            self._db.executescript(RTREE_SCHEMA)
+            self.has_rtree = True
+        except sqlite3.OperationalError:  # pragma: no cover
+            self._db.executescript(POSITION_INDEX_SCHEMA)
+            self.has_rtree = False
+        self._db.commit()
+
+    def __enter__(self) -> ControlStore:  # noqa: PYI034
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT count(*) FROM controls").fetchone()[0]
+
+    def close(self):
+        self._db.close()
+
+    def upsert(self, control: PoliceControl):
+        """Insert or update a single control."""
+        self.upsert_many([control])
+
+    def upsert_many(self, controls: Iterable[PoliceControl]) -> int:
+        """Insert or update controls in one transaction, and get how many were written."""
+        seen_at = self._clock()
+        rows = []
+        for control in controls:
+            active_at = last_activity(control)
+            rows.append(
+                {
+                    "id": control.id,
+                    "model": type(control).__name__,
+                    "lat": control.lat,
+                    "lng": control.lng,
+                    "active_at": active_at.timestamp() if active_at is not None else None,
+                    "seen_at": seen_at,
+                    "data": control.to_json(),
+                }
+            )
+        with self._db:
+            self._db.executemany(UPSERT, rows)
+            if self.has_rtree:
+                self._db.executemany(UPSERT_RTREE, rows)
+        return len(rows)
+
+    def get(self, cid: int) -> StoredControl | None:
+        row = self._db.execute(f"SELECT {COLUMNS} FROM controls c WHERE c.id = ?", (cid,)).fetchone()  # noqa: S608
+        return self._stored_control(row) if row is not None else None
+
+    def in_bbox(
+        self,
+        south: float,
+        west: float,
+        north: float,
+        east: float,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[StoredControl]:
+        """Get the controls inside a bounding box, optionally active in a time window."""
+        if self.has_rtree:
+            query = (
+                f"SELECT {COLUMNS} FROM controls_rtree r JOIN controls c ON c.id = r.id "  # noqa: S608
+                "WHERE r.max_lat >= :south AND r.min_lat <= :north AND r.max_lng >= :west AND r.min_lng <= :east "
+                # The R*Tree rounds coordinates to 32 bit floats
+                "AND c.lat BETWEEN :south AND :north AND c.lng BETWEEN :west AND :east"
+            )
+        else:  # pragma: no cover
+            query = (
+                f"SELECT {COLUMNS} FROM controls c "  # noqa: S608
+                "WHERE c.lat BETWEEN :south AND :north AND c.lng BETWEEN :west AND :east"
+            )
+        return self._query(query, {"south": south, "west": west, "north": north, "east": east}, since, until)
+
+    def in_radius(
+        self,
+        lat: float,
+        lng: float,
+        radius: float,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[StoredControl]:
+        """Get the controls within `radius` km of a point, optionally active in a time window."""
+        km_per_degree = EARTH_RADIUS * pi / 180
+        lat_delta = radius / km_per_degree
+        lng_delta = radius / (km_per_degree * max(cos(radians(lat)), 1e-9))
+        candidates = self.in_bbox(
+            lat - lat_delta, lng - lng_delta, lat + lat_delta, lng + lng_delta, since, until
+        )
+        distances = distances_from(
+            lat,
+            lng,
+            [c.control.lat for c in candidates],
+            [c.control.lng for c in candidates],
+        )
+        return [c for c, d in zip(candidates, distances) if d <= radius]
+
+    def in_time_window(
+        self, since: datetime | None = None, until: datetime | None = None
+    ) -> list[StoredControl]:
+        """Get the controls last active in a time window."""
+        return self._query(f"SELECT {COLUMNS} FROM controls c WHERE 1", {}, since, until)  # noqa: S608
+
+    def _query(
+        self,
+        query: str,
+        params: dict,
+        since: datetime | None,
+        until: datetime | None,
+    ) -> list[StoredControl]:
+        if since is not None:
+            query += " AND c.active_at >= :since"
+            params["since"] = since.timestamp()
+        if until is not None:
+            query += " AND c.active_at <= :until"
+            params["until"] = until.timestamp()
+        query += " ORDER BY c.id"
+        return [self._stored_control(row) for row in self._db.execute(query, params)]
+
+    @staticmethod
+    def _stored_control(row: tuple) -> StoredControl:
+        model, data, first_seen_at, last_seen_at, times_seen = row
+        return StoredControl(
+            MODELS[model].from_json(data),
+            datetime.fromtimestamp(first_seen_at, tz=timezone.utc),
+            datetime.fromtimestamp(last_seen_at, tz=timezone.utc),
+            times_seen,
+        )
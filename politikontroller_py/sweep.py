@@ -0,0 +1,240 @@
+"""Plan and run `gps_kontroller` calls covering a whole area.
+
+Circles are laid out on a hexagonal lattice, the thinnest cover of the plane by
+equal circles. Longitudes shrink towards the poles, so the area is split into
+bands of `SWEEP_BAND_ROWS` rows, each with the longitude spacing needed at its
+lowest latitude. Neighbouring bands share a row, which keeps them aligned.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from math import ceil, cos, floor, pi, radians, sin, sqrt
+from typing import TYPE_CHECKING, NamedTuple, Union
+
+from .constants import (
+    CLIENT_MAX_CONCURRENCY,
+    EARTH_RADIUS,
+    SWEEP_BAND_ROWS,
+    SWEEP_COVERAGE_SAMPLES,
+    SWEEP_TRUNCATION_LIMIT,
+)
+from .exceptions import PolitikontrollerError
+from .geo import distances_from
+from .utils import merge_duplicate_controls
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .client import Client
+    from .models.api import PoliceGPSControlsResponse
+
+KM_PER_DEGREE = EARTH_RADIUS * pi / 180
+
+
+class BoundingBox(NamedTuple):
+    south: float
+    west: float
+    north: float
+    east: float
+
+    @classmethod
+    def around(cls, polygon: Sequence[tuple[float, float]]) -> BoundingBox:
+        lats = [lat for lat, _ in polygon]
+        lngs = [lng for _, lng in polygon]
+        return cls(min(lats), min(lngs), max(lats), max(lngs))
+
+
+Area = Union[BoundingBox, "Sequence[tuple[float, float]]"]
+
+
+@dataclass
+class SweepCircle:
+    lat: float
+    lng: float
+    radius: int
+    depth: int = 0
+
+    def children(self) -> list[SweepCircle]:
+        """Split into 7 circles of half the radius covering this one."""
+        radius = ceil(self.radius / 2)
+        distance = self.radius * sqrt(3) / 2
+        children = [SweepCircle(self.lat, self.lng, radius, self.depth + 1)]
+        for i in range(6):
+            bearing = radians(60 * i)
+            children.append(
+                SweepCircle(
+                    self.lat + distance * cos(bearing) / KM_PER_DEGREE,
+                    self.lng + distance * sin(bearing) / (KM_PER_DEGREE * cos(radians(self.lat))),
+                    radius,
+                    self.depth + 1,
+                )
+            )
+        return children
+
+
+@dataclass
+class SweepReport:
+    controls: list[PoliceGPSControlsResponse] = field(default_factory=list)
+    calls: int = 0
+    """Calls made, including the ones that failed."""
+    redundant_calls: int = 0
+    """Calls that only returned controls already found by other calls."""
+    failed_calls: int = 0
+    subdivided: int = 0
+    """Circles split up because the result looked truncated."""
+    truncated: int = 0
+    """Circles that still looked truncated at the smallest radius."""
+    coverage: float = 0.0
+    """Estimated fraction of the area covered by complete results."""
+
+
+def _local_xy(lat: float, lng: float, origin_lat: float, origin_lng: float) -> tuple[float, float]:
+    """Project a point to km east/north of an origin."""
+    return (
+        (lng - origin_lng) * KM_PER_DEGREE * cos(radians(origin_lat)),
+        (lat - origin_lat) * KM_PER_DEGREE,
+    )
+
+
+def _segment_distance(px: float, py: float, ax: float, ay: float, bx: float, by: float) -> float:
+    dx, dy = bx - ax, by - ay
+    length = dx * dx + dy * dy
+    t = 0.0 if length == 0 else max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length))
+    return sqrt((px - ax - t * dx) ** 2 + (py - ay - t * dy) ** 2)
+
+
+def point_in_polygon(lat: float, lng: float, polygon: Sequence[tuple[float, float]]) -> bool:
+    """Check if a point is inside a polygon of (lat, lng) vertices."""
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        lat_i, lng_i = polygon[i]
+        lat_j, lng_j = polygon[j]
+        if (lat_i > lat) != (lat_j > lat) and lng < (lng_j - lng_i) * (lat - lat_i) / (lat_j - lat_i) + lng_i:
+            inside = not inside
+        j = i
+    return inside
+
+
+def circle_intersects(circle: SweepCircle, area: Area) -> bool:
+    """Check if a circle overlaps a bounding box or polygon."""
+    if isinstance(area, BoundingBox):
+        lat = min(max(circle.lat, area.south), area.north)
+        lng = min(max(circle.lng, area.west), area.east)
+        x, y = _local_xy(lat, lng, circle.lat, circle.lng)
+        return sqrt(x * x + y * y) <= circle.radius
+
+    if point_in_polygon(circle.lat, circle.lng, area):
+        return True
+    points = [_local_xy(lat, lng, circle.lat, circle.lng) for lat, lng in area]
+    return any(
+        _segment_distance(0, 0, *points[i - 1], *points[i]) <= circle.radius for i in range(len(points))
+    )
+
+
+def plan_sweep(area: Area, radius: int, band_rows: int = SWEEP_BAND_ROWS) -> list[SweepCircle]:
+    """Get circles of `radius` km covering a bounding box or polygon of (lat, lng) vertices."""
+    bbox = area if isinstance(area, BoundingBox) else BoundingBox.around(area)
+    row_step = 1.5 * radius / KM_PER_DEGREE
+    circles = []
+    band_south = bbox.south
+    while True:
+        rows = min(max(1, band_rows - 1), ceil((bbox.north - band_south) / row_step))
+        band_north = band_south + rows * row_step
+        lowest_lat = 0.0 if band_south <= 0 <= band_north else min(abs(band_south), abs(band_north))
+        lng_step = sqrt(3) * radius / (KM_PER_DEGREE * cos(radians(lowest_lat)))
+        for row in range(rows + 1):
+            lat = band_south + row * row_step
+            offset = lng_step / 2 if row % 2 else 0.0
+            first = floor((bbox.west - offset) / lng_step) - 1
+            last = ceil((bbox.east - offset) / lng_step) + 1
+            for column in range(first, last + 1):
+                circle = SweepCircle(lat, column * lng_step + offset, radius)
+                if circle_intersects(circle, area):
+                    circles.append(circle)
+        if band_north >= bbox.north:
+            return circles
+        band_south = band_north
+
+
+def sample_points(area: Area, samples: int = SWEEP_COVERAGE_SAMPLES) -> tuple[list[float], list[float]]:
+    """Get a grid of points inside a bounding box or polygon."""
+    bbox = area if isinstance(area, BoundingBox) else BoundingBox.around(area)
+    lats, lngs = [], []
+    for i in range(samples):
+        lat = bbox.south + (bbox.north - bbox.south) * (i + 0.5) / samples
+        for j in range(samples):
+            lng = bbox.west + (bbox.east - bbox.west) * (j + 0.5) / samples
+            if isinstance(area, BoundingBox) or point_in_polygon(lat, lng, area):
+                lats.append(lat)
+                lngs.append(lng)
+    return lats, lngs
+
+
+def coverage(area: Area, circles: Sequence[SweepCircle], samples: int = SWEEP_COVERAGE_SAMPLES) -> float:
+    """Estimate the fraction of an area within at least one of `circles`."""
+    lats, lngs = sample_points(area, samples)
+    if len(lats) == 0:
+        return 0.0
+    covered = [False] * len(lats)
+    for circle in circles:
+        for i, distance in enumerate(distances_from(circle.lat, circle.lng, lats, lngs)):
+            if distance <= circle.radius:
+                covered[i] = True
+    return sum(covered) / len(covered)
+
+
+async def sweep(
+    client: Client,
+    area: Area,
+    radius: int,
+    speed: int = 100,
+    max_concurrency: int | None = None,
+    truncation_limit: int = SWEEP_TRUNCATION_LIMIT,
+    min_radius: int = 1,
+    merge_duplicates: bool = True,
+) -> SweepReport:
+    """Get all active controls in an area, with `radius` km `gps_kontroller` calls.
+
+    Calls returning `truncation_limit` controls or more are repeated as 7 calls
+    with half the radius, down to `min_radius`.
+    """
+    if max_concurrency is None:
+        max_concurrency = CLIENT_MAX_CONCURRENCY
+    semaphore = asyncio.Semaphore(max_concurrency)
+    report = SweepReport()
+    found: dict[int, PoliceGPSControlsResponse] = {}
+    complete: list[SweepCircle] = []
+
+    async def query(circle: SweepCircle):
+        report.calls += 1
+        try:
+            async with semaphore:
+                controls = await client.get_controls_in_radius(
+                    circle.lat, circle.lng, circle.radius, speed, merge_duplicates=False
+                )
+        except PolitikontrollerError:
+            report.failed_calls += 1
+            return
+
+        new = [c for c in controls if c.id not in found]
+        found.update((c.id, c) for c in new)
+        if len(controls) > 0 and len(new) == 0:
+            report.redundant_calls += 1
+
+        if len(controls) < truncation_limit:
+            complete.append(circle)
+        elif circle.radius <= min_radius:
+            report.truncated += 1
+        else:
+            report.subdivided += 1
+            await asyncio.gather(*[query(c) for c in circle.children() if circle_intersects(c, area)])
+
+    await asyncio.gather(*[query(c) for c in plan_sweep(area, radius)])
+
+    controls = list(found.values())
+    report.controls = merge_duplicate_controls(controls) if merge_duplicates else controls
+    report.coverage = coverage(area, complete)
+    return report
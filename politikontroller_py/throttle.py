@@ -0,0 +1,196 @@
+"""Request pacing: token-bucket rate limits and adaptive concurrency."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+import time
+from typing import TYPE_CHECKING, Callable
+
+from .constants import (
+    CLIENT_LATENCY_TOLERANCE,
+    CLIENT_MAX_CONCURRENCY,
+    CLIENT_MIN_CONCURRENCY,
+    CLIENT_RATE_BURST,
+    CLIENT_RATE_LIMIT,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Mapping
+
+
+class TokenBucket:
+    """Allow `rate` requests per second on average, and bursts of up to `burst` requests."""
+
+    def __init__(
+        self,
+        rate: float = CLIENT_RATE_LIMIT,
+        burst: int = CLIENT_RATE_BURST,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable] = asyncio.sleep,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self) -> float:
+        """Get the number of seconds until a token is available."""
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available."""
+        if self.tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self) -> float:
+        """Wait for a token and take it. Waiters are served in order.
+
+        Returns the number of seconds spent waiting.
+        """
+        started = self._clock()
+        async with self._lock:
+            while not self.try_acquire():
+                await self._sleep(self.delay())
+        return self._clock() - started
+
+
+class RateLimiter:
+    """Token buckets per account, with optional stricter limits per endpoint.
+
+    Every request takes a token from the bucket of its account. Requests to an
+    endpoint listed in `endpoint_limits` also take one from the bucket of that
+    endpoint and account.
+    """
+
+    def __init__(
+        self,
+        rate: float = CLIENT_RATE_LIMIT,
+        burst: int = CLIENT_RATE_BURST,
+        endpoint_limits: Mapping[str, tuple[float, int]] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable] = asyncio.sleep,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.endpoint_limits = {str(k): v for k, v in (endpoint_limits or {}).items()}
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: dict[tuple[str | None, str | None], TokenBucket] = {}
+
+    def _bucket(self, account: str | None, endpoint: str | None) -> TokenBucket:
+        key = (account, endpoint)
+        if key not in self._buckets:
+            rate, burst = self.endpoint_limits[endpoint] if endpoint is not None else (self.rate, self.burst)
+            self._buckets[key] = TokenBucket(rate, burst, self._clock, self._sleep)
+        return self._buckets[key]
+
+    def buckets(self, endpoint: str, account: str | None = None) -> list[TokenBucket]:
+        """Get the buckets a request to `endpoint` takes tokens from."""
+        endpoint = str(endpoint)
+        buckets = []
+        if endpoint in self.endpoint_limits:
+            buckets.append(self._bucket(account, endpoint))
+        buckets.append(self._bucket(account, None))
+        return buckets
+
+    async def acquire(self, endpoint: str, account: str | None = None) -> float:
+        """Wait until a request to `endpoint` is allowed.
+
+        Returns the number of seconds spent waiting.
+        """
+        waited = 0.0
+        for bucket in self.buckets(endpoint, account):
+            waited += await bucket.acquire()
+        return waited
+
+
+class AdaptiveConcurrencyLimiter:
+    """Limit requests in flight, adjusting the limit to how the server copes.
+
+    The limit grows by one for every `limit` fast responses, and is cut by
+    `backoff` on timeouts, connection errors or rejections. A response is fast
+    when the smoothed latency stays within `latency_tolerance` times the lowest
+    latency seen. The limit is cut at most once per smoothed latency, so a burst
+    of failures from the same round of requests only counts once.
+
+    Report the outcome of each request while still holding its `slot()`.
+    """
+
+    def __init__(
+        self,
+        initial: int = CLIENT_MAX_CONCURRENCY,
+        min_limit: int = CLIENT_MIN_CONCURRENCY,
+        max_limit: int = CLIENT_MAX_CONCURRENCY,
+        backoff: float = 0.5,
+        latency_tolerance: float = CLIENT_LATENCY_TOLERANCE,
+        smoothing: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.latency: float | None = None
+        self.min_latency: float | None = None
+        self._clock = clock
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self._last_backoff: float | None = None
+        self._condition = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait until a request may start, and hold the slot until it ends."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def on_success(self, latency: float):
+        """Record a successful response, which took `latency` seconds."""
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.smoothing * (latency - self.latency)
+        if self.min_latency is None or latency < self.min_latency:
+            self.min_latency = latency
+        if self.latency <= self.min_latency * self.latency_tolerance:
+            self._set_limit(self._limit + 1 / self.limit)
+
+    def on_overload(self):
+        """Record a timeout, connection error or rejected request."""
+        now = self._clock()
+        if self._last_backoff is not None and now - self._last_backoff < (self.latency or 0):
+            return
+        self._last_backoff = now
+        self._set_limit(self._limit * self.backoff)
+
+    def _set_limit(self, limit: float):
+        # Waiters are woken when a slot is released, which follows every update
+        self._limit = min(max(limit, self.min_limit), self.max_limit)
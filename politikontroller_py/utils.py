@@ -1,26 +1,29 @@
 from __future__ import annotations
 
 import base64
+from bisect import bisect_right
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, time as dt_time
 from logging import getLogger
-from math import atan2, cos, sin, sqrt
+from math import asin, atan2, cos, degrees, floor, inf, radians, sin, sqrt
 import random
 import re
 import string
 import time
 from typing import TYPE_CHECKING, TypeVar
 
-from Crypto.Cipher import AES
-from Crypto.Util.Padding import pad, unpad
-from geojson.mapping import to_mapping
-
 from .constants import (
     CRYPTO_K1,
     CRYPTO_K2,
     DEFAULT_MAX_DISTANCE,
+    EARTH_RADIUS,
 )
+from .geo import distances_from
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
     from .models.api import PoliceControl, PoliceControlPoint
 
     PC = TypeVar("PC", bound=PoliceControl)
@@ -41,42 +44,117 @@ def get_unix_timestamp():
     return int(time.time()) + 10
 
 
+class PayloadCodec:
+    """AES codec for the `app.php` wire format.
+
+    Key material is decoded once, and PyCryptodome is only imported by the
+    first codec built. Decryption of small payloads reuses a single ECB
+    cipher and applies the CBC chaining by hand, which avoids building a new
+    cipher object per call. Larger payloads go through a fresh CBC cipher, which
+    is faster once the XOR over the whole payload dominates.
+    """
+
+    ECB_DECRYPT_MAX_SIZE = 4096
+
+    def __init__(self, key: str = CRYPTO_K2, iv: str = CRYPTO_K1):
+        from Crypto.Cipher import AES
+        from Crypto.Util.Padding import unpad
+
+        self._key = base64.b64decode(key)
+        self._iv = base64.b64decode(iv)
+        self._aes = AES
+        self._unpad = unpad
+        self._ecb = AES.new(self._key, AES.MODE_ECB)
+
+    def encrypt_query(self, input_str: str) -> str:
+        """Encrypt a query string. Returns base64-encoded result.
+
+        The payload is padded twice, once by character count and then with PKCS#7,
+        exactly like the official app does.
+        """
+        block_size = self._aes.block_size
+        input_b = input_str.encode()
+        length = block_size - (len(input_str) % block_size)
+        padded_len = len(input_b) + length
+        extra = block_size - (padded_len % block_size)
+        input_padded = input_b + bytes([length]) * length + bytes([extra]) * extra
+        cipher = self._aes.new(self._key, self._aes.MODE_CBC, self._iv)
+        return base64.b64encode(cipher.encrypt(input_padded)).decode()
+
+    def decrypt_payload(self, enc_base64: str) -> str:
+        """Decrypt a base64-encoded response payload."""
+        block_size = self._aes.block_size
+        enc_data = base64.b64decode(enc_base64)
+        size = len(enc_data)
+        if 0 < size <= self.ECB_DECRYPT_MAX_SIZE:
+            blocks = self._ecb.decrypt(enc_data)
+            chain = self._iv + enc_data[:-block_size]
+            ciphertext_padded = (int.from_bytes(blocks, "little") ^ int.from_bytes(chain, "little")).to_bytes(
+                size, "little"
+            )
+        else:
+            ciphertext_padded = self._aes.new(self._key, self._aes.MODE_CBC, self._iv).decrypt(enc_data)
+        return self._unpad(ciphertext_padded, block_size).decode().strip(JUNK_CHARS)
+
+    def encrypt_many(self, inputs: Iterable[str]) -> list[str]:
+        """Encrypt many query strings."""
+        return [self.encrypt_query(i) for i in inputs]
+
+    def decrypt_many(self, payloads: Iterable[str]) -> list[str]:
+        """Decrypt many response payloads."""
+        return [self.decrypt_payload(p) for p in payloads]
+
+
+_codec: PayloadCodec | None = None
+
+
+def _default_codec() -> PayloadCodec:
+    global _codec  # noqa: PLW0603
+    if _codec is None:
+        _codec = PayloadCodec()
+    return _codec
+
+
 def aes_encrypt(input_str: str):
     """Encrypts a string using AES encryption with given key and initialization vector.
     Returns base64-encoded result.
     """
-    key = base64.b64decode(CRYPTO_K2)
-    iv = base64.b64decode(CRYPTO_K1)
-    cipher = AES.new(key, AES.MODE_CBC, iv)
-    length = 16 - (len(input_str) % 16)
-    input_b = bytes(input_str, "utf-8") + bytes([length]) * length
-    input_padded = pad(input_b, AES.block_size)
-    return base64.b64encode(cipher.encrypt(input_padded)).decode()
+    return _default_codec().encrypt_query(input_str)
 
 
 def aes_decrypt(enc_base64: str):
     """Decrypts AES encrypted data using a given key and initialization vector."""
-    enc_data = base64.b64decode(enc_base64)
-    key = base64.b64decode(CRYPTO_K2)
-    iv = base64.b64decode(CRYPTO_K1)
-    decipher = AES.new(key, AES.MODE_CBC, iv)
-    ciphertext_padded = decipher.decrypt(enc_data)
-    return unpad(ciphertext_padded, AES.block_size).decode().strip(JUNK_CHARS)
+    return _default_codec().decrypt_payload(enc_base64)
+
+
+def _row_to_dict(row: str, map_keys: list[str | None]) -> dict[str, str]:
+    r = dict(zip(map_keys, row.split("|")))
+    return {k: r[k] for k in r if isinstance(k, str)}
+
+
+def iter_response_rows(data: str) -> Iterator[str]:
+    """Yield the rows of a cvs-like string one at a time, without splitting it up front."""
+    start = 0
+    while (end := data.find("#", start)) != -1:
+        yield data[start:end]
+        start = end + 1
+    yield data[start:]
+
+
+def iter_response_data(data: str, map_keys: list[str | None]) -> Iterator[dict[str, str]]:
+    """Convert a cvs-like string into dictionaries, one row at a time."""
+    for row in iter_response_rows(data):
+        yield _row_to_dict(row, map_keys)
 
 
 def map_response_data(
     data: str, map_keys: list[str | None], multiple=False
 ) -> list[dict[str, str]] | dict[str, str]:
     """Convert a cvs-like string into dictionaries."""
-
-    def row_to_dict(row) -> dict[str, str]:
-        r = dict(zip(map_keys, row.split("|")))
-        return {k: r[k] for k in r if isinstance(k, str)}
-
     if multiple:
-        return list(map(row_to_dict, list(data.split("#"))))
+        return list(iter_response_data(data, map_keys))
 
-    return row_to_dict(data)
+    return _row_to_dict(data, map_keys)
 
 
 def unmap_response_data(
@@ -94,67 +172,122 @@ def unmap_response_data(
     return dict_to_row(data)
 
 
-def parse_datetime_like(v: str) -> int | None:
-    """Parse datetime like string to unix timestamp."""
-    if isinstance(v, int) and v != 0:
-        return v
-    if len(v) == 0 or (v.isnumeric() and int(v) == 0):
-        return None
-    return int(parse_time_format(v))
+class TimestampParser:
+    """Parse the timestamp formats found in control rows into unix timestamps.
 
+    "Today" is resolved once, when the parser is created, and every distinct
+    string is only parsed once. Use one parser per response batch, see `activate()`.
+    """
 
-def parse_time_format(text: str) -> int | str:
-    """Parse time format to unix timestamp."""
-    today = datetime.now().astimezone()
-    try:
-        # Match "%d.%m - %H:%M" this way due to failure on leap days using strptime.
-        if m := re.match(r"(\d{2})\.(\d{2}) - (\d{2}):(\d{2})", text):
+    # Match "%d.%m - %H:%M" this way due to failure on leap days using strptime.
+    DAY_MONTH_TIME = re.compile(r"(\d{2})\.(\d{2}) - (\d{2}):(\d{2})")
+    ISO_DATETIME = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}")
+    TIME_SEEN_TIMES = re.compile(r"(\d{2}:\d{2})(?: \(\d+ ganger\))?")
+
+    def __init__(self, today: datetime | None = None):
+        self.today = today if today is not None else datetime.now().astimezone()
+        self._parsed: dict[str, int | str] = {}
+
+    @contextmanager
+    def activate(self) -> Iterator[TimestampParser]:
+        """Use this parser for `parse_datetime_like` calls made inside the block."""
+        token = _active_timestamp_parser.set(self)
+        try:
+            yield self
+        finally:
+            _active_timestamp_parser.reset(token)
+
+    def parse(self, text: str) -> int | str:
+        """Parse time format to unix timestamp."""
+        try:
+            return self._parsed[text]
+        except KeyError:
+            result = self._parsed[text] = self._parse(text)
+            return result
+
+    def parse_many(self, values: Iterable[str]) -> list[int | str]:
+        """Parse a whole column of time formats."""
+        parse = self.parse
+        return [parse(v) for v in values]
+
+    def parse_datetime_like(self, v: str) -> int | None:
+        """Parse datetime like string to unix timestamp."""
+        if isinstance(v, int) and v != 0:
+            return v
+        if len(v) == 0 or (v.isnumeric() and int(v) == 0):
+            return None
+        return int(self.parse(v))
+
+    def _parse(self, text: str) -> int | str:
+        today = self.today
+        try:
+            if m := self.DAY_MONTH_TIME.match(text):
+                return int(
+                    datetime.fromisoformat(f"{today.year}-{m[2]}-{m[1]}T{m[3]}:{m[4]}:00")
+                    .astimezone()
+                    .timestamp()
+                )
+        except ValueError:  # pragma: no cover
+            pass
+
+        try:
+            if m := self.ISO_DATETIME.match(text):
+                return int(datetime.fromisoformat(m[0]).astimezone().timestamp())
+        except ValueError:  # pragma: no cover
+            pass
+
+        try:
             return int(
-                datetime.fromisoformat(f"{today.year}-{m[2]}-{m[1]}T{m[3]}:{m[4]}:00")
+                datetime.combine(
+                    today,
+                    dt_time.fromisoformat(text),
+                )
                 .astimezone()
                 .timestamp()
             )
-    except ValueError:  # pragma: no cover
-        pass
-
-    try:
-        if m := re.match(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}", text):
-            return int(datetime.fromisoformat(m[0]).astimezone().timestamp())
-    except ValueError:  # pragma: no cover
-        pass
-
-    try:
-        return int(
-            datetime.combine(
-                today,
-                dt_time.fromisoformat(text),
-            )
-            .astimezone()
-            .timestamp()
-        )
-    except ValueError:  # pragma: no cover
-        pass
-
-    try:  # pragma: no cover
-        text = re.sub(r"(\d{2}:\d{2})(?: \(\d+ ganger\))?", "\\1", text)
-        return int(
-            datetime.strptime(text, "%H:%M")
-            .astimezone()
-            .replace(
-                year=today.year,
-                month=today.month,
-                day=today.day,
+        except ValueError:  # pragma: no cover
+            pass
+
+        try:  # pragma: no cover
+            text = self.TIME_SEEN_TIMES.sub("\\1", text)
+            return int(
+                datetime.strptime(text, "%H:%M")
+                .astimezone()
+                .replace(
+                    year=today.year,
+                    month=today.month,
+                    day=today.day,
+                )
+                .timestamp()
             )
-            .timestamp()
-        )
-    except ValueError:  # pragma: no cover
-        pass
-    return text  # pragma: no cover
+        except ValueError:  # pragma: no cover
+            pass
+        return text  # pragma: no cover
+
+
+_active_timestamp_parser: ContextVar[TimestampParser | None] = ContextVar(
+    "active_timestamp_parser", default=None
+)
+
+
+def parse_datetime_like(v: str) -> int | None:
+    """Parse datetime like string to unix timestamp."""
+    parser = _active_timestamp_parser.get()
+    if parser is None:
+        parser = TimestampParser()
+    return parser.parse_datetime_like(v)
+
+
+def parse_time_format(text: str) -> int | str:
+    """Parse time format to unix timestamp."""
+    parser = _active_timestamp_parser.get()
+    if parser is None:
+        parser = TimestampParser()
+    return parser.parse(text)
 
 
 def calculate_distance(point1: PoliceControlPoint, point2: PoliceControlPoint) -> float:
     """Calculate distance between two points."""
-    earth_radius = 6373.0  # Approximate radius of earth in km
     lat1, lon1 = point1.coordinates(as_radian=True)
     lat2, lon2 = point2.coordinates(as_radian=True)
 
@@ -164,7 +297,7 @@ def calculate_distance(point1: PoliceControlPoint, point2: PoliceControlPoint) -
     a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
     c = 2 * atan2(sqrt(a), sqrt(1 - a))
 
-    return earth_radius * c
+    return EARTH_RADIUS * c
 
 
 def average_points(p1: PoliceControlPoint, p2: PoliceControlPoint) -> tuple[float, float]:
@@ -172,33 +305,136 @@ def average_points(p1: PoliceControlPoint, p2: PoliceControlPoint) -> tuple[floa
     return (p1.lat + p2.lat) / 2, (p1.lng + p2.lng) / 2
 
 
-def merge_duplicate_controls(controls: list[PC], max_distance: float | None = None) -> list[PC]:
-    """Merge duplicate controls."""
+def centroid(lats: Sequence[float], lngs: Sequence[float]) -> tuple[float, float]:
+    """Average any number of points, also across the antimeridian."""
+    lat = sum(lats) / len(lats)
+    if max(lngs) - min(lngs) <= 180:  # noqa: PLR2004
+        return lat, sum(lngs) / len(lngs)
+    lng = sum(lng + 360 if lng < 0 else lng for lng in lngs) / len(lngs)
+    return lat, lng - 360 if lng > 180 else lng  # noqa: PLR2004
+
+
+class ControlGrid:
+    """Bucket controls by type into lat/lng cells at least `max_distance` wide.
+
+    Two controls within `max_distance` of each other are always in the same or in
+    neighbouring cells, so only those need a distance check.
+    """
+
+    def __init__(self, controls: list[PC], max_distance: float):
+        self.controls = controls
+        self.max_distance = max_distance
+        angle = max_distance / EARTH_RADIUS
+        self.lat_size = degrees(angle) if angle > 0 else inf
+
+        # Longitude degrees shrink towards the poles, size columns for the highest latitude
+        max_lat = max((abs(c.point.lat) for c in controls), default=0.0)
+        cos_lat = cos(radians(max_lat))
+        reach = sin(angle / 2) / cos_lat if cos_lat > 0 else 1.0
+        self.columns = max(int(360 / degrees(2 * asin(reach))), 1) if 0 < reach < 1 else 1
+        self.lng_size = 360 / self.columns
+
+        self.cells: dict[tuple[str, int, int], list[int]] = {}
+        for index, control in enumerate(controls):
+            self.cells.setdefault(self._cell(control), []).append(index)
+
+    def _cell(self, control: PC) -> tuple[str, int, int]:
+        row = floor(control.point.lat / self.lat_size)
+        column = floor((control.point.lng + 180) / self.lng_size) % self.columns
+        return control.type, row, column
+
+    def _neighbours(self, control: PC):
+        control_type, row, column = self._cell(control)
+        columns = {(column + dc) % self.columns for dc in (-1, 0, 1)}
+        for dr in (-1, 0, 1):
+            for c in columns:
+                if (cell := self.cells.get((control_type, row + dr, c))) is not None:
+                    yield cell
+
+    def candidates(self, index: int) -> Iterator[int]:
+        """Get the indexes above `index` of the controls that may be within reach of it."""
+        for cell in self._neighbours(self.controls[index]):
+            yield from cell[bisect_right(cell, index) :]
+
+
+class DisjointSet:
+    """Union-find over `size` items, each set named by its lowest item."""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: int, b: int):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            self.parent[max(a, b)] = min(a, b)
+
+    def groups(self) -> list[list[int]]:
+        """Get the sets, ordered by their lowest item, each in ascending order."""
+        groups: dict[int, list[int]] = {}
+        for item in range(len(self.parent)):
+            groups.setdefault(self.find(item), []).append(item)
+        return list(groups.values())
+
+
+def cluster_controls(controls: list[PC], max_distance: float | None = None) -> list[list[int]]:
+    """Group the indexes of controls of the same type linked by hops of at most `max_distance`."""
     if max_distance is None:
         max_distance = DEFAULT_MAX_DISTANCE
-    merged_controls = []
-    skip_indices = set()
-
-    for i, control1 in enumerate(controls):
-        if i in skip_indices:
+    grid = ControlGrid(controls, max_distance)
+    clusters = DisjointSet(len(controls))
+    for i, control in enumerate(controls):
+        candidates = list(grid.candidates(i))
+        if len(candidates) == 0:
             continue
+        distances = distances_from(
+            control.point.lat,
+            control.point.lng,
+            [controls[j].point.lat for j in candidates],
+            [controls[j].point.lng for j in candidates],
+            use_numpy=False,
+        )
+        for j, distance in zip(candidates, distances):
+            if distance <= max_distance:
+                clusters.union(i, j)
+    return clusters.groups()
 
-        for j, control2 in enumerate(controls):
-            if i == j or j in skip_indices:
-                continue
 
-            distance = calculate_distance(control1.point, control2.point)
-            if distance <= max_distance and control1.type == control2.type:
-                control1 = control1.merge_with(control2)  # noqa: PLW2901
+def merge_duplicate_controls(controls: list[PC], max_distance: float | None = None) -> list[PC]:
+    """Merge duplicate controls.
 
-                skip_indices.add(j)
+    Controls of the same type linked by hops of at most `max_distance` form a
+    cluster, which is merged into its first control in one step.
+    """
+    merged_controls = []
+    for cluster in cluster_controls(controls, max_distance):
+        first = controls[cluster[0]]
+        if len(cluster) == 1:
+            merged_controls.append(first)
+        else:
+            merged_controls.append(first.merge_all([controls[j] for j in cluster[1:]]))
+    return merged_controls
 
-        merged_controls.append(control1)
 
-    return merged_controls
+def last_activity(control: PoliceControl) -> datetime | None:
+    """Get the most recent of `timestamp` and `last_seen`."""
+    values = [v for v in (control.timestamp, getattr(control, "last_seen", None)) if v is not None]
+    return max(values) if values else None
 
 
 def to_geo_json(controls: list[PC]):
+    """Get `controls` as a GeoJSON FeatureCollection mapping.
+
+    Use `output.dump_geo_json` to write large collections without building it.
+    """
+    from geojson.mapping import to_mapping
+
     return {
         "type": "FeatureCollection",
         "features": [to_mapping(c) for c in controls],
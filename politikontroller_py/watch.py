@@ -0,0 +1,83 @@
+"""Track changes between polls of a control listing."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+from .models.common import StrEnum
+from .utils import TimestampParser, iter_response_rows
+
+if TYPE_CHECKING:
+    from .models.api import PoliceControl
+
+PC = TypeVar("PC", bound="PoliceControl")
+
+WATCHED_FIELDS = (
+    "timestamp",
+    "last_seen",
+    "confirmed",
+    "lat",
+    "lng",
+    "description",
+)
+
+
+class ChangeType(StrEnum):
+    ADDED = "added"
+    REMOVED = "removed"
+    UPDATED = "updated"
+
+
+@dataclass
+class ControlChange(Generic[PC]):
+    type: ChangeType
+    control: PC
+    """The control as last listed, or as last seen if it was removed."""
+    previous: PC | None = None
+    changed_fields: tuple[str, ...] = ()
+
+
+class ControlWatcher(Generic[PC]):
+    """Diff successive responses of a control listing, keyed by control id.
+
+    Only rows whose raw text changed since the previous response are
+    deserialized, so an unchanged listing costs little more than splitting it.
+    """
+
+    def __init__(self, cast_to: type[PC], watched_fields: tuple[str, ...] = WATCHED_FIELDS):
+        self.cast_to = cast_to
+        self.watched_fields = watched_fields
+        self.controls: dict[str, PC] = {}
+        self._rows: dict[str, str] = {}
+
+    def update(self, data: str) -> list[ControlChange[PC]]:
+        """Get the changes since the previous response, and remember this one."""
+        changes = []
+        rows = {}
+        parser = TimestampParser()
+        for row in iter_response_rows(data):
+            if len(row) == 0:
+                continue
+            cid = row.split("|", 1)[0]
+            rows[cid] = row
+            if self._rows.get(cid) == row:
+                continue
+            with parser.activate():
+                control = self.cast_to.from_response_row(row)
+            previous = self.controls.get(cid)
+            self.controls[cid] = control
+            if previous is None:
+                changes.append(ControlChange(ChangeType.ADDED, control))
+                continue
+            changed_fields = tuple(
+                f for f in self.watched_fields if getattr(control, f, None) != getattr(previous, f, None)
+            )
+            if changed_fields:
+                changes.append(ControlChange(ChangeType.UPDATED, control, previous, changed_fields))
+
+        changes.extend(
+            ControlChange(ChangeType.REMOVED, self.controls.pop(cid)) for cid in self._rows if cid not in rows
+        )
+        self._rows = rows
+        return changes
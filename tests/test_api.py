@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import asyncio
+from contextlib import aclosing
 import logging
+from types import SimpleNamespace
 from typing import TYPE_CHECKING
 
 from aiohttp import ClientResponse, ClientSession
@@ -11,13 +13,19 @@ from aresponses import Response
 import pytest
 
 from politikontroller_py import Account, Client
+from politikontroller_py.auth_cache import AuthCache
+from politikontroller_py.cache import ControlCache
 from politikontroller_py.exceptions import (
     AuthenticationError,
+    CircuitOpenError,
+    InvalidAuthError,
     NotFoundError,
     PolitikontrollerConnectionError,
     PolitikontrollerError,
     PolitikontrollerTimeoutError,
 )
+from politikontroller_py.instrumentation import RequestMetrics, RequestOutcome
+from politikontroller_py.models import AuthStatus, ControlBatch, LazyControls
 from politikontroller_py.models.api import (
     APIEndpoint,
     PoliceControlResponse,
@@ -25,7 +33,14 @@ from politikontroller_py.models.api import (
     PoliceControlTypeEnum,
     PoliceGPSControlsResponse,
 )
+from politikontroller_py.retry import CircuitBreaker, RetryPolicy
+from politikontroller_py.store import ControlStore
+from politikontroller_py.sweep import BoundingBox, plan_sweep
+from politikontroller_py.throttle import AdaptiveConcurrencyLimiter, RateLimiter
 from politikontroller_py.utils import to_geo_json
+from politikontroller_py.watch import ChangeType
+
+from .helpers import CustomRoute, load_fixture
 
 if TYPE_CHECKING:
     from .helpers import PolitikontrollerMockServer
@@ -51,6 +66,92 @@ async def test_unauthenticated_check(politikontroller_fixture: PolitikontrollerM
             await client.check()
 
 
+async def test_context_manager_reuses_connection(
+    politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client
+):
+    for _ in range(3):
+        politikontroller_fixture.add_politikontroller(APIEndpoint.CHECK, "check")
+    async with politikontroller_client() as client:
+        for _ in range(3):
+            assert await client.check() == "YES"
+        session = client.session
+        assert not session.closed
+        assert client.connection_stats.created == 1
+        assert client.connection_stats.reused == 2
+    assert session.closed
+
+
+async def test_aclose_keeps_external_session(politikontroller_fixture: PolitikontrollerMockServer):
+    async with ClientSession() as session:
+        client = Client.initialize("4747474747", "securepassword123", session=session)
+        async with client:
+            assert client.session is session
+        assert not session.closed
+        await client.aclose()
+        assert not session.closed
+
+
+async def test_session_closed_without_context(
+    politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client
+):
+    politikontroller_fixture.add_politikontroller(APIEndpoint.CHECK, "check")
+    client = politikontroller_client()
+    assert await client.check() == "YES"
+    assert client.session.closed
+
+
+async def test_aclose(politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client):
+    politikontroller_fixture.add_politikontroller(APIEndpoint.CHECK, "check")
+    client = politikontroller_client()
+    async with client:
+        session = client.session
+        with pytest.raises(RuntimeError):
+            await client.aclose()
+        assert not session.closed
+        assert await client.check() == "YES"
+    assert session.closed
+
+    # Not in use, a session the client opened is closed, and closing again is fine
+    client._ensure_session()
+    await client.aclose()
+    assert client.session.closed
+    await client.aclose()
+
+
+async def test_concurrent_batches_share_session(
+    politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client
+):
+    """A batch that finishes first must not close the session another batch still uses."""
+    first_done = asyncio.Event()
+
+    async def slow_control(_request):
+        await first_done.wait()
+        return Response(text=load_fixture("hki_59790"))
+
+    politikontroller_fixture.add_politikontroller(
+        APIEndpoint.SPEED_CONTROL, "hki_59777", params={"kontroll_id": 59777}
+    )
+    politikontroller_fixture.add(
+        response=slow_control,
+        route=CustomRoute(path_qs={"p": APIEndpoint.SPEED_CONTROL, "kontroll_id": 59790}),
+    )
+    client = politikontroller_client()
+
+    async def first_batch():
+        controls = await client.get_controls_from_lists([SimpleNamespace(id=59777)])
+        first_done.set()
+        return controls
+
+    async def second_batch():
+        return [c async for _, c in client.get_controls_as_completed([59790])]
+
+    first, second = await asyncio.gather(first_batch(), second_batch())
+
+    assert [c.id for c in first] == [59777]
+    assert [c.id for c in second] == [59790]
+    assert client.session.closed
+
+
 async def test_authenticate(politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client):
     politikontroller_fixture.add_politikontroller(APIEndpoint.LOGIN, "login")
     async with ClientSession() as session:
@@ -60,6 +161,93 @@ async def test_authenticate(politikontroller_fixture: PolitikontrollerMockServer
         assert isinstance(result, Account)
 
 
+async def test_authenticate_cached(
+    politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client, tmp_path
+):
+    politikontroller_fixture.add_politikontroller(APIEndpoint.LOGIN, "login")
+    cache = AuthCache(tmp_path / "session.json")
+    client = politikontroller_client()
+    client.auth_cache = cache
+    account = await client.authenticate_user(client.user.username, client.user.password)
+    assert account.uid == 1000
+    assert cache.load(account.username, client.user.password) is not None
+
+    # The second client uses the cached login, and the mock has no login left
+    client = politikontroller_client()
+    client.auth_cache = cache
+    cached = await client.authenticate_user(client.user.username, client.user.password)
+    assert cached == account
+    assert client.user.password == "securepassword123"
+
+    # Another password logs in
+    politikontroller_fixture.add_politikontroller(APIEndpoint.LOGIN, "login")
+    client = politikontroller_client()
+    client.auth_cache = cache
+    await client.authenticate_user(client.user.username, "otherpassword")
+    politikontroller_fixture.assert_plan_strictly_followed()
+
+
+async def test_reauthenticate_on_invalid_auth(
+    politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client, tmp_path
+):
+    politikontroller_fixture.add(
+        response=Response(text="INVALID_AUTH"),
+        route=CustomRoute(path_qs={"p": APIEndpoint.CHECK}),
+    )
+    politikontroller_fixture.add_politikontroller(APIEndpoint.LOGIN, "login")
+    politikontroller_fixture.add_politikontroller(APIEndpoint.CHECK, "check")
+    cache = AuthCache(tmp_path / "session.json")
+    cache.save(
+        Account(username="4747474747", password="securepassword123", uid=999, auth_status=AuthStatus.LOGIN_OK)
+    )
+    client = politikontroller_client()
+    client.auth_cache = cache
+    await client.authenticate_user(client.user.username, client.user.password)
+    assert client.user.uid == 999
+
+    assert await client.check() == "YES"
+    assert client.user.uid == 1000
+    assert cache.load("4747474747", "securepassword123").uid == 1000
+
+    # Without a cache there is nothing to refresh
+    politikontroller_fixture.add(
+        response=Response(text="INVALID_AUTH"),
+        route=CustomRoute(path_qs={"p": APIEndpoint.CHECK}),
+    )
+    client = politikontroller_client()
+    with pytest.raises(InvalidAuthError):
+        await client.check()
+
+
+async def test_reauthenticate_once(
+    politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client, tmp_path
+):
+    ids = [59777, 59786, 59790]
+    for cid in ids:
+        politikontroller_fixture.add(
+            response=Response(text="INVALID_AUTH"),
+            route=CustomRoute(path_qs={"p": APIEndpoint.SPEED_CONTROL, "kontroll_id": cid}),
+        )
+    politikontroller_fixture.add_politikontroller(APIEndpoint.LOGIN, "login")
+    for cid in ids:
+        politikontroller_fixture.add_politikontroller(
+            APIEndpoint.SPEED_CONTROL, f"hki_{cid}", params={"kontroll_id": cid}
+        )
+    cache = AuthCache(tmp_path / "session.json")
+    cache.save(
+        Account(username="4747474747", password="securepassword123", uid=999, auth_status=AuthStatus.LOGIN_OK)
+    )
+    client = politikontroller_client()
+    client.auth_cache = cache
+    await client.authenticate_user(client.user.username, client.user.password)
+
+    # All requests fail with the expired login, and only one logs in again
+    controls = await asyncio.gather(*(client.get_control(cid) for cid in ids))
+    assert [c.id for c in controls] == ids
+    assert client.user.uid == 1000
+    politikontroller_fixture.assert_plan_strictly_followed()
+
+
 async def test_login(politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client):
     politikontroller_fixture.add_politikontroller(APIEndpoint.LOGIN, "login")
     async with ClientSession() as session:
@@ -118,6 +306,36 @@ async def test_get_controls_in_radius(
         assert len(controls) == 3
 
 
+async def test_get_controls_from_lists_partial(
+    politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client
+):
+    politikontroller_fixture.add_politikontroller(APIEndpoint.LOGIN, "login")
+    politikontroller_fixture.add_politikontroller(APIEndpoint.GPS_CONTROLS, "gps_kontroller")
+    for _ in range(2):
+        for i in [59777, 59790]:
+            politikontroller_fixture.add_politikontroller(
+                APIEndpoint.SPEED_CONTROL,
+                f"hki_{i}",
+                params={"kontroll_id": i},
+            )
+        politikontroller_fixture.add(
+            response=Response(status=404),
+            route=CustomRoute(path_qs={"p": APIEndpoint.SPEED_CONTROL, "kontroll_id": 59786}),
+        )
+
+    client = politikontroller_client()
+    result = await client.get_controls_in_radius(lat=0, lng=0, radius=100, merge_duplicates=False)
+    controls = await client.get_controls_from_lists(result, max_concurrency=2)
+    assert [c.id for c in controls] == [59777, 59790]
+
+    controls = await client.get_controls_from_lists(result, max_concurrency=2, return_exceptions=True)
+    assert [c.id for c in result] == [59777, 59786, 59790]
+    assert isinstance(controls[0], PoliceControlResponse)
+    assert isinstance(controls[1], NotFoundError)
+    assert isinstance(controls[2], PoliceControlResponse)
+    assert client.session.closed
+
+
 async def test_get_controls_in_radius_clustered(
     politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client
 ):
@@ -167,6 +385,23 @@ async def test_get_controls(politikontroller_fixture: PolitikontrollerMockServer
         assert all(isinstance(c, PoliceControlsResponse) for c in result)
 
 
+async def test_iter_controls(politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client):
+    politikontroller_fixture.add_politikontroller(APIEndpoint.SPEED_CONTROLS, "hk")
+    politikontroller_fixture.add_politikontroller(APIEndpoint.GPS_CONTROLS, "gps_kontroller")
+    politikontroller_fixture.add_politikontroller(APIEndpoint.GPS_CONTROLS, "hk_empty")
+    async with politikontroller_client() as client:
+        controls = client.iter_controls(lat=0, lng=0)
+        first = await controls.__anext__()
+        assert isinstance(first, PoliceControlsResponse)
+        assert [first.id] + [c.id async for c in controls] == [59846, 59838, 59831]
+
+        result = [c async for c in client.iter_controls_in_radius(lat=0, lng=0, radius=100)]
+        assert [c.id for c in result] == [59777, 59786, 59790]
+        assert all(isinstance(c, PoliceGPSControlsResponse) for c in result)
+
+        assert [c async for c in client.iter_controls_in_radius(lat=0, lng=0, radius=100)] == []
+
+
 async def test_get_controls_geo_json(
     politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client
 ):
@@ -229,6 +464,344 @@ async def test_get_control(
         assert isinstance(result, PoliceControlResponse)
 
 
+async def test_get_control_cached(
+    politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client
+):
+    politikontroller_fixture.add_politikontroller(
+        APIEndpoint.SPEED_CONTROL, "hki_59786", params={"kontroll_id": 59786}
+    )
+    client = politikontroller_client()
+    client.control_cache = ControlCache()
+    first = await client.get_control(59786)
+    second = await client.get_control(59786)
+    assert first is second
+    assert client.control_cache.stats.hits == 1
+    assert client.control_cache.stats.misses == 1
+
+
+async def test_get_control_coalesced(
+    politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client
+):
+    politikontroller_fixture.add_politikontroller(
+        APIEndpoint.SPEED_CONTROL, "hki_59786", params={"kontroll_id": 59786}
+    )
+    async with politikontroller_client() as client:
+        results = await asyncio.gather(*[client.get_control(59786) for _ in range(5)])
+        assert all(r is results[0] for r in results)
+        assert client.connection_stats.created == 1
+        assert client._in_flight == {}
+
+
+async def test_get_control_coalesced_error(
+    politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client
+):
+    politikontroller_fixture.add(
+        response=Response(status=404),
+        route=CustomRoute(path_qs={"p": APIEndpoint.SPEED_CONTROL, "kontroll_id": 59786}),
+    )
+    async with politikontroller_client() as client:
+        results = await asyncio.gather(
+            *[client.get_control(59786) for _ in range(3)],
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, NotFoundError) for r in results)
+        assert all(r is results[0] for r in results)
+
+
+async def test_throttled_requests(
+    politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client
+):
+    for i in [59777, 59790]:
+        politikontroller_fixture.add_politikontroller(
+            APIEndpoint.SPEED_CONTROL, f"hki_{i}", params={"kontroll_id": i}
+        )
+    politikontroller_fixture.add(
+        response=Response(status=500),
+        route=CustomRoute(path_qs={"p": APIEndpoint.SPEED_CONTROL, "kontroll_id": 59786}),
+    )
+    async with politikontroller_client() as client:
+        client.rate_limiter = RateLimiter(rate=1000, burst=1)
+        client.concurrency_limiter = AdaptiveConcurrencyLimiter(initial=4)
+        with pytest.raises(PolitikontrollerConnectionError):
+            await client.get_control(59786)
+        assert client.concurrency_limiter.limit == 2
+        controls = await asyncio.gather(client.get_control(59777), client.get_control(59790))
+        assert [c.id for c in controls] == [59777, 59790]
+        assert client.concurrency_limiter.latency is not None
+        assert client.concurrency_limiter.in_flight == 0
+
+
+async def test_retry_request(politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client):
+    for response in [Response(status=500), Response(status=502)]:
+        politikontroller_fixture.add(
+            response=response,
+            route=CustomRoute(path_qs={"p": APIEndpoint.SPEED_CONTROL, "kontroll_id": 59777}),
+        )
+    politikontroller_fixture.add_politikontroller(
+        APIEndpoint.SPEED_CONTROL, "hki_59777", params={"kontroll_id": 59777}
+    )
+    async with politikontroller_client() as client:
+        client.retry_policy = RetryPolicy(max_attempts=3, backoff=0)
+        control = await client.get_control(59777)
+        assert control.id == 59777
+        assert client.retry_stats.attempts == 3
+        assert client.retry_stats.retries == 2
+        assert client.retry_stats.failures == 0
+
+
+async def test_circuit_breaker_fails_fast(
+    politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client
+):
+    for _ in range(2):
+        politikontroller_fixture.add(
+            response=Response(status=500),
+            route=CustomRoute(path_qs={"p": APIEndpoint.SPEED_CONTROL, "kontroll_id": 59777}),
+        )
+    async with politikontroller_client() as client:
+        client.circuit_breaker = CircuitBreaker(failure_threshold=2)
+        for _ in range(2):
+            with pytest.raises(PolitikontrollerConnectionError):
+                await client.get_control(59777)
+        with pytest.raises(CircuitOpenError):
+            await client.get_control(59777)
+        assert client.retry_stats.attempts == 2
+        assert client.retry_stats.rejected == 1
+
+
+async def test_watch(politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client):
+    politikontroller_fixture.add_politikontroller(APIEndpoint.GPS_CONTROLS, "gps_kontroller")
+    politikontroller_fixture.add_politikontroller(APIEndpoint.GPS_CONTROLS, "gps_kontroller")
+    politikontroller_fixture.add_politikontroller(APIEndpoint.GPS_CONTROLS, "hk_empty")
+    client = politikontroller_client()
+    changes = []
+    async with aclosing(client.watch(lat=0, lng=0, radius=100, interval=0)) as watch:
+        async for change in watch:
+            changes.append((change.type, change.control.id))
+            if len(changes) == 6:
+                break
+    added = [(ChangeType.ADDED, i) for i in [59777, 59786, 59790]]
+    removed = [(ChangeType.REMOVED, i) for i in [59777, 59786, 59790]]
+    assert changes == added + removed
+    assert client.session.closed
+
+
+async def test_sweep(politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client):
+    area = BoundingBox(63.0, 10.0, 63.2, 10.5)
+    circles = plan_sweep(area, 10)
+    for _ in circles:
+        politikontroller_fixture.add_politikontroller(APIEndpoint.GPS_CONTROLS, "gps_kontroller")
+    client = politikontroller_client()
+    report = await client.sweep(area, 10, merge_duplicates=False)
+    assert sorted(c.id for c in report.controls) == [59777, 59786, 59790]
+    assert report.calls == len(circles)
+    assert report.redundant_calls == len(circles) - 1
+    assert report.coverage == 1.0
+    assert client.session.closed
+
+
+async def test_sweep_subdivide(politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client):
+    area = BoundingBox(63.0, 10.0, 63.0, 10.0)
+    for _ in range(2):
+        politikontroller_fixture.add_politikontroller(APIEndpoint.GPS_CONTROLS, "gps_kontroller")
+    client = politikontroller_client()
+    report = await client.sweep(area, 2, truncation_limit=3)
+    # Only the center child of the subdivided circle overlaps the area
+    assert report.calls == 2
+    assert report.subdivided == 1
+    assert report.truncated == 1
+    assert report.coverage == 0.0
+
+
+async def test_control_store(politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client):
+    politikontroller_fixture.add_politikontroller(APIEndpoint.GPS_CONTROLS, "gps_kontroller")
+    politikontroller_fixture.add_politikontroller(
+        APIEndpoint.SPEED_CONTROL, "hki_59777", params={"kontroll_id": 59777}
+    )
+    client = politikontroller_client()
+    client.control_store = ControlStore()
+    await client.get_controls_in_radius(lat=0, lng=0, radius=100)
+    assert len(client.control_store) == 3
+    control = await client.get_control(59777)
+    stored = client.control_store.get(59777)
+    assert stored.control == control
+    assert stored.times_seen == 2
+
+
+@pytest.mark.parametrize(("chunk_size", "commits"), [(10_000, 1), (2, 2)])
+async def test_control_store_iter_commits(
+    politikontroller_fixture: PolitikontrollerMockServer,
+    politikontroller_client,
+    monkeypatch: pytest.MonkeyPatch,
+    chunk_size: int,
+    commits: int,
+):
+    """Streamed controls are stored in chunks, not one transaction per control."""
+    monkeypatch.setattr("politikontroller_py.client.CONTROL_STORE_CHUNK_SIZE", chunk_size)
+    politikontroller_fixture.add_politikontroller(APIEndpoint.GPS_CONTROLS, "gps_kontroller")
+    client = politikontroller_client()
+    client.control_store = ControlStore()
+    statements = []
+    client.control_store._db.set_trace_callback(statements.append)
+
+    result = [c async for c in client.iter_controls_in_radius(lat=0, lng=0, radius=100)]
+    assert len(result) == 3
+    assert len(client.control_store) == 3
+    assert statements.count("COMMIT") == commits
+
+
+async def test_get_controls_as_batch(
+    politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client
+):
+    for _ in range(2):
+        politikontroller_fixture.add_politikontroller(APIEndpoint.GPS_CONTROLS, "gps_kontroller_cluster")
+    politikontroller_fixture.add_politikontroller(APIEndpoint.SPEED_CONTROLS, "hk_empty")
+    client = politikontroller_client()
+    batch = await client.get_controls_in_radius(lat=0, lng=0, radius=100, as_batch=True)
+    assert isinstance(batch, ControlBatch)
+    assert list(batch.ids) == [1000]
+    assert [d.id for d in batch[0].to_model().duplicates] == [1001, 1000]
+    batch = await client.get_controls_in_radius(
+        lat=0, lng=0, radius=100, merge_duplicates=False, as_batch=True
+    )
+    assert list(batch.ids) == [1000, 1001]
+    batch = await client.get_controls(lat=0, lng=0, as_batch=True)
+    assert len(batch) == 0
+    assert batch.model is PoliceControlsResponse
+
+
+async def test_get_controls_lazy(
+    politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client
+):
+    for _ in range(2):
+        politikontroller_fixture.add_politikontroller(APIEndpoint.GPS_CONTROLS, "gps_kontroller_cluster")
+    politikontroller_fixture.add_politikontroller(APIEndpoint.SPEED_CONTROLS, "hk_empty")
+    client = politikontroller_client()
+    controls = await client.get_controls_in_radius(
+        lat=0, lng=0, radius=100, merge_duplicates=False, lazy=True
+    )
+    assert isinstance(controls, LazyControls)
+    assert controls.ids == [1000, 1001]
+    assert controls.materialized == 0
+    assert [c.id for c in controls] == [1000, 1001]
+    controls = await client.get_controls_in_radius(lat=0, lng=0, radius=100, lazy=True)
+    assert controls.ids == [1000]
+    assert [d.id for d in controls[0].duplicates] == [1001, 1000]
+    controls = await client.get_controls(lat=0, lng=0, lazy=True)
+    assert controls == []
+    with pytest.raises(ValueError, match="cannot be combined"):
+        await client.get_controls(lat=0, lng=0, as_batch=True, lazy=True)
+
+
+async def test_get_controls_lazy_observed(
+    politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client
+):
+    """With a cache and a store, only the rows of cached controls are built up front."""
+    politikontroller_fixture.add_politikontroller(
+        APIEndpoint.SPEED_CONTROL, "hki_1000", params={"kontroll_id": 1000}
+    )
+    politikontroller_fixture.add_politikontroller(APIEndpoint.GPS_CONTROLS, "gps_kontroller_cluster")
+    client = politikontroller_client()
+    client.control_cache = ControlCache()
+    client.control_store = ControlStore()
+    await client.get_control(1000)
+
+    controls = await client.get_controls_in_radius(
+        lat=0, lng=0, radius=100, merge_duplicates=False, lazy=True
+    )
+    assert controls.materialized == 1
+    assert client.control_store.get(1000).times_seen == 2
+    assert client.control_store.get(1001) is None
+    assert [c.id for c in controls] == [1000, 1001]
+    assert client.control_store.get(1001) is not None
+
+
+async def test_instrumentation(politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client):
+    politikontroller_fixture.add_politikontroller(APIEndpoint.GPS_CONTROLS, "gps_kontroller_cluster")
+    politikontroller_fixture.add_politikontroller(APIEndpoint.SPEED_CONTROLS, "hk_empty")
+    politikontroller_fixture.add_politikontroller(APIEndpoint.SPEED_CONTROL, "hki_59777")
+    politikontroller_fixture.add(
+        response=Response(text="ERR"),
+        route=CustomRoute(path_qs={"p": APIEndpoint.CHECK}),
+    )
+    events = []
+    client = politikontroller_client()
+    client.instrumentation = SimpleNamespace(on_request=events.append)
+    async with client:
+        await client.get_controls_in_radius(lat=0, lng=0, radius=100)
+        await client.get_controls(lat=0, lng=0)
+        await client.get_control(59777)
+        with pytest.raises(PolitikontrollerError):
+            await client.check()
+
+    assert [(e.endpoint, e.outcome) for e in events] == [
+        (APIEndpoint.GPS_CONTROLS, RequestOutcome.OK),
+        (APIEndpoint.SPEED_CONTROLS, RequestOutcome.NO_CONTENT),
+        (APIEndpoint.SPEED_CONTROL, RequestOutcome.OK),
+        (APIEndpoint.CHECK, RequestOutcome.ERROR),
+    ]
+    gps = events[0]
+    assert gps.rows == 2
+    assert gps.response_bytes > 0
+    assert gps.connect > 0
+    assert 0 < gps.ttfb < gps.total
+    assert all(getattr(gps, phase) > 0 for phase in ("body", "decrypt", "parse", "merge"))
+    assert events[1].rows == 0
+    assert events[2].rows == 1
+    assert events[2].connect == 0
+    assert events[3].error == "PolitikontrollerError"
+
+    metrics = RequestMetrics()
+    client.instrumentation = metrics
+    politikontroller_fixture.add_politikontroller(APIEndpoint.SPEED_CONTROL, "hki_59790")
+    await client.get_control(59790)
+    assert metrics.summary()["hki"]["count"] == 1
+
+
+async def test_get_controls_as_completed(
+    politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client
+):
+    politikontroller_fixture.add_politikontroller(APIEndpoint.LOGIN, "login")
+    for i in [59777, 59790]:
+        politikontroller_fixture.add_politikontroller(
+            APIEndpoint.SPEED_CONTROL, f"hki_{i}", params={"kontroll_id": i}
+        )
+    politikontroller_fixture.add(
+        response=Response(status=404),
+        route=CustomRoute(path_qs={"p": APIEndpoint.SPEED_CONTROL, "kontroll_id": 59786}),
+    )
+
+    async def ids():
+        for i in [59777, 59786, 59790]:
+            yield i
+
+    client = politikontroller_client()
+    results = dict([item async for item in client.get_controls_as_completed(ids(), max_concurrency=2)])
+
+    assert sorted(results) == [59777, 59786, 59790]
+    assert isinstance(results[59786], NotFoundError)
+    assert results[59777].id == 59777
+    assert results[59790].id == 59790
+
+
+async def test_get_controls_as_completed_open_stream(
+    politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client
+):
+    politikontroller_fixture.add_politikontroller(APIEndpoint.LOGIN, "login")
+    politikontroller_fixture.add_politikontroller(
+        APIEndpoint.SPEED_CONTROL, "hki_59777", params={"kontroll_id": 59777}
+    )
+
+    async def ids():
+        yield 59777
+        await asyncio.Event().wait()  # A stream that stays open
+
+    client = politikontroller_client()
+    async with aclosing(client.get_controls_as_completed(ids())) as results:
+        async for control_id, control in results:
+            assert control_id == control.id == 59777
+            break
+
+
 async def test_get_control_types(
     politikontroller_fixture: PolitikontrollerMockServer, politikontroller_client
 ):
@@ -0,0 +1,137 @@
+"""Tests for the on-disk login cache."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import logging
+import os
+import stat
+
+import pytest
+
+from politikontroller_py.auth_cache import AuthCache, default_cache_path
+from politikontroller_py.constants import AUTH_CACHE_FILE
+from politikontroller_py.models import Account, AuthStatus
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+PASSWORD = "securepassword123"
+
+
+def make_account(username: str = "4747474747") -> Account:
+    return Account(
+        username=username,
+        password=PASSWORD,
+        uid=1000,
+        auth_status=AuthStatus.LOGIN_OK,
+        status="SKIP_AUTHENTICATION",
+    )
+
+
+def test_auth_cache_roundtrip(tmp_path):
+    clock = FakeClock()
+    cache = AuthCache(tmp_path / "cache" / "session.json", ttl=60, clock=clock)
+    assert cache.load("4747474747", PASSWORD) is None
+
+    cache.save(make_account())
+    assert PASSWORD not in cache.path.read_text(encoding="utf-8")
+    account = cache.load("47 4747 4747", PASSWORD)
+    assert account == Account(
+        username="4747474747",
+        uid=1000,
+        auth_status=AuthStatus.LOGIN_OK,
+        status="SKIP_AUTHENTICATION",
+    )
+    assert account.phone_prefix == 47
+
+    clock.now += 60
+    assert cache.load("4747474747", PASSWORD) is None
+
+
+def test_auth_cache_password(tmp_path):
+    cache = AuthCache(tmp_path / "session.json")
+    cache.save(make_account())
+    assert cache.load("4747474747", "wrongpassword") is None
+    assert cache.load("4747474747", PASSWORD) is not None
+
+    # Accounts without a password are not cached, and entries without a hash are not used
+    cache.save(Account(username="4711111111", uid=1000))
+    entries = json.loads(cache.path.read_text(encoding="utf-8"))
+    del entries["4747474747"]["password_hash"]
+    cache.path.write_text(json.dumps(entries), encoding="utf-8")
+    assert cache.load("4747474747", PASSWORD) is None
+    assert cache.load("4711111111", "") is None
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_auth_cache_permissions(tmp_path):
+    cache = AuthCache(tmp_path / "cache" / "session.json")
+    cache.save(make_account())
+    assert stat.S_IMODE(cache.path.stat().st_mode) == 0o600
+    assert stat.S_IMODE(cache.path.parent.stat().st_mode) == 0o700
+
+    cache.path.chmod(0o644)
+    assert cache.load("4747474747", PASSWORD) is None
+    cache.save(make_account("4711111111"))
+    assert stat.S_IMODE(cache.path.stat().st_mode) == 0o600
+    assert cache.load("4711111111", PASSWORD) is not None
+
+
+def test_auth_cache_invalidate(tmp_path):
+    cache = AuthCache(tmp_path / "session.json")
+    cache.save(make_account())
+    cache.save(make_account("4711111111"))
+    cache.invalidate("4747474747")
+    cache.invalidate("4700000000")
+    assert cache.load("4747474747", PASSWORD) is None
+    assert cache.load("4711111111", PASSWORD) is not None
+
+
+def test_auth_cache_ignores_bad_files(tmp_path):
+    cache = AuthCache(tmp_path / "session.json")
+    cache.path.write_text("{not json", encoding="utf-8")
+    cache.path.chmod(0o600)
+    assert cache.load("4747474747", PASSWORD) is None
+    cache.path.write_text(json.dumps({"4747474747": "nope"}), encoding="utf-8")
+    assert cache.load("4747474747", PASSWORD) is None
+    cache.save(make_account())
+    assert cache.load("4747474747", PASSWORD) is not None
+
+
+def test_auth_cache_concurrent_saves(tmp_path):
+    usernames = [f"47{n:08d}" for n in range(20)]
+
+    def save(username: str):
+        AuthCache(tmp_path / "session.json").save(make_account(username))
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(save, usernames))
+    cache = AuthCache(tmp_path / "session.json")
+    assert all(cache.load(username, PASSWORD) is not None for username in usernames)
+    assert [p.name for p in tmp_path.iterdir() if p.name.endswith(".tmp")] == []
+
+
+def test_auth_cache_save_errors_are_ignored(tmp_path, caplog):
+    (tmp_path / "file").write_text("", encoding="utf-8")
+    cache = AuthCache(tmp_path / "file" / "session.json")
+    with caplog.at_level(logging.WARNING):
+        cache.save(make_account())
+        cache.invalidate("4747474747")
+    assert "Could not save the login" in caplog.text
+    assert cache.load("4747474747", PASSWORD) is None
+
+
+def test_default_cache_path(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_cache_path() == tmp_path / AUTH_CACHE_FILE
+    monkeypatch.delenv("XDG_CACHE_HOME")
+    monkeypatch.setenv("HOME", str(tmp_path))
+    assert default_cache_path() == tmp_path / ".cache" / AUTH_CACHE_FILE
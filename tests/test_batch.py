@@ -0,0 +1,121 @@
+"""Tests for columnar control batches."""
+
+from __future__ import annotations
+
+import copy
+import csv
+import io
+import json
+
+import pytest
+
+from politikontroller_py.models import ControlBatch
+from politikontroller_py.models.api import (
+    PoliceControlResponse,
+    PoliceControlsResponse,
+    PoliceControlTypeEnum,
+    PoliceGPSControlsResponse,
+)
+from politikontroller_py.output import get_writer
+from politikontroller_py.utils import aes_decrypt, merge_duplicate_controls, to_geo_json
+
+from .helpers import load_fixture
+
+
+@pytest.mark.parametrize(
+    ("cls", "fixture"),
+    [
+        (PoliceGPSControlsResponse, "gps_kontroller"),
+        (PoliceGPSControlsResponse, "gps_kontroller_cluster"),
+        (PoliceControlsResponse, "hk"),
+        (PoliceControlsResponse, "hk_cluster"),
+        (PoliceControlResponse, "hki_59777"),
+    ],
+)
+def test_batch_lossless(cls, fixture: str):
+    data = aes_decrypt(load_fixture(fixture))
+    controls = cls.from_response_data(data, True)
+    assert ControlBatch.from_response_data(cls, data).to_controls() == controls
+    assert ControlBatch.from_controls(controls).to_controls() == controls
+    merged = merge_duplicate_controls(controls)
+    assert ControlBatch.from_controls(merged).to_controls() == merged
+
+
+def test_batch_columns_and_views():
+    data = aes_decrypt(load_fixture("gps_kontroller"))
+    controls = PoliceGPSControlsResponse.from_response_data(data, True)
+    batch = ControlBatch.from_response_data(PoliceGPSControlsResponse, data)
+    assert len(batch) == 3
+    assert list(batch.ids) == [c.id for c in controls]
+    assert list(batch.lats) == [c.lat for c in controls]
+    assert batch.column("type") == [c.type for c in controls]
+    assert batch.column("timestamp") == [c.timestamp for c in controls]
+
+    row = batch[-1]
+    assert row.id == 59790
+    assert row.type == PoliceControlTypeEnum.SPEED_TRAP
+    assert row.point == controls[-1].point
+    assert row.to_model() == controls[-1]
+    assert [r.id for r in batch[:2]] == [59777, 59786]
+    with pytest.raises(IndexError):
+        batch[3]
+
+
+def test_batch_interns_strings():
+    row = aes_decrypt(load_fixture("gps_kontroller")).split("#")[0]
+    rows = [row.replace("59777|", f"{i}|", 1) for i in range(100)]
+    batch = ControlBatch.from_response_data(PoliceGPSControlsResponse, "#".join(rows))
+    assert batch.strings == ["Kristiansund", "Belte/mobil"]
+    assert batch.nbytes < sum(len(r) for r in rows) * 2
+
+
+def test_batch_defaults_and_invalid_rows():
+    rows = aes_decrypt(load_fixture("hki_59777")).split("|")
+    data = "|".join(rows[:8])
+    batch = ControlBatch.from_response_data(PoliceControlResponse, data)
+    assert batch.to_controls() == [PoliceControlResponse.from_response_data(data)]
+    assert batch[0].speed_limit is None
+
+    rows = aes_decrypt(load_fixture("gps_kontroller")).split("#")
+
+    rows[2] = rows[2].replace("Fartskontroll", "Fartskontroll?")
+    with pytest.raises(ValueError):  # noqa: PT011
+        ControlBatch.from_response_data(PoliceGPSControlsResponse, "#".join(rows))
+
+
+def test_batch_rows_as_models():
+    data = aes_decrypt(load_fixture("gps_kontroller"))
+    controls = PoliceGPSControlsResponse.from_response_data(data, True)
+    batch = ControlBatch.from_response_data(PoliceGPSControlsResponse, data)
+    row = batch[0]
+    assert row.title == controls[0].title
+    assert row.description_truncated == controls[0].description_truncated
+    assert row.duplicates == []
+    assert not hasattr(row, "last_seen")
+    assert getattr(row, "x", None) is None
+    with pytest.raises(AttributeError):
+        row.x  # noqa: B018
+    assert copy.copy(row) == row
+    assert copy.deepcopy(row) == row
+
+
+@pytest.mark.parametrize("output_format", ["json", "csv", "geojson"])
+def test_batch_rows_output(output_format: str):
+    data = aes_decrypt(load_fixture("hk"))
+    controls = PoliceControlsResponse.from_response_data(data, True)
+    batch = ControlBatch.from_response_data(PoliceControlsResponse, data)
+
+    def write(rows: list) -> str:
+        stream = io.BytesIO()
+        with get_writer(output_format, stream) as writer:
+            writer.write_many(rows)
+        return stream.getvalue().decode()
+
+    if output_format == "csv":
+        assert list(csv.reader(io.StringIO(write(list(batch))))) == list(
+            csv.reader(io.StringIO(write(controls)))
+        )
+    else:
+        assert json.loads(write(list(batch))) == json.loads(write(controls))
+    if output_format == "geojson":
+        assert json.loads(json.dumps(to_geo_json(list(batch)), default=str)) == json.loads(write(controls))
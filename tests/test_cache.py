@@ -0,0 +1,67 @@
+"""Tests for the control detail cache."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import timedelta
+
+import pytest
+
+from politikontroller_py.cache import ControlCache
+from politikontroller_py.models.api import PoliceControlResponse, PoliceGPSControlsResponse
+from politikontroller_py.utils import aes_decrypt
+
+from .helpers import load_fixture
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def control() -> PoliceControlResponse:
+    return PoliceControlResponse.from_response_data(aes_decrypt(load_fixture("hki_59777")))
+
+
+def test_cache_hit_miss_expire(control: PoliceControlResponse):
+    clock = FakeClock()
+    cache = ControlCache(ttl=10, clock=clock)
+    assert cache.get(control.id) is None
+    cache.set(control)
+    assert cache.get(control.id) is control
+    clock.now = 10
+    assert cache.get(control.id) is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 2
+    assert cache.stats.expirations == 1
+    assert cache.stats.hit_ratio == pytest.approx(1 / 3)
+
+
+def test_cache_lru_eviction(control: PoliceControlResponse):
+    cache = ControlCache(max_entries=2)
+    controls = [replace(control, id=i) for i in range(3)]
+    cache.set(controls[0])
+    cache.set(controls[1])
+    assert cache.get(0) is controls[0]
+    cache.set(controls[2])
+    assert len(cache) == 2
+    assert 0 in cache
+    assert 1 not in cache
+    assert cache.stats.evictions == 1
+
+
+def test_cache_invalidate_outdated(control: PoliceControlResponse):
+    cache = ControlCache()
+    cache.set(control)
+    listed = PoliceGPSControlsResponse.from_response_data(aes_decrypt(load_fixture("gps_kontroller")), True)
+    latest = max(control.timestamp, control.last_seen)
+    listed = [replace(c, timestamp=latest) for c in listed]
+    assert cache.invalidate_outdated(listed) == 0
+    listed = [replace(c, timestamp=latest + timedelta(minutes=1)) for c in listed]
+    assert cache.invalidate_outdated(listed) == 1
+    assert control.id not in cache
+    assert cache.stats.invalidations == 1
@@ -1,16 +1,25 @@
 import contextlib
+import csv
+import io
+import json
 import subprocess
 import sys
+import time
 
+from aresponses import Response
 import pytest
 
 import politikontroller_py.cli
 from politikontroller_py.models.api import APIEndpoint
 
-from .helpers import PolitikontrollerMockServer
+from .helpers import CustomRoute, PolitikontrollerMockServer
 
 ARGS_USER_PW = ["-u", "4747474747", "-p", "securepassword123"]
 FIXTURE_CLI_HELP = "Connect to politikontroller.no"
+# Only needed once a command talks to the API
+DEFERRED_IMPORTS = ("aiohttp", "mashumaro", "orjson", "Crypto", "geojson", "numpy", "tabulate")
+HELP_MAX_SECONDS = 2.0
+READ_MAX_SECONDS = 10.0
 
 
 def test_run_entrypoint():
@@ -31,6 +40,26 @@ def test_run_module():
     assert result.returncode == 0
 
 
+def test_help_cold_start():
+    """Test that `--help` does not load the client, and starts quickly."""
+    script = (
+        "import runpy, sys\n"
+        "sys.argv = ['politikontroller', '--help']\n"
+        "try:\n"
+        "    runpy.run_module('politikontroller_py.cli', run_name='__main__')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print(sorted(m for m in {DEFERRED_IMPORTS!r} if m in sys.modules))\n"
+    )
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+
+    assert FIXTURE_CLI_HELP in result.stdout
+    assert result.stdout.rstrip().endswith("[]"), result.stdout
+    assert elapsed < HELP_MAX_SECONDS
+
+
 async def test_check(capsys: pytest.CaptureFixture, politikontroller_fixture: PolitikontrollerMockServer):
     """Test the status command text output filtered by VIN."""
 
@@ -43,3 +72,141 @@ async def test_check(capsys: pytest.CaptureFixture, politikontroller_fixture: Po
     result = capsys.readouterr()
 
     assert "YES" in result.out
+
+
+async def test_cache_login(
+    capsys: pytest.CaptureFixture,
+    politikontroller_fixture: PolitikontrollerMockServer,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path,
+):
+    """Test that a cached login is reused by the next run."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    politikontroller_fixture.add_politikontroller(APIEndpoint.LOGIN, "login")
+    for _ in range(2):
+        politikontroller_fixture.add_politikontroller(APIEndpoint.CHECK, "check")
+
+    for _ in range(2):
+        sys.argv = ["politikontroller", *ARGS_USER_PW, "--cache-login", "check"]
+        with contextlib.suppress(SystemExit):
+            await politikontroller_py.cli.amain()
+        assert "YES" in capsys.readouterr().out
+
+    assert (tmp_path / "politikontroller" / "session.json").exists()
+
+
+async def test_get_control_many(
+    capsys: pytest.CaptureFixture,
+    politikontroller_fixture: PolitikontrollerMockServer,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that ids from stdin are printed as one JSON line each, and failures on stderr."""
+    politikontroller_fixture.add_politikontroller(APIEndpoint.LOGIN, "login")
+    for i in [59777, 59790]:
+        politikontroller_fixture.add_politikontroller(
+            APIEndpoint.SPEED_CONTROL, f"hki_{i}", params={"kontroll_id": i}
+        )
+    politikontroller_fixture.add(
+        response=Response(status=404),
+        route=CustomRoute(path_qs={"p": APIEndpoint.SPEED_CONTROL, "kontroll_id": 59786}),
+    )
+    monkeypatch.setattr(sys, "stdin", io.StringIO("59777\n\n59786\n59790\n"))
+
+    sys.argv = ["politikontroller", *ARGS_USER_PW, "get-control"]
+    with pytest.raises(SystemExit) as exit_info:
+        await politikontroller_py.cli.amain()
+    result = capsys.readouterr()
+
+    assert exit_info.value.code == 1
+    lines = result.out.splitlines()
+    assert sorted(json.loads(line)["id"] for line in lines) == [59777, 59790]
+    assert "59786: NotFoundError" in result.err
+
+
+async def test_get_controls_radius_failures(
+    capsys: pytest.CaptureFixture,
+    politikontroller_fixture: PolitikontrollerMockServer,
+):
+    """Test that controls whose details fail are reported on stderr, and fail the command."""
+    politikontroller_fixture.add_politikontroller(APIEndpoint.LOGIN, "login")
+    politikontroller_fixture.add_politikontroller(APIEndpoint.GPS_CONTROLS, "gps_kontroller")
+    for i in [59777, 59790]:
+        politikontroller_fixture.add_politikontroller(
+            APIEndpoint.SPEED_CONTROL, f"hki_{i}", params={"kontroll_id": i}
+        )
+    politikontroller_fixture.add(
+        response=Response(status=404),
+        route=CustomRoute(path_qs={"p": APIEndpoint.SPEED_CONTROL, "kontroll_id": 59786}),
+    )
+
+    sys.argv = ["politikontroller", *ARGS_USER_PW, "get-controls-radius"]
+    sys.argv += ["--lat", "63", "--lng", "11", "--radius", "100", "--format", "ndjson"]
+    with pytest.raises(SystemExit) as exit_info:
+        await politikontroller_py.cli.amain()
+    result = capsys.readouterr()
+
+    assert exit_info.value.code == 1
+    assert sorted(json.loads(line)["id"] for line in result.out.splitlines()) == [59777, 59790]
+    assert "59786: NotFoundError" in result.err
+
+
+def test_read_control_ids_stop_early():
+    """Test that stopping early does not wait for the next line of an open stdin."""
+    script = (
+        "import asyncio, sys, anyio\n"
+        "from politikontroller_py.cli import read_control_ids\n"
+        "async def main():\n"
+        "    ids = read_control_ids(sys.stdin)\n"
+        "    print(await ids.__anext__())\n"
+        "    # Read ahead like Client.get_controls_as_completed, then stop\n"
+        "    task = asyncio.ensure_future(ids.__anext__())\n"
+        "    await asyncio.sleep(0.1)\n"
+        "    task.cancel()\n"
+        "    await asyncio.gather(task, return_exceptions=True)\n"
+        "anyio.run(main)\n"
+    )
+    with subprocess.Popen(
+        [sys.executable, "-c", script], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+    ) as proc:
+        proc.stdin.write("59777\n")
+        proc.stdin.flush()
+        # stdin stays open while waiting
+        try:
+            proc.wait(timeout=READ_MAX_SECONDS)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            pytest.fail("Waited for more input after stopping")
+        out = proc.stdout.read()
+
+    assert out.split() == ["59777"]
+    assert proc.returncode == 0
+
+
+@pytest.mark.parametrize("output_format", ["json", "ndjson", "csv", "geojson"])
+async def test_get_controls_format(
+    capsys: pytest.CaptureFixture,
+    politikontroller_fixture: PolitikontrollerMockServer,
+    output_format: str,
+):
+    """Test the machine-readable output formats."""
+    politikontroller_fixture.add_politikontroller(APIEndpoint.LOGIN, "login")
+    politikontroller_fixture.add_politikontroller(APIEndpoint.SPEED_CONTROLS, "hk")
+
+    sys.argv = ["politikontroller", *ARGS_USER_PW, "get-controls", "--lat", "63", "--lng", "11"]
+    sys.argv += ["--format", output_format]
+    with contextlib.suppress(SystemExit):
+        await politikontroller_py.cli.amain()
+    out = capsys.readouterr().out
+
+    if output_format == "json":
+        rows = json.loads(out)
+    elif output_format == "ndjson":
+        rows = [json.loads(line) for line in out.splitlines()]
+    elif output_format == "csv":
+        rows = list(csv.DictReader(io.StringIO(out)))
+    else:
+        collection = json.loads(out)
+        assert collection["type"] == "FeatureCollection"
+        rows = [f["properties"] for f in collection["features"]]
+    assert len(rows) > 1
+    assert all(row["description"] for row in rows)
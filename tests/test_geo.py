@@ -0,0 +1,48 @@
+"""Tests for batch distance calculations."""
+
+from __future__ import annotations
+
+import pytest
+
+from politikontroller_py import geo
+from politikontroller_py.models.api import PoliceGPSControlsResponse
+from politikontroller_py.utils import aes_decrypt, calculate_distance
+
+from .helpers import load_fixture
+
+USE_NUMPY = [False, pytest.param(True, marks=pytest.mark.skipif(not geo.HAS_NUMPY, reason="no numpy"))]
+
+
+@pytest.fixture
+def controls() -> list[PoliceGPSControlsResponse]:
+    return PoliceGPSControlsResponse.from_response_data(aes_decrypt(load_fixture("gps_kontroller")), True)
+
+
+@pytest.mark.parametrize("use_numpy", USE_NUMPY)
+def test_distance_matrix(controls: list[PoliceGPSControlsResponse], use_numpy: bool):
+    lats, lngs = geo.coordinate_arrays(controls)
+    matrix = geo.distance_matrix(lats, lngs, use_numpy=use_numpy)
+    for i, c1 in enumerate(controls):
+        for j, c2 in enumerate(controls):
+            assert matrix[i][j] == pytest.approx(calculate_distance(c1.point, c2.point))
+
+
+@pytest.mark.parametrize("use_numpy", USE_NUMPY)
+def test_distances_from(controls: list[PoliceGPSControlsResponse], use_numpy: bool):
+    lats, lngs = geo.coordinate_arrays(controls)
+    origin = controls[0].point
+    distances = geo.distances_from(origin.lat, origin.lng, lats, lngs, use_numpy=use_numpy)
+    assert list(distances) == pytest.approx([calculate_distance(origin, c.point) for c in controls])
+
+
+def test_controls_in_radius(controls: list[PoliceGPSControlsResponse]):
+    # Kristiansund to Elverum is ~313 km, Nordre Follo is ~410 km
+    result = geo.controls_in_radius(controls, controls[0].lat, controls[0].lng, 350)
+    assert [c.id for c in result] == [59777, 59790]
+
+
+def test_nearest_control(controls: list[PoliceGPSControlsResponse]):
+    control, distance = geo.nearest_control(controls, 59.7, 10.8)
+    assert control.id == 59786
+    assert distance < 5
+    assert geo.nearest_control([], 59.7, 10.8) is None
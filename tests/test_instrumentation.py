@@ -0,0 +1,86 @@
+"""Tests for request events and their aggregation."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from politikontroller_py.instrumentation import (
+    Histogram,
+    RequestEvent,
+    RequestMetrics,
+    RequestOutcome,
+    current_event,
+    record,
+    timed,
+)
+from politikontroller_py.models.api import APIEndpoint
+
+
+def test_histogram_percentiles():
+    rng = random.Random(0)
+    values = sorted(rng.uniform(0.001, 2.0) for _ in range(10_000))
+    histogram = Histogram(precision=0.05)
+    for value in values:
+        histogram.add(value)
+    assert histogram.count == len(values)
+    assert histogram.mean == pytest.approx(sum(values) / len(values))
+    for q in (1, 50, 90, 99):
+        exact = values[int(q / 100 * len(values)) - 1]
+        assert histogram.percentile(q) == pytest.approx(exact, rel=0.05)
+    assert histogram.percentile(100) == histogram.max == values[-1]
+    assert histogram.percentile(0) == histogram.min == values[0]
+    assert Histogram().percentile(50) == 0.0
+
+
+def test_histogram_tiny_values():
+    histogram = Histogram()
+    histogram.add(0.0)
+    histogram.add(1e-9)
+    assert histogram.percentile(50) <= histogram.min_value
+    assert histogram.percentile(100) == 1e-9
+
+
+def test_record_and_timed():
+    record("parse", 1.0)
+    assert current_event() is None
+    event = RequestEvent(APIEndpoint.CHECK)
+    with event.activate():
+        assert current_event() is event
+        record("rows", 3)
+        record("rows", 2)
+        with timed("merge"):
+            pass
+    assert current_event() is None
+    assert event.rows == 5
+    assert event.merge > 0
+
+
+def test_request_metrics():
+    metrics = RequestMetrics()
+    for i in range(1, 101):
+        metrics.on_request(
+            RequestEvent(
+                APIEndpoint.SPEED_CONTROLS,
+                total=i / 100,
+                rows=10,
+                retries=i % 2,
+                outcome=RequestOutcome.OK,
+            )
+        )
+    metrics.on_request(
+        RequestEvent(APIEndpoint.CHECK, total=5.0, outcome=RequestOutcome.ERROR, error="NoAccessError")
+    )
+    assert metrics.percentile(50, endpoint="hk") == pytest.approx(0.5, rel=0.05)
+    assert metrics.percentile(100) == 5.0
+
+    summary = metrics.summary()
+    assert summary["hk"]["count"] == 100
+    assert summary["hk"]["rows"] == 1000
+    assert summary["hk"]["retries"] == 50
+    assert summary["hk"]["outcomes"] == {"ok": 100}
+    assert summary["check"]["outcomes"] == {"error": 1}
+    assert summary["all"]["count"] == 101
+    assert summary["all"]["phases"]["total"]["max"] == 5.0
+    assert summary["hk"]["phases"]["total"]["p99"] == pytest.approx(0.99, rel=0.05)
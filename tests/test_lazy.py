@@ -0,0 +1,87 @@
+"""Tests for lazily deserialized list results."""
+
+from __future__ import annotations
+
+import pytest
+
+from politikontroller_py.models import LazyControls
+from politikontroller_py.models.api import (
+    PoliceControlsResponse,
+    PoliceControlTypeEnum,
+    PoliceGPSControlsResponse,
+)
+from politikontroller_py.utils import aes_decrypt, merge_duplicate_controls
+
+from .helpers import load_fixture
+
+
+@pytest.mark.parametrize(
+    ("cls", "fixture"),
+    [
+        (PoliceGPSControlsResponse, "gps_kontroller"),
+        (PoliceGPSControlsResponse, "gps_kontroller_cluster"),
+        (PoliceControlsResponse, "hk"),
+        (PoliceControlsResponse, "hk_cluster"),
+    ],
+)
+def test_lazy_matches_models(cls, fixture: str):
+    data = aes_decrypt(load_fixture(fixture))
+    controls = cls.from_response_data(data, True)
+    lazy = LazyControls(cls, data)
+    assert lazy == controls
+    assert lazy.to_list() == controls
+    assert lazy.merge_duplicates() == merge_duplicate_controls(controls)
+
+
+def test_lazy_columns_do_not_build_models():
+    data = aes_decrypt(load_fixture("gps_kontroller"))
+    controls = PoliceGPSControlsResponse.from_response_data(data, True)
+    lazy = LazyControls(PoliceGPSControlsResponse, data)
+    assert len(lazy) == 3
+    assert lazy.ids == [c.id for c in controls]
+    assert lazy.lats == [c.lat for c in controls]
+    assert lazy.lngs == [c.lng for c in controls]
+    assert lazy.types == [c.type for c in controls]
+    assert lazy.materialized == 0
+
+    assert lazy[-1] == controls[-1]
+    assert lazy[-1] is lazy[2]
+    assert lazy.materialized == 1
+    assert lazy[:2] == controls[:2]
+    assert controls[0] in lazy
+    assert bool(lazy)
+    with pytest.raises(IndexError):
+        lazy[3]
+
+
+def test_lazy_merge_builds_merged_controls_only():
+    data = aes_decrypt(load_fixture("gps_kontroller_cluster"))
+    lazy = LazyControls(PoliceGPSControlsResponse, data)
+    merged = lazy.merge_duplicates()
+    assert merged.ids == [1000]
+    assert merged.materialized == 1
+    assert [d.id for d in merged[0].duplicates] == [1001, 1000]
+
+
+def test_lazy_on_build():
+    data = aes_decrypt(load_fixture("gps_kontroller"))
+    built = []
+    lazy = LazyControls(PoliceGPSControlsResponse, data, on_build=built.append)
+    assert lazy.ids == [59777, 59786, 59790]
+    assert built == []
+    assert lazy.take([2, 0]) == [lazy[2], lazy[0]]
+    assert [[c.id for c in chunk] for chunk in built] == [[59790, 59777]]
+    assert list(lazy) == lazy.to_list()
+    assert [[c.id for c in chunk] for chunk in built] == [[59790, 59777], [59786]]
+
+
+def test_lazy_invalid_rows():
+    rows = aes_decrypt(load_fixture("gps_kontroller")).split("#")
+    rows[1] = rows[1].split("|", 1)[0]
+    rows[2] = rows[2].replace("Fartskontroll", "Fartskontroll?")
+    lazy = LazyControls(PoliceGPSControlsResponse, "#".join(rows))
+    assert lazy.ids == [59777, 59786, 59790]
+    assert lazy[0].type == PoliceControlTypeEnum.BEHAVIOUR
+    with pytest.raises(ValueError):  # noqa: PT011
+        lazy[2]
+    assert LazyControls(PoliceGPSControlsResponse) == []
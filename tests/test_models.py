@@ -0,0 +1,99 @@
+"""Tests for response models."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from mashumaro.exceptions import InvalidFieldValue
+import pytest
+
+from politikontroller_py.models.account import (
+    AuthenticationResponse,
+    AuthenticationResponseBlocked,
+    AuthenticationResponseError,
+    AuthenticationResponseNotActivated,
+    AuthenticationResponseOK,
+)
+from politikontroller_py.models.api import (
+    PoliceControlPoint,
+    PoliceControlResponse,
+    PoliceControlsResponse,
+    PoliceGPSControlsResponse,
+    UserMap,
+)
+from politikontroller_py.models.common import PolitiKontrollerResponse
+from politikontroller_py.models.decoder import get_row_decoder
+from politikontroller_py.utils import aes_decrypt, map_response_data
+
+from .helpers import load_fixture
+
+
+@dataclass
+class HookedResponse(PolitiKontrollerResponse):
+    id: int
+    title: str
+
+    attr_map = ["id", "title"]
+
+    @classmethod
+    def __pre_deserialize__(cls, d: dict[Any, Any]) -> dict[Any, Any]:
+        return {**d, "title": d["title"].upper()}
+
+
+@dataclass
+class NestedResponse(PolitiKontrollerResponse):
+    id: int
+    point: PoliceControlPoint
+
+    attr_map = ["id", "point"]
+
+
+@pytest.mark.parametrize(
+    ("cls", "fixture"),
+    [
+        (PoliceControlResponse, "hki_59777"),
+        (PoliceControlResponse, "hki_1000"),
+        (PoliceControlsResponse, "hk"),
+        (PoliceControlsResponse, "hk_cluster"),
+        (PoliceGPSControlsResponse, "gps_kontroller"),
+        (AuthenticationResponseOK, "login"),
+        (AuthenticationResponseBlocked, "login_blocked"),
+        (AuthenticationResponseError, "login_error"),
+        (AuthenticationResponseNotActivated, "login_not_activated"),
+    ],
+)
+def test_row_decoder_matches_from_dict(cls, fixture: str):
+    data = aes_decrypt(load_fixture(fixture))
+    expected = [cls.from_dict(d) for d in map_response_data(data, cls.attr_map, multiple=True)]
+    assert get_row_decoder(cls) is not None
+    assert [cls.from_response_row(row) for row in data.split("#")] == expected
+    assert list(cls.iter_from_response_data(data)) == expected
+
+
+def test_row_decoder_user_map():
+    data = "1|x|Min kart|no#2|x|Hytta|se"
+    assert UserMap.from_response_data(data, multiple=True) == [
+        UserMap(id=1, title="Min kart", country="no"),
+        UserMap(id=2, title="Hytta", country="se"),
+    ]
+
+
+@pytest.mark.parametrize("fixture", ["login", "login_blocked", "login_error", "login_not_activated"])
+def test_authentication_response_subtypes(fixture: str):
+    data = aes_decrypt(load_fixture(fixture))
+    result = AuthenticationResponse.from_response_data(data)
+    assert result == type(result).from_dict(map_response_data(data, type(result).attr_map))
+    assert get_row_decoder(AuthenticationResponse) is None
+
+
+def test_row_decoder_unsupported():
+    # A hook without row_preprocessors, and a nested dataclass that is not derived
+    assert get_row_decoder(HookedResponse) is None
+    assert get_row_decoder(NestedResponse) is None
+    assert HookedResponse.from_response_row("1|Min kart") == HookedResponse(id=1, title="MIN KART")
+
+
+def test_row_decoder_invalid_value():
+    with pytest.raises(InvalidFieldValue):
+        PoliceGPSControlsResponse.from_response_data("x|A|B|Teknisk|10:00|C|63.0|10.0")
@@ -0,0 +1,169 @@
+"""Tests for the streaming output writers."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from politikontroller_py.models.api import PoliceControlPoint, PoliceControlsResponse, UserMap
+from politikontroller_py.output import (
+    OutputFormat,
+    adump_geo_json,
+    dump_geo_json,
+    encode_feature,
+    get_writer,
+    iter_geo_json,
+)
+from politikontroller_py.utils import aes_decrypt, to_geo_json
+
+from .helpers import load_fixture
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+@pytest.fixture
+def controls() -> list[PoliceControlsResponse]:
+    return PoliceControlsResponse.from_response_data(aes_decrypt(load_fixture("hk")), multiple=True)
+
+
+def write_to(stream: io.BytesIO, output_format: str, rows: Iterable):
+    with get_writer(output_format, stream) as writer:
+        writer.write_many(rows)
+
+
+def write(output_format: str, rows: list) -> str:
+    stream = io.BytesIO()
+    write_to(stream, output_format, rows)
+    return stream.getvalue().decode()
+
+
+def test_json(controls):
+    assert json.loads(write("json", controls)) == [json.loads(c.to_json()) for c in controls]
+
+
+def test_ndjson(controls):
+    lines = write(OutputFormat.NDJSON, controls).splitlines()
+    assert [json.loads(line) for line in lines] == [json.loads(c.to_json()) for c in controls]
+
+
+def test_csv(controls):
+    rows = list(csv.DictReader(io.StringIO(write("csv", controls))))
+    assert [int(r["id"]) for r in rows] == [c.id for c in controls]
+    assert json.loads(rows[0]["point"]) == {"lat": controls[0].lat, "lng": controls[0].lng, "type": "Point"}
+
+
+def test_csv_dicts():
+    out = write("csv", [{"a": 1, "b": [1, 2]}, {"a": 2}])
+    assert out.splitlines() == ["a,b", '1,"[1,2]"', "2,"]
+
+
+def test_geojson_matches_to_geo_json(controls):
+    expected = json.loads(json.dumps(to_geo_json(controls), default=str))
+    assert json.loads(write("geojson", controls)) == expected
+
+
+def test_geojson_needs_geo_interface():
+    with pytest.raises(TypeError):
+        write("geojson", [UserMap(id=1, title="Min kart", country="no")])
+
+
+@pytest.mark.parametrize(
+    ("output_format", "expected"),
+    [
+        ("json", []),
+        ("ndjson", None),
+        ("geojson", {"type": "FeatureCollection", "features": []}),
+    ],
+)
+def test_empty(output_format: str, expected):
+    out = write(output_format, [])
+    assert (json.loads(out) if out else None) == expected
+
+
+@pytest.mark.parametrize("output_format", ["json", "geojson"])
+def test_no_footer_on_error(controls, output_format: str):
+    def rows():
+        yield from controls[:2]
+        raise RuntimeError
+
+    stream = io.BytesIO()
+    with pytest.raises(RuntimeError):
+        write_to(stream, output_format, rows())
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(stream.getvalue())
+
+
+def test_flush_per_row(controls):
+    class Stream(io.BytesIO):
+        flushes = 0
+
+        def flush(self):
+            self.flushes += 1
+
+    stream = Stream()
+    writer = get_writer("ndjson", stream, flush=True)
+    writer.write_many(controls[:2])
+    assert stream.flushes == 2
+    assert writer.rows == 2
+
+
+@pytest.mark.parametrize("text", [False, True])
+def test_dump_geo_json(controls, text: bool):
+    fp = io.StringIO() if text else io.BytesIO()
+    dump_geo_json(controls, fp, chunk_size=256)
+    out = fp.getvalue()
+    assert json.loads(out) == json.loads(json.dumps(to_geo_json(controls), default=str))
+
+
+def test_iter_geo_json_chunks(controls):
+    chunks = list(iter_geo_json(controls, chunk_size=256))
+    assert len(chunks) > 1
+    assert all(len(c) < 256 + 1024 for c in chunks)
+    assert len(json.loads(b"".join(chunks))["features"]) == len(controls)
+    assert json.loads(b"".join(iter_geo_json([]))) == {"type": "FeatureCollection", "features": []}
+
+
+def test_encode_feature_other_geo_objects():
+    point = PoliceControlPoint(63.0, 11.0)
+    assert json.loads(encode_feature(point)) == {"type": "Point", "coordinates": [63.0, 11.0]}
+
+
+async def test_adump_geo_json(controls):
+    class Writer:
+        """Like `asyncio.StreamWriter`."""
+
+        def __init__(self):
+            self.data = b""
+            self.drained = 0
+
+        def write(self, data: bytes):
+            self.data += data
+
+        async def drain(self):
+            self.drained += 1
+
+    class AsyncFile:
+        """Like an aiofiles file."""
+
+        def __init__(self):
+            self.data = b""
+
+        async def write(self, data: bytes):
+            self.data += data
+
+    async def stream():
+        for c in controls:
+            yield c
+
+    writer, file = Writer(), AsyncFile()
+    await adump_geo_json(stream(), writer, chunk_size=256)
+    await adump_geo_json(controls, file)
+
+    expected = json.loads(json.dumps(to_geo_json(controls), default=str))
+    assert json.loads(writer.data) == json.loads(file.data) == expected
+    assert writer.drained > 1
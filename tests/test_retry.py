@@ -0,0 +1,66 @@
+"""Tests for retries and the circuit breaker."""
+
+from __future__ import annotations
+
+import pytest
+
+from politikontroller_py.exceptions import (
+    CircuitOpenError,
+    NotFoundError,
+    PolitikontrollerConnectionError,
+    PolitikontrollerTimeoutError,
+)
+from politikontroller_py.retry import CircuitBreaker, CircuitState, RetryPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_retry_policy_should_retry():
+    policy = RetryPolicy(max_attempts=3)
+    assert policy.should_retry(PolitikontrollerTimeoutError(), 1)
+    assert policy.should_retry(PolitikontrollerConnectionError(), 2)
+    assert not policy.should_retry(PolitikontrollerConnectionError(), 3)
+    assert not policy.should_retry(NotFoundError(), 1)
+    assert not policy.should_retry(CircuitOpenError(), 1)
+
+
+def test_retry_policy_delay():
+    policy = RetryPolicy(backoff=1, max_backoff=5, jitter=0)
+    assert [policy.delay(n) for n in range(1, 5)] == [1, 2, 4, 5]
+    policy = RetryPolicy(backoff=1, max_backoff=5, jitter=0.5)
+    assert all(1 <= policy.delay(2) <= 2 for _ in range(100))
+
+
+def test_circuit_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.before_request()
+    breaker.on_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.on_failure()
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    clock.now = 10
+    assert breaker.state == CircuitState.HALF_OPEN
+    breaker.before_request()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.on_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.times_opened == 2
+
+    clock.now = 20
+    breaker.before_request()
+    breaker.on_cancel()
+    breaker.before_request()
+    breaker.on_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.failures == 0
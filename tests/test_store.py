@@ -0,0 +1,80 @@
+"""Tests for the persistent control store."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+import pytest
+
+from politikontroller_py.models.api import PoliceControlResponse, PoliceGPSControlsResponse
+from politikontroller_py.store import ControlStore
+from politikontroller_py.utils import aes_decrypt
+
+from .helpers import load_fixture
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def listed() -> list[PoliceGPSControlsResponse]:
+    return PoliceGPSControlsResponse.from_response_data(aes_decrypt(load_fixture("gps_kontroller")), True)
+
+
+def test_store_upsert_history(tmp_path: Path, listed: list[PoliceGPSControlsResponse]):
+    clock = FakeClock()
+    with ControlStore(tmp_path / "controls.db", clock=clock) as store:
+        assert store.upsert_many(listed) == 3
+        clock.now += 60
+        store.upsert(listed[0])
+
+    with ControlStore(tmp_path / "controls.db") as store:
+        assert len(store) == 3
+        stored = store.get(listed[0].id)
+        assert stored.control == listed[0]
+        assert stored.times_seen == 2
+        assert stored.last_seen_at - stored.first_seen_at == timedelta(seconds=60)
+        assert store.get(1) is None
+
+
+def test_store_keeps_details(listed: list[PoliceGPSControlsResponse]):
+    details = PoliceControlResponse.from_response_data(aes_decrypt(load_fixture("hki_59777")))
+    store = ControlStore()
+    store.upsert(details)
+    older = replace(listed[0], timestamp=details.timestamp - timedelta(minutes=1))
+    store.upsert(older)
+    assert store.get(details.id).control == details
+
+    newer = replace(listed[0], timestamp=max(details.timestamp, details.last_seen) + timedelta(minutes=1))
+    store.upsert(newer)
+    assert store.get(details.id).control == newer
+
+
+def test_store_spatial_queries(listed: list[PoliceGPSControlsResponse]):
+    store = ControlStore()
+    store.upsert_many(listed)
+    assert [c.control.id for c in store.in_bbox(59.0, 7.0, 64.0, 12.0)] == [59777, 59786, 59790]
+    assert [c.control.id for c in store.in_bbox(60.0, 7.0, 64.0, 12.0)] == [59777, 59790]
+    assert [c.control.id for c in store.in_radius(59.7154408899441, 10.8386109300315, 1)] == [59786]
+    assert [c.control.id for c in store.in_radius(60, 10, 200)] == [59786, 59790]
+
+
+def test_store_time_window(listed: list[PoliceGPSControlsResponse]):
+    store = ControlStore()
+    now = datetime(2024, 12, 6, 12, 0, tzinfo=timezone.utc)
+    controls = [replace(c, timestamp=now - timedelta(hours=i)) for i, c in enumerate(listed)]
+    store.upsert_many(controls)
+    window = store.in_time_window(since=now - timedelta(hours=1, minutes=30))
+    assert [c.control.id for c in window] == [59777, 59786]
+    window = store.in_bbox(59.0, 7.0, 64.0, 12.0, until=now - timedelta(minutes=30))
+    assert [c.control.id for c in window] == [59786, 59790]
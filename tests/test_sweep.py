@@ -0,0 +1,58 @@
+"""Tests for the sweep planner."""
+
+from __future__ import annotations
+
+import pytest
+
+from politikontroller_py.sweep import (
+    BoundingBox,
+    SweepCircle,
+    circle_intersects,
+    coverage,
+    plan_sweep,
+    point_in_polygon,
+)
+
+POLYGON = [(58.0, 5.0), (62.0, 4.5), (71.0, 25.0), (70.0, 31.0), (58.0, 12.0)]
+
+
+@pytest.mark.parametrize(
+    ("area", "radius"),
+    [
+        (BoundingBox(58.0, 4.5, 71.2, 31.0), 50),
+        (BoundingBox(63.0, 10.0, 63.5, 11.0), 5),
+        (BoundingBox(-1.0, 10.0, 1.0, 11.0), 20),
+        (BoundingBox(60.0, 10.0, 60.0, 10.5), 3),
+        (POLYGON, 50),
+    ],
+)
+def test_plan_sweep_covers_area(area, radius: int):
+    circles = plan_sweep(area, radius)
+    assert all(c.radius == radius for c in circles)
+    assert all(circle_intersects(c, area) for c in circles)
+    assert coverage(area, circles, samples=64) == 1.0
+
+
+def test_plan_sweep_near_minimal():
+    area = BoundingBox(63.0, 8.0, 65.0, 14.0)
+    circles = plan_sweep(area, 10)
+    narrow_bands = plan_sweep(area, 10, band_rows=2)
+    assert len(circles) < len(narrow_bands)
+    assert coverage(area, circles, samples=64) == 1.0
+
+
+def test_sweep_circle_children():
+    circle = SweepCircle(63.0, 10.0, 10)
+    children = circle.children()
+    assert len(children) == 7
+    assert all(c.radius == 5 and c.depth == 1 for c in children)
+    area = BoundingBox(62.95, 9.9, 63.05, 10.1)
+    assert coverage(area, [circle]) == 1.0
+    assert coverage(area, children) == 1.0
+
+
+def test_point_in_polygon():
+    assert point_in_polygon(63.0, 10.0, POLYGON)
+    assert not point_in_polygon(58.5, 25.0, POLYGON)
+    assert not circle_intersects(SweepCircle(58.5, 25.0, 10), POLYGON)
+    assert circle_intersects(SweepCircle(58.5, 25.0, 1000), POLYGON)
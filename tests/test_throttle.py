@@ -0,0 +1,86 @@
+"""Tests for request pacing."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from politikontroller_py.models.api import APIEndpoint
+from politikontroller_py.throttle import AdaptiveConcurrencyLimiter, RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+async def test_token_bucket_burst_then_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=3, clock=clock, sleep=clock.sleep)
+    for _ in range(3):
+        assert await bucket.acquire() == 0
+    assert not bucket.try_acquire()
+    assert await bucket.acquire() == pytest.approx(0.5)
+    clock.now += 10
+    assert bucket.tokens == 3
+
+
+async def test_rate_limiter_per_endpoint_and_account():
+    clock = FakeClock()
+    limiter = RateLimiter(
+        rate=10,
+        burst=10,
+        endpoint_limits={APIEndpoint.SPEED_CONTROL: (1, 1)},
+        clock=clock,
+        sleep=clock.sleep,
+    )
+    assert await limiter.acquire(APIEndpoint.SPEED_CONTROL, "a") == 0
+    assert await limiter.acquire(APIEndpoint.SPEED_CONTROL, "b") == 0
+    assert await limiter.acquire(APIEndpoint.GPS_CONTROLS, "a") == 0
+    assert await limiter.acquire(APIEndpoint.SPEED_CONTROL, "a") == pytest.approx(1)
+    assert len(limiter.buckets(APIEndpoint.SPEED_CONTROL, "a")) == 2
+    assert len(limiter.buckets(APIEndpoint.GPS_CONTROLS, "a")) == 1
+
+
+async def test_adaptive_concurrency_limit():
+    clock = FakeClock()
+    limiter = AdaptiveConcurrencyLimiter(initial=8, max_limit=10, clock=clock)
+    limiter.on_success(0.1)
+    limiter.on_overload()
+    assert limiter.limit == 4
+    limiter.on_overload()
+    assert limiter.limit == 4
+    for _ in range(4):
+        limiter.on_success(0.1)
+    assert limiter.limit == 5
+    limiter.on_success(1.0)
+    assert limiter.limit == 5
+    clock.now += 1
+    for _ in range(10):
+        limiter.on_overload()
+        clock.now += 1
+    assert limiter.limit == 1
+
+
+async def test_adaptive_concurrency_slots():
+    limiter = AdaptiveConcurrencyLimiter(initial=2)
+    peak = 0
+
+    async def request():
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*[request() for _ in range(6)])
+    assert peak == 2
+    assert limiter.in_flight == 0
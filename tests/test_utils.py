@@ -0,0 +1,225 @@
+"""Tests for utils."""
+
+from __future__ import annotations
+
+from datetime import datetime, time as dt_time
+import random
+import re
+
+import pytest
+
+from politikontroller_py.constants import DEFAULT_MAX_DISTANCE
+from politikontroller_py.models.api import PoliceControlResponse, PoliceGPSControlsResponse
+from politikontroller_py.utils import (
+    PayloadCodec,
+    TimestampParser,
+    aes_decrypt,
+    aes_encrypt,
+    calculate_distance,
+    centroid,
+    cluster_controls,
+    iter_response_data,
+    iter_response_rows,
+    map_response_data,
+    merge_duplicate_controls,
+    parse_datetime_like,
+    parse_time_format,
+)
+
+from .helpers import load_fixture
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("p=check&lang=no", "Mdh794CT67HDdBcrwxKO8LRgqT24lmo4+vo7S4WpJeg="),
+        ("navn=Bjørn", "zGuxy4AqvJHOwOz2sNp3lXXSgaBdXbFQVOCbgeaLV44="),
+    ],
+)
+def test_codec_wire_format(query: str, expected: str):
+    codec = PayloadCodec()
+    assert codec.encrypt_query(query) == expected
+    assert aes_encrypt(query) == expected
+    assert codec.decrypt_payload(expected) == query
+
+
+@pytest.mark.parametrize("fixture", ["hk", "gps_kontroller", "login"])
+def test_codec_decrypt_fixture(fixture: str):
+    codec = PayloadCodec()
+    payload = load_fixture(fixture)
+    large = codec.encrypt_query("|".join([aes_decrypt(payload)] * 100))
+    assert codec.decrypt_payload(payload) == aes_decrypt(payload)
+    assert codec.decrypt_payload(large).startswith(aes_decrypt(payload))
+    assert codec.decrypt_many([payload, payload]) == [aes_decrypt(payload)] * 2
+
+
+def test_codec_encrypt_many():
+    codec = PayloadCodec()
+    queries = ["p=check&lang=no", "p=hk&lat=63&lon=11.0&speed=100"]
+    assert codec.decrypt_many(codec.encrypt_many(queries)) == queries
+
+
+@pytest.mark.parametrize("payload", ["", "AAAA", "Q2hlY2s="])
+def test_codec_invalid_payload(payload: str):
+    with pytest.raises(ValueError):  # noqa: PT011
+        PayloadCodec().decrypt_payload(payload)
+
+
+def cluster_controls_pairwise(controls, max_distance=DEFAULT_MAX_DISTANCE) -> list[list[int]]:
+    """Cluster duplicates by checking every pair of controls."""
+    clusters = []
+    assigned = set()
+    for i in range(len(controls)):
+        if i in assigned:
+            continue
+        cluster, queue = [i], [i]
+        assigned.add(i)
+        while queue:
+            a = queue.pop()
+            for b, control in enumerate(controls):
+                if (
+                    b not in assigned
+                    and control.type == controls[a].type
+                    and calculate_distance(controls[a].point, control.point) <= max_distance
+                ):
+                    assigned.add(b)
+                    cluster.append(b)
+                    queue.append(b)
+        clusters.append(sorted(cluster))
+    return clusters
+
+
+def summarize(controls) -> list[tuple]:
+    return [(c.id, sorted(d.id for d in c.duplicates)) for c in controls]
+
+
+def test_merge_duplicate_controls_aggregates():
+    details = aes_decrypt(load_fixture("hki_59777"))
+    rows = [
+        details,
+        details.replace("59777|", "1|", 1).replace("|50|", "|30|").replace("|2|2", "|2|7"),
+        details.replace("59777|", "2|", 1).replace("63.1033706005419", "63.1063706005419"),
+    ]
+    controls = [PoliceControlResponse.from_response_data(row) for row in rows]
+    merged = merge_duplicate_controls(controls)
+    assert len(merged) == 1
+    control = merged[0]
+    assert control.id == 59777
+    # Every merged control, the first one last, like `merge_with`
+    assert [d.id for d in control.duplicates] == [1, 2, 59777]
+    assert [d.id for d in controls[0].merge_with(controls[1]).duplicates] == [1, 59777]
+    assert control.lat == pytest.approx(63.1043706005419)
+    assert control.point.lat == control.lat
+    assert control.speed_limit == 30
+    assert control.confirmed == 7
+    assert control.timestamp == controls[0].timestamp
+    assert controls[0].duplicates == []
+
+
+def test_centroid_antimeridian():
+    assert centroid([1.0, 2.0], [10.0, 20.0]) == (1.5, 15.0)
+    assert centroid([0.0, 0.0], [179.0, -179.0]) == (0.0, 180.0)
+    assert centroid([0.0, 0.0], [179.0, -177.0]) == (0.0, -179.0)
+
+
+@pytest.mark.parametrize("fixture", ["gps_kontroller", "gps_kontroller_cluster"])
+def test_merge_duplicate_controls_fixture(fixture: str):
+    controls = PoliceGPSControlsResponse.from_response_data(aes_decrypt(load_fixture(fixture)), True)
+    assert cluster_controls(controls) == cluster_controls_pairwise(controls)
+
+
+@pytest.mark.parametrize(("seed", "lat"), [(1, 63.0), (2, 69.5), (3, 89.9), (4, -45.0)])
+def test_merge_duplicate_controls_random(seed: int, lat: float):
+    rng = random.Random(seed)
+    types = ["Fartskontroll", "Teknisk"]
+    rows = [
+        f"{i}|A|B|{rng.choice(types)}|10:00|C|{lat + rng.uniform(-0.05, 0.05)}|"
+        f"{rng.choice([-179.99, 10.0, 179.99]) + rng.uniform(-0.005, 0.005)}|||"
+        for i in range(300)
+    ]
+    controls = PoliceGPSControlsResponse.from_response_data("#".join(rows), True)
+    clusters = cluster_controls(controls)
+    assert clusters == cluster_controls_pairwise(controls)
+    merged = merge_duplicate_controls(controls)
+    assert summarize(merged) == [
+        (controls[c[0]].id, sorted(controls[j].id for j in c) if len(c) > 1 else []) for c in clusters
+    ]
+
+
+@pytest.mark.parametrize("fixture", ["hk", "gps_kontroller", "hki_59777"])
+def test_iter_response_data(fixture: str):
+    data = aes_decrypt(load_fixture(fixture))
+    keys = PoliceGPSControlsResponse.attr_map
+    assert list(iter_response_rows(data)) == data.split("#")
+    assert list(iter_response_data(data, keys)) == map_response_data(data, keys, multiple=True)
+
+
+def parse_time_format_legacy(text: str) -> int | str:
+    """Parse time formats the way `parse_time_format` did before `TimestampParser`."""
+    today = datetime.now().astimezone()
+    if m := re.match(r"(\d{2})\.(\d{2}) - (\d{2}):(\d{2})", text):
+        try:
+            return int(
+                datetime.fromisoformat(f"{today.year}-{m[2]}-{m[1]}T{m[3]}:{m[4]}:00")
+                .astimezone()
+                .timestamp()
+            )
+        except ValueError:
+            pass
+    if m := re.match(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}", text):
+        return int(datetime.fromisoformat(m[0]).astimezone().timestamp())
+    try:
+        return int(datetime.combine(today, dt_time.fromisoformat(text)).astimezone().timestamp())
+    except ValueError:
+        pass
+    try:
+        text = re.sub(r"(\d{2}:\d{2})(?: \(\d+ ganger\))?", "\\1", text)
+        return int(
+            datetime.strptime(text, "%H:%M")
+            .astimezone()
+            .replace(year=today.year, month=today.month, day=today.day)
+            .timestamp()
+        )
+    except ValueError:
+        pass
+    return text
+
+
+TIME_FORMATS = [
+    "05.12 - 10:41",
+    "29.02 - 10:00",
+    "31.04 - 10:00",
+    "10:41",
+    "10:41:30",
+    "2024-12-06T13:59:24",
+    "2024-12-06T13:59:24+01:00",
+    "10:41 (3 ganger)",
+    "54 year",
+    "1733489964",
+]
+
+
+@pytest.mark.parametrize("text", TIME_FORMATS)
+def test_parse_time_format(text: str):
+    assert TimestampParser().parse(text) == parse_time_format_legacy(text)
+    assert parse_time_format(text) == parse_time_format_legacy(text)
+
+
+def test_timestamp_parser_batch():
+    parser = TimestampParser()
+    values = TIME_FORMATS * 3
+    assert parser.parse_many(values) == [parse_time_format_legacy(v) for v in values]
+    assert len(parser._parsed) == len(TIME_FORMATS)
+
+
+def test_timestamp_parser_activate():
+    today = datetime(2024, 12, 6, 8, 0).astimezone()
+    parser = TimestampParser(today)
+    expected = int(datetime(2024, 12, 6, 10, 41).astimezone().timestamp())
+    with parser.activate():
+        assert parse_datetime_like("10:41") == expected
+        assert parse_time_format("10:41") == expected
+    assert parse_datetime_like("") is None
+    assert parse_datetime_like("0") is None
+    assert parse_datetime_like(1733489964) == 1733489964
+    assert parse_time_format("10:41") == parse_time_format_legacy("10:41")
@@ -0,0 +1,41 @@
+"""Tests for the control watcher."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from politikontroller_py.models.api import PoliceGPSControlsResponse
+from politikontroller_py.utils import aes_decrypt
+from politikontroller_py.watch import ChangeType, ControlWatcher
+
+from .helpers import load_fixture
+
+
+def test_control_watcher():
+    data = aes_decrypt(load_fixture("gps_kontroller"))
+    rows = data.split("#")
+    watcher = ControlWatcher(PoliceGPSControlsResponse)
+
+    changes = watcher.update(data)
+    assert [(c.type, c.control.id) for c in changes] == [(ChangeType.ADDED, i) for i in [59777, 59786, 59790]]
+
+    with patch.object(
+        PoliceGPSControlsResponse, "from_response_row", wraps=PoliceGPSControlsResponse.from_response_row
+    ) as from_response_row:
+        assert watcher.update(data) == []
+        from_response_row.assert_not_called()
+
+        moved = rows[0].replace("Statens veivesen Rensvik", "Rensvik").replace("63.1033706005419", "63.2")
+        unchanged = rows[1].replace("Viken/Nordre Follo", "Akershus/Nordre Follo")
+        changes = watcher.update(f"{moved}#{unchanged}")
+        assert from_response_row.call_count == 2
+
+    assert [(c.type, c.control.id) for c in changes] == [
+        (ChangeType.UPDATED, 59777),
+        (ChangeType.REMOVED, 59790),
+    ]
+    assert changes[0].changed_fields == ("lat", "description")
+    assert changes[0].previous.lat == 63.1033706005419
+    assert changes[1].control.id == 59790
+    assert set(watcher.controls) == {"59777", "59786"}
+    assert [c.type for c in watcher.update("")] == [ChangeType.REMOVED] * 2